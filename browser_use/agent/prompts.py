@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Literal, Optional
 
 from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL, SystemMessage, UserMessage
 from browser_use.observability import observe_debug
+from browser_use.screenshots.service import get_screenshot_media_type
 from browser_use.utils import is_new_tab_page
 
 if TYPE_CHECKING:
@@ -112,10 +113,14 @@ class AgentMessagePrompt:
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='_get_browser_state_description')
 	def _get_browser_state_description(self) -> str:
-		elements_text = self.browser_state.dom_state.llm_representation(include_attributes=self.include_attributes)
+		# stops serializing once the budget is used up instead of building the whole page and cutting it
+		elements_text, truncated, omitted_elements = self.browser_state.dom_state.llm_representation_within_budget(
+			self.max_clickable_elements_length, include_attributes=self.include_attributes
+		)
 
-		if len(elements_text) > self.max_clickable_elements_length:
-			elements_text = elements_text[: self.max_clickable_elements_length]
+		if omitted_elements:
+			truncated_text = f' (truncated to {self.max_clickable_elements_length} characters, {omitted_elements} more interactive elements not shown)'
+		elif truncated:
 			truncated_text = f' (truncated to {self.max_clickable_elements_length} characters)'
 		else:
 			truncated_text = ''
@@ -270,11 +275,12 @@ Available tabs:
 				content_parts.append(ContentPartTextParam(text=label))
 
 				# Add the screenshot
+				media_type = get_screenshot_media_type(screenshot)
 				content_parts.append(
 					ContentPartImageParam(
 						image_url=ImageURL(
-							url=f'data:image/png;base64,{screenshot}',
-							media_type='image/png',
+							url=f'data:{media_type};base64,{screenshot}',
+							media_type=media_type,
 							detail=self.vision_detail_level,
 						),
 					)
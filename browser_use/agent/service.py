@@ -60,7 +60,7 @@ from browser_use.browser.views import BrowserStateSummary
 from browser_use.config import CONFIG
 from browser_use.controller.registry.views import ActionModel
 from browser_use.controller.service import Controller
-from browser_use.dom.views import DOMInteractedElement
+from browser_use.dom.views import DOMInteractedElement, EnhancedDOMTreeNode, SerializedDOMState
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.observability import observe, observe_debug
 from browser_use.sync import CloudSync
@@ -189,6 +189,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		step_timeout: int = 120,
 		preload: bool = True,
 		include_recent_events: bool = False,
+		prefetch_browser_state: bool = False,
 		**kwargs,
 	):
 		if not isinstance(llm, BaseChatModel):
@@ -275,6 +276,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_tool_call_examples=include_tool_call_examples,
 			llm_timeout=llm_timeout,
 			step_timeout=step_timeout,
+			prefetch_browser_state=prefetch_browser_state,
 		)
 
 		# Token cost service
@@ -301,6 +303,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._set_screenshot_service()
 
 		# Action setup
+		self._agent_output_models: dict[type[ActionModel], type[AgentOutput]] = {}
 		self._setup_action_models()
 		self._set_browser_use_version_and_source(source)
 		self.initial_actions = self._convert_initial_actions(initial_actions) if initial_actions else None
@@ -468,6 +471,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._external_pause_event = asyncio.Event()
 		self._external_pause_event.set()
 
+		# Background capture of the next step's browser state, see _start_browser_state_prefetch()
+		self._browser_state_prefetch: asyncio.Task[BrowserStateSummary] | None = None
+
 	@property
 	def logger(self) -> logging.Logger:
 		"""Get instance-specific logger with task ID in the name"""
@@ -622,21 +628,25 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initially only include actions with no filters
 		self.ActionModel = self.controller.registry.create_action_model()
 		# Create output model with the dynamic actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._get_agent_output_model(self.ActionModel)
 
 		# used to force the done action when max_steps is reached
 		self.DoneActionModel = self.controller.registry.create_action_model(include_actions=['done'])
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._get_agent_output_model(self.DoneActionModel)
+
+	def _get_agent_output_model(self, action_model: type[ActionModel]) -> type[AgentOutput]:
+		"""Get the output model for `action_model`, reusing the one created for it before"""
+		# The registry returns the same action model for the same set of actions, so steps that stay on a site
+		# also get the same output model, and the LLM clients the same JSON schema
+		if action_model not in self._agent_output_models:
+			if self.settings.flash_mode:
+				output_model = AgentOutput.type_with_custom_actions_flash_mode(action_model)
+			elif self.settings.use_thinking:
+				output_model = AgentOutput.type_with_custom_actions(action_model)
+			else:
+				output_model = AgentOutput.type_with_custom_actions_no_thinking(action_model)
+			self._agent_output_models[action_model] = output_model
+		return self._agent_output_models[action_model]
 
 	def add_new_task(self, new_task: str) -> None:
 		"""Add a new task to the agent, keeping the same task_id as tasks are continuous"""
@@ -680,11 +690,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# Phase 2: Get model output and execute actions
 			await self._get_next_action(browser_state_summary)
 			await self._execute_actions()
+			self._start_browser_state_prefetch()
 
 			# Phase 3: Post-processing
 			await self._post_process()
 
 		except Exception as e:
+			# the page state after a failed step is captured again anyway, don't leave the prefetch running
+			await self._cancel_browser_state_prefetch()
 			# Handle ALL exceptions in one place
 			await self._handle_step_error(e)
 
@@ -702,6 +715,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Use caching based on preload setting - if preload is False, don't use cached state
 		is_first_step = self.state.n_steps in (0, 1)
 		use_cache = is_first_step and self.preload
+		await self._wait_for_browser_state_prefetch()
 		self.logger.debug(f'📸 Requesting browser state with include_screenshot=True, cached={use_cache}')
 		browser_state_summary = await self.browser_session.get_browser_state_summary(
 			cache_clickable_elements_hashes=True,
@@ -711,6 +725,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		)
 		if browser_state_summary.screenshot:
 			self.logger.debug(f'📸 Got browser state WITH screenshot, length: {len(browser_state_summary.screenshot)}')
+			if screenshot_watchdog := self.browser_session._screenshot_watchdog:
+				self.logger.debug(
+					f'📸 Step {self.state.n_steps} screenshot: {screenshot_watchdog.last_screenshot_size / 1024:.0f} KB, '
+					f'captured in {screenshot_watchdog.last_screenshot_time * 1000:.0f} ms'
+				)
 		else:
 			self.logger.debug('📸 Got browser state WITHOUT screenshot')
 
@@ -743,6 +762,54 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		await self._handle_final_step(step_info)
 		return browser_state_summary
 
+	def _start_browser_state_prefetch(self) -> None:
+		"""Start capturing the next step's browser state in the background while this step finishes up.
+
+		The capture warms the DOM watchdog, whose unchanged page fast path hands the prefetched state to the next
+		`_prepare_context` only if the page fingerprint (target, URL, documents, DOM changes, scroll position and viewport)
+		still matches, and rebuilds it otherwise. Failed and timed out steps cancel the prefetch.
+		"""
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		if (
+			not self.settings.prefetch_browser_state
+			or not self.browser_session.browser_profile.reuse_unchanged_page_state
+			or self._browser_state_prefetch is not None
+			or any(result.is_done for result in self.state.last_result or [])
+		):
+			return
+
+		self.logger.debug(f'🌐 Step {self.state.n_steps}: Prefetching the next browser state...')
+		self._browser_state_prefetch = asyncio.create_task(
+			self.browser_session.get_browser_state_summary(
+				cache_clickable_elements_hashes=True,
+				include_screenshot=True,
+				include_recent_events=self.include_recent_events,
+			),
+			name='browser_state_prefetch',
+		)
+
+	async def _wait_for_browser_state_prefetch(self) -> None:
+		"""Let a running browser state prefetch finish, so the state request after it can reuse its result."""
+		prefetch, self._browser_state_prefetch = self._browser_state_prefetch, None
+		if prefetch is None:
+			return
+
+		wait_start = time.time()
+		try:
+			await prefetch
+		except Exception as e:
+			self.logger.debug(f'Browser state prefetch failed, capturing the state normally: {type(e).__name__}: {e}')
+			return
+		self.logger.debug(
+			f'🌐 Step {self.state.n_steps}: Waited {time.time() - wait_start:.2f}s for the prefetched browser state'
+		)
+
+	async def _cancel_browser_state_prefetch(self) -> None:
+		prefetch, self._browser_state_prefetch = self._browser_state_prefetch, None
+		if prefetch is not None:
+			prefetch.cancel()
+			await asyncio.gather(prefetch, return_exceptions=True)
+
 	@observe_debug(ignore_input=True, name='get_next_action')
 	async def _get_next_action(self, browser_state_summary: BrowserStateSummary) -> None:
 		"""Execute LLM interaction with retry logic and handle callbacks"""
@@ -1409,6 +1476,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					# Handle step timeout gracefully
 					error_msg = f'Step {step + 1} timed out after {self.settings.step_timeout} seconds'
 					self.logger.error(f'⏰ {error_msg}')
+					await self._cancel_browser_state_prefetch()
 					self.state.consecutive_failures += 1
 					self.state.last_result = [ActionResult(error=error_msg)]
 
@@ -1545,15 +1613,18 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				self.browser_session._cached_browser_state_summary is not None
 				and self.browser_session._cached_browser_state_summary.dom_state is not None
 			):
-				cached_selector_map = dict(self.browser_session._cached_browser_state_summary.dom_state.selector_map)
-				cached_element_hashes = {e.parent_branch_hash() for e in cached_selector_map.values()}
+				cached_dom_state = self.browser_session._cached_browser_state_summary.dom_state
+				cached_selector_map = dict(cached_dom_state.selector_map)
+				cached_element_hashes = cached_dom_state.parent_branch_hashes
 			else:
+				cached_dom_state = None
 				cached_selector_map = {}
-				cached_element_hashes = set()
+				cached_element_hashes = frozenset()
 		except Exception as e:
 			self.logger.error(f'Error getting cached selector map: {e}')
+			cached_dom_state = None
 			cached_selector_map = {}
-			cached_element_hashes = set()
+			cached_element_hashes = frozenset()
 
 		# await self.browser_session.remove_highlights()
 
@@ -1565,9 +1636,24 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					self.logger.debug(msg)
 					break
 
+			# wait between actions (only after first action), before the DOM check so it sees what the previous action caused
+			if i > 0:
+				await asyncio.sleep(self.browser_profile.wait_between_actions)
+
 			# DOM synchronization check - verify element indexes are still valid AFTER first action
 			# This prevents stale element detection but doesn't refresh before execution
-			if action.get_index() is not None and i != 0:
+			# The full state rebuild is skipped when a cheap check shows the page didn't change since the cached state
+			action_index = action.get_index()
+			cached_node = cached_selector_map.get(action_index) if action_index is not None else None
+			if (
+				action_index is not None
+				and i != 0
+				and (
+					cached_dom_state is None
+					or cached_node is None
+					or not await self._is_cached_element_still_valid(cached_dom_state, cached_node)
+				)
+			):
 				new_browser_state_summary = await self.browser_session.get_browser_state_summary(
 					cache_clickable_elements_hashes=False,
 					include_screenshot=False,
@@ -1604,7 +1690,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					break
 
 				# Check for new elements that appeared
-				new_element_hashes = {e.parent_branch_hash() for e in new_selector_map.values()}
+				new_element_hashes = new_browser_state_summary.dom_state.parent_branch_hashes
 				if check_for_new_elements and not new_element_hashes.issubset(cached_element_hashes):
 					# next action requires index but there are new elements on the page
 					remaining_actions_str = get_remaining_actions_str(actions, i)
@@ -1619,10 +1705,6 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					)
 					break
 
-			# wait between actions (only after first action)
-			if i > 0:
-				await asyncio.sleep(self.browser_profile.wait_between_actions)
-
 			red = '\033[91m'
 			green = '\033[92m'
 			cyan = '\033[96m'
@@ -1673,6 +1755,26 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		return results
 
+	async def _is_cached_element_still_valid(self, dom_state: SerializedDOMState, node: EnhancedDOMTreeNode) -> bool:
+		"""Check whether an action can target `node` from the cached `dom_state` without rebuilding the browser state."""
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		dom_watchdog = self.browser_session._dom_watchdog
+		if dom_watchdog is None or dom_state is not dom_watchdog.current_dom_state:
+			return False
+
+		check_start = time.time()
+		if not await dom_watchdog.is_element_still_valid(node):
+			return False
+		check_time = time.time() - check_start
+
+		time_saved = max(dom_watchdog.last_state_time - check_time, 0.0)
+		dom_watchdog.stale_check_time_saved += time_saved
+		self.logger.debug(
+			f'Element {node.backend_node_id} is still valid (checked in {check_time * 1000:.0f}ms), '
+			f'skipped the browser state rebuild and saved ~{time_saved * 1000:.0f}ms'
+		)
+		return True
+
 	async def log_completion(self) -> None:
 		"""Log the completion of the task"""
 		# self._task_end_time = time.time()
@@ -1780,18 +1882,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if not historical_element or not browser_state_summary.dom_state.selector_map:
 			return action
 
-		# selector_hash_map = {hash(e): e for e in browser_state_summary.dom_state.selector_map.values()}
+		highlight_index = browser_state_summary.dom_state.get_index_by_element_hash(historical_element.element_hash)
 
-		highlight_index, current_element = next(
-			(
-				(highlight_index, element)
-				for highlight_index, element in browser_state_summary.dom_state.selector_map.items()
-				if element.element_hash == historical_element.element_hash
-			),
-			(None, None),
-		)
-
-		if not current_element or highlight_index is None:
+		if highlight_index is None:
 			return None
 
 		old_index = action.get_index()
@@ -1895,6 +1988,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def close(self):
 		"""Close all resources"""
 		try:
+			await self._cancel_browser_state_prefetch()
+
 			# Only close browser if keep_alive is False (or not set)
 			if self.browser_session is not None:
 				if not self.browser_session.browser_profile.keep_alive:
@@ -1930,21 +2025,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Create new action model with current page's filtered actions
 		self.ActionModel = self.controller.registry.create_action_model(page_url=page_url)
 		# Update output model with the new actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._get_agent_output_model(self.ActionModel)
 
 		# Update done action model too
 		self.DoneActionModel = self.controller.registry.create_action_model(include_actions=['done'], page_url=page_url)
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._get_agent_output_model(self.DoneActionModel)
 
 	def get_trace_object(self) -> dict[str, Any]:
 		"""Get the trace and trace_details objects for the agent"""
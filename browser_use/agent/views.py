@@ -56,6 +56,7 @@ class AgentSettings(BaseModel):
 	include_tool_call_examples: bool = False
 	llm_timeout: int = 60  # Timeout in seconds for LLM calls
 	step_timeout: int = 180  # Timeout in seconds for each step
+	prefetch_browser_state: bool = False  # Capture the next browser state in the background right after actions execute
 
 
 class AgentState(BaseModel):
@@ -0,0 +1,193 @@
+"""
+Per-target cache of Page.getFrameTree, kept up to date from Page.frameAttached, Page.frameDetached and
+Page.frameNavigated, so building the frame hierarchy doesn't need a CDP round trip per target every time.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from cdp_use.cdp.page.types import Frame, FrameTree
+from cdp_use.cdp.target.types import SessionID, TargetID
+
+if TYPE_CHECKING:
+	from cdp_use import CDPClient
+
+	from browser_use.browser.session import CDPSession
+
+
+class _CachedFrameTree:
+	"""A target's frame tree with an index of its nodes, so events can be applied without walking the tree."""
+
+	def __init__(self, session_id: SessionID, frame_tree: FrameTree):
+		self.session_id = session_id
+		self.frame_tree = frame_tree
+		self.nodes: dict[str, FrameTree] = {}
+		self.parents: dict[str, str] = {}  # frame id -> parent frame id, the root frame has none
+
+		stack = [frame_tree]
+		while stack:
+			node = stack.pop()
+			frame_id = node['frame']['id']
+			self.nodes[frame_id] = node
+			for child in node.get('childFrames', []):
+				self.parents[child['frame']['id']] = frame_id
+				stack.append(child)
+
+	def add(self, frame: Frame, parent_frame_id: str) -> None:
+		node: FrameTree = {'frame': frame, 'childFrames': []}
+		self.nodes[frame['id']] = node
+		self.parents[frame['id']] = parent_frame_id
+		self.nodes[parent_frame_id].setdefault('childFrames', []).append(node)
+
+	def remove(self, frame_id: str) -> None:
+		node = self.nodes[frame_id]
+		parent = self.nodes[self.parents[frame_id]]
+		parent['childFrames'] = [child for child in parent.get('childFrames', []) if child is not node]
+
+		stack = [node]
+		while stack:
+			node = stack.pop()
+			removed_frame_id = node['frame']['id']
+			del self.nodes[removed_frame_id]
+			del self.parents[removed_frame_id]
+			stack.extend(node.get('childFrames', []))
+
+
+class FrameTreeCache:
+	"""Frame trees of the targets that were asked for, updated incrementally from the frame events of their sessions.
+
+	Anything the events can't be applied to (a new root frame, a frame of an unknown parent) drops the target's tree so
+	the next call fetches it again.
+	"""
+
+	TRACKED_EVENTS = ('Page.frameAttached', 'Page.frameDetached', 'Page.frameNavigated')
+
+	def __init__(self, logger: logging.Logger | None = None):
+		self.logger = logger or logging.getLogger(__name__)
+		self.generation = 0
+		"""Incremented on every change to a cached tree, cheap to compare for caches built from the frame trees."""
+
+		self._trees: dict[TargetID, _CachedFrameTree] = {}
+		self._sessions: dict[SessionID, tuple[TargetID, 'CDPClient']] = {}
+		self._changes: dict[TargetID, int] = {}  # events seen per target, also while its tree is being fetched
+		self._cdp_clients: dict[int, 'CDPClient'] = {}  # clients the handlers are registered on
+
+	def __contains__(self, target_id: object) -> bool:
+		return target_id in self._trees
+
+	async def get_frame_tree(self, cdp_session: 'CDPSession') -> FrameTree:
+		"""Same as Page.getFrameTree()['frameTree'] for the session's target, shared with other callers: don't modify it."""
+		target_id = cdp_session.target_id
+		cached = self._trees.get(target_id)
+		if cached and cached.session_id == cdp_session.session_id:
+			return cached.frame_tree
+
+		self._watch(cdp_session)
+		changes = self._changes.get(target_id, 0)
+		result = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
+		frame_tree = result['frameTree']
+		# an event handled while waiting for the response may be older or newer than it, only cache a tree known to be current
+		if self._changes.get(target_id, 0) == changes:
+			self._trees[target_id] = _CachedFrameTree(cdp_session.session_id, frame_tree)
+			self.generation += 1
+		return frame_tree
+
+	def forget(self, target_id: TargetID) -> None:
+		"""Drop a target's tree, the next call fetches it again."""
+		if self._trees.pop(target_id, None) is not None:
+			self.generation += 1
+
+	def retain(self, target_ids: set[TargetID]) -> None:
+		"""Drop the trees of all targets that aren't in `target_ids`, e.g. closed tabs and iframes."""
+		for target_id in [target_id for target_id in self._trees if target_id not in target_ids]:
+			self.forget(target_id)
+		self._sessions = {session_id: session for session_id, session in self._sessions.items() if session[0] in target_ids}
+		self._changes = {target_id: count for target_id, count in self._changes.items() if target_id in target_ids}
+
+		# stop listening on the dedicated clients of closed targets
+		used_clients = {id(cdp_client) for _, cdp_client in self._sessions.values()}
+		for client_id in [client_id for client_id in self._cdp_clients if client_id not in used_clients]:
+			self._unregister(self._cdp_clients.pop(client_id))
+
+	def clear(self) -> None:
+		"""Unregister the event handlers and drop all trees."""
+		for cdp_client in self._cdp_clients.values():
+			self._unregister(cdp_client)
+		self._cdp_clients.clear()
+		self._trees.clear()
+		self._sessions.clear()
+		self._changes.clear()
+		self.generation += 1
+
+	def record(self, target_id: TargetID, method: str, event: dict[str, Any]) -> None:
+		"""Apply a single frame event to the target's cached tree."""
+		self._changes[target_id] = self._changes.get(target_id, 0) + 1
+		cached = self._trees.get(target_id)
+		if cached is None:
+			return
+
+		if method == 'Page.frameAttached':
+			if event['frameId'] in cached.nodes:
+				return
+			if event['parentFrameId'] not in cached.nodes:
+				self.forget(target_id)
+				return
+			# the frame has no document yet, frameNavigated fills in the rest once it commits one
+			placeholder: Frame = {  # type: ignore[typeddict-item]
+				'id': event['frameId'],
+				'parentId': event['parentFrameId'],
+				'loaderId': '',
+				'url': 'about:blank',
+				'securityOrigin': '',
+				'mimeType': 'text/html',
+			}
+			cached.add(placeholder, event['parentFrameId'])
+
+		elif method == 'Page.frameNavigated':
+			frame: Frame = event['frame']
+			node = cached.nodes.get(frame['id'])
+			parent_id = frame.get('parentId')
+			if node is not None:
+				node['frame'] = frame
+			elif parent_id is not None and parent_id in cached.nodes:
+				cached.add(frame, parent_id)
+			else:
+				self.forget(target_id)
+				return
+
+		elif method == 'Page.frameDetached':
+			frame_id = event['frameId']
+			if frame_id not in cached.nodes:
+				return
+			if frame_id not in cached.parents:
+				self.forget(target_id)  # the root frame went away
+				return
+			# reason 'swap' means the frame moved to its own target (OOPIF), it's no longer part of this tree either way
+			cached.remove(frame_id)
+
+		else:
+			return
+
+		self.generation += 1
+
+	def _watch(self, cdp_session: 'CDPSession') -> None:
+		cdp_client = cdp_session.cdp_client
+		self._sessions[cdp_session.session_id] = (cdp_session.target_id, cdp_client)
+		if id(cdp_client) in self._cdp_clients:
+			return
+		# sessions can share a client, the handlers route events by session id
+		self._cdp_clients[id(cdp_client)] = cdp_client
+		for method in self.TRACKED_EVENTS:
+			cdp_client._event_registry.register(method, self._make_handler(method))
+
+	def _unregister(self, cdp_client: 'CDPClient') -> None:
+		for method in self.TRACKED_EVENTS:
+			cdp_client._event_registry.unregister(method)
+
+	def _make_handler(self, method: str):
+		def handler(event: Any, session_id: str | None = None) -> None:
+			session = self._sessions.get(session_id) if session_id else None
+			if session is not None:
+				self.record(session[0], method, event)
+
+		return handler
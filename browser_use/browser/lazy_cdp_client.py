@@ -0,0 +1,86 @@
+"""
+CDP client for multiplexing all target sessions over a single WebSocket, enabling CDP domains on first use.
+
+Attaching a session normally enables Page, DOM, DOMSnapshot, Accessibility, Runtime and Inspector up front. Sessions
+registered with `enable_lazily` instead get each of those domains enabled right before the first command that uses it,
+so attaching to a tab or iframe that is never looked at costs a single Target.attachToTarget round trip.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from cdp_use import CDPClient
+from cdp_use.cdp.registration_library import CDPRegistrationLibrary
+from cdp_use.cdp.registry import EventRegistry
+from cdp_use.cdp.target.types import SessionID
+
+logger = logging.getLogger(__name__)
+
+
+class _DetachAwareEventRegistry(EventRegistry):
+	"""EventRegistry that reports detached sessions to the client before calling the registered handler, the registry
+	only holds one handler per event and Target.detachedFromTarget may be registered by someone else."""
+
+	def __init__(self, on_session_detached: Callable[[SessionID], None]):
+		super().__init__()
+		self._on_session_detached = on_session_detached
+
+	async def handle_event(self, method: str, params: Any, session_id: str | None = None) -> bool:
+		if method == 'Target.detachedFromTarget' and params.get('sessionId'):
+			self._on_session_detached(params['sessionId'])
+		return await super().handle_event(method, params, session_id)
+
+
+class LazyDomainCDPClient(CDPClient):
+	"""CDPClient that enables the domains of lazily attached sessions right before their first command."""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self._lazy_domains: dict[SessionID, set[str]] = {}  # session id -> domains that weren't enabled yet
+		self._enabling: dict[tuple[SessionID, str], asyncio.Future] = {}
+
+		self._event_registry = _DetachAwareEventRegistry(self.forget_session)
+		self.register = CDPRegistrationLibrary(self._event_registry)
+
+	def enable_lazily(self, session_id: SessionID, domains: list[str]) -> None:
+		"""Enable `domains` on the session only once a command of that domain is sent to it."""
+		self._lazy_domains[session_id] = set(domains)
+
+	def forget_session(self, session_id: SessionID) -> None:
+		"""Drop what's left to enable on a session, called when it's detached."""
+		self._lazy_domains.pop(session_id, None)
+
+	async def send_raw(self, method: str, params: Any | None = None, session_id: str | None = None) -> dict[str, Any]:
+		if session_id:
+			domain, _, command = method.partition('.')
+			pending = self._lazy_domains.get(session_id)
+			if pending and domain in pending:
+				pending.discard(domain)
+				# an explicit enable is the command itself, anything else waits for the domain to be enabled first
+				if command != 'enable':
+					key = (session_id, domain)
+					enabling = self._enabling[key] = asyncio.ensure_future(self._enable_domain(domain, session_id))
+					enabling.add_done_callback(partial(self._on_domain_enabled, key))
+
+			enabling = self._enabling.get((session_id, domain)) if self._enabling else None
+			if enabling is not None:
+				await asyncio.shield(enabling)
+
+		return await super().send_raw(method, params, session_id)
+
+	async def _enable_domain(self, domain: str, session_id: SessionID) -> None:
+		try:
+			await super().send_raw(f'{domain}.enable', None, session_id)
+		except Exception as e:
+			# the command itself will fail the same way if the session is gone, let it report the error. If the session is
+			# still attached, the next command of the domain tries again
+			logger.debug(f'Failed to lazily enable {domain} on session {session_id}: {type(e).__name__}: {e}')
+			if (pending := self._lazy_domains.get(session_id)) is not None:
+				pending.add(domain)
+
+	def _on_domain_enabled(self, key: tuple[SessionID, str], future: asyncio.Future) -> None:
+		if self._enabling.get(key) is future:
+			del self._enabling[key]
@@ -0,0 +1,200 @@
+"""
+Event-driven network idle detection for a single CDP session.
+
+Follows Network.requestWillBeSent/loadingFinished/loadingFailed and Page.lifecycleEvent, so the DOM watchdog can
+capture the page as soon as it stops loading instead of always sleeping for the configured page load times.
+"""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+
+
+class NetworkIdleTracker:
+	"""Counts the in-flight requests of one CDP session that matter for the page being ready."""
+
+	TRACKED_EVENTS = (
+		'Network.requestWillBeSent',
+		'Network.loadingFinished',
+		'Network.loadingFailed',
+		'Page.lifecycleEvent',
+	)
+
+	# never finish or don't affect what's on the page
+	IGNORED_RESOURCE_TYPES = frozenset({'WebSocket', 'EventSource', 'Ping', 'CSPViolationReport', 'Prefetch'})
+	IGNORED_URL_PATTERNS = (
+		'google-analytics.com',
+		'googletagmanager.com',
+		'analytics.google.com',
+		'doubleclick.net',
+		'googlesyndication.com',
+		'connect.facebook.net',
+		'facebook.com/tr',
+		'hotjar.com',
+		'segment.io',
+		'segment.com/v1',
+		'mixpanel.com',
+		'amplitude.com',
+		'clarity.ms',
+		'sentry.io',
+		'newrelic.com',
+		'nr-data.net',
+		'fullstory.com',
+		'intercom.io',
+	)
+
+	def __init__(self, cdp_session: 'CDPSession', long_request_timeout: float = 2.0, logger: logging.Logger | None = None):
+		self.cdp_session = cdp_session
+		self.long_request_timeout = long_request_timeout
+		"""Requests in flight for longer than this are treated as long-polling and stop counting."""
+		self.logger = logger or logging.getLogger(__name__)
+
+		self.started = False
+		self.document_loaded = True
+		"""False between a main frame navigation starting and its DOMContentLoaded."""
+
+		self._requests: dict[str, tuple[float, str | None]] = {}  # request id -> (start time, loader id)
+		self._last_activity = 0.0
+		self._activity = asyncio.Event()
+
+	@property
+	def target_id(self) -> str:
+		return self.cdp_session.target_id
+
+	@property
+	def in_flight_requests(self) -> int:
+		return len(self._requests)
+
+	async def start(self) -> None:
+		"""Register the event handlers and enable the Network domain and lifecycle events on the session."""
+		if self.started:
+			return
+		cdp_client = self.cdp_session.cdp_client
+		session_id = self.cdp_session.session_id
+		for method in self.TRACKED_EVENTS:
+			cdp_client._event_registry.register(method, self._make_handler(method))
+		self.started = True
+
+		await asyncio.gather(
+			cdp_client.send.Network.enable(session_id=session_id),
+			cdp_client.send.Page.setLifecycleEventsEnabled(params={'enabled': True}, session_id=session_id),
+		)
+		# requests that started before we were listening are invisible, at least don't wait for a loaded document
+		result = await cdp_client.send.Runtime.evaluate(
+			params={'expression': 'document.readyState', 'returnByValue': True}, session_id=session_id
+		)
+		self.document_loaded = result.get('result', {}).get('value') != 'loading'
+
+	async def stop(self) -> None:
+		"""Unregister the event handlers and disable the Network domain again."""
+		if not self.started:
+			return
+		cdp_client = self.cdp_session.cdp_client
+		for method in self.TRACKED_EVENTS:
+			cdp_client._event_registry.unregister(method)
+		self.started = False
+		self._requests.clear()
+		try:
+			await cdp_client.send.Network.disable(session_id=self.cdp_session.session_id)
+		except Exception as e:
+			self.logger.debug(f'Failed to disable the Network domain: {e}')
+
+	def is_ignored(self, event: dict[str, Any]) -> bool:
+		"""Whether a Network.requestWillBeSent event is for a request that never ends or doesn't affect the page."""
+		if event.get('type') in self.IGNORED_RESOURCE_TYPES:
+			return True
+		url = event.get('request', {}).get('url', '')
+		if url.startswith(('data:', 'blob:', 'ws:', 'wss:')):
+			return True
+		return any(pattern in url for pattern in self.IGNORED_URL_PATTERNS)
+
+	def record(self, method: str, event: dict[str, Any]) -> None:
+		"""Update the in-flight requests and page load state from a single CDP event."""
+		now = time.monotonic()
+
+		if method == 'Network.requestWillBeSent':
+			if self.is_ignored(event):
+				return
+			# redirects reuse the request id, the request just keeps going
+			self._requests[event['requestId']] = (now, event.get('loaderId'))
+
+		elif method == 'Network.loadingFinished' or method == 'Network.loadingFailed':
+			if self._requests.pop(event['requestId'], None) is None:
+				return
+
+		elif method == 'Page.lifecycleEvent':
+			if event.get('frameId') != self.target_id:
+				return  # only the main frame's lifecycle, subframe requests are tracked like any other
+			name = event.get('name')
+			if name == 'init':
+				# new document, requests of the previous one are cancelled without always reporting it
+				loader_id = event.get('loaderId')
+				self._requests = {
+					request_id: request for request_id, request in self._requests.items() if request[1] == loader_id
+				}
+				self.document_loaded = False
+			elif name == 'DOMContentLoaded':
+				self.document_loaded = True
+			else:
+				return
+
+		else:
+			return
+
+		self._last_activity = now
+		self._activity.set()
+
+	def _quiet_since(self, now: float) -> float | None:
+		"""Time since which no counted request is in flight, or None while one is."""
+		quiet_since = self._last_activity
+		for started, _ in self._requests.values():
+			long_request_after = started + self.long_request_timeout
+			if long_request_after > now:
+				return None
+			quiet_since = max(quiet_since, long_request_after)
+		return quiet_since
+
+	async def wait_for_idle(self, idle_time: float, timeout: float) -> bool:
+		"""Wait until the document is loaded and no counted request was in flight for `idle_time` seconds.
+
+		The quiet period is measured from the start of the wait at the earliest, so requests triggered right after an
+		action still get a chance to start. Returns False if the page didn't settle within `timeout` seconds.
+		"""
+		start = time.monotonic()
+		deadline = start + timeout
+		while True:
+			now = time.monotonic()
+			quiet_since = self._quiet_since(now)
+			if self.document_loaded and quiet_since is not None and now - max(quiet_since, start) >= idle_time:
+				return True
+			if now >= deadline:
+				return False
+
+			# sleep until something happens, the quiet period is over or the oldest request turns into long-polling
+			if not self.document_loaded:
+				next_check = deadline  # DOMContentLoaded wakes us up
+			elif quiet_since is not None:
+				next_check = max(quiet_since, start) + idle_time
+			else:
+				next_check = min(
+					started + self.long_request_timeout
+					for started, _ in self._requests.values()
+					if started + self.long_request_timeout > now
+				)
+			self._activity.clear()
+			try:
+				await asyncio.wait_for(self._activity.wait(), timeout=max(min(next_check, deadline) - now, 0.001))
+			except TimeoutError:
+				pass
+
+	def _make_handler(self, method: str):
+		def handler(event: Any, session_id: str | None = None) -> None:
+			if session_id is not None and session_id != self.cdp_session.session_id:
+				return
+			self.record(method, event)
+
+		return handler
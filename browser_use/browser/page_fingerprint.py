@@ -0,0 +1,110 @@
+"""
+Cheap page-change fingerprint, to tell whether the previous browser state still describes the page.
+
+A MutationObserver injected into each (same-origin) document counts DOM mutations, and capturing listeners count text
+input, focus changes, scrolling of any element, resource loads, finished CSS transitions and animations and resizes.
+Together with a token per document, the scroll position and the viewport this changes whenever the serialized DOM state or
+the screenshot of the page could have changed, at the cost of a single Runtime.evaluate.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+
+# Installs the change counter into every reachable document once and reads it back. Mutations of our own highlight
+# overlay are not counted. A frame that can't be read (cross origin) makes the page opaque: nothing is reported for it.
+PAGE_FINGERPRINT_JS = """
+(() => {
+	const KEY = '__browserUsePageChanges';
+	const isOurs = (node) => {
+		const element = node && (node.nodeType === 1 ? node : node.parentElement);
+		return !!(element && element.closest && element.closest('[data-browser-use-highlight]'));
+	};
+	const install = (win) => {
+		if (!win[KEY]) {
+			const state = { token: Math.random().toString(36).slice(2), changes: 0 };
+			const bump = () => { state.changes++; };
+			new win.MutationObserver((records) => {
+				for (const record of records) {
+					if (isOurs(record.target)) continue;
+					const nodes = [...record.addedNodes, ...record.removedNodes];
+					if (record.type === 'childList' && nodes.length && nodes.every(isOurs)) continue;
+					state.changes++;
+				}
+			}).observe(win.document, { subtree: true, childList: true, attributes: true, characterData: true });
+			// scroll, load, transitionend and animationend don't bubble, but capturing listeners on the document see
+			// them for every element, e.g. scrolling an overflow container or an image load that reflows the layout
+			for (const type of ['input', 'change', 'focusin', 'scroll', 'load', 'transitionend', 'animationend']) {
+				win.document.addEventListener(type, bump, true);
+			}
+			win.addEventListener('resize', bump);
+			Object.defineProperty(win, KEY, { value: state, enumerable: false });
+		}
+		return win[KEY];
+	};
+	const tokens = [];
+	let changes = 0;
+	const visit = (win) => {
+		const state = install(win);
+		tokens.push(state.token);
+		changes += state.changes;
+		for (let i = 0; i < win.frames.length; i++) {
+			visit(win.frames[i]);
+		}
+	};
+	try {
+		visit(window);
+	} catch (e) {
+		return null;
+	}
+	return {
+		document: tokens.join('/'),
+		changes,
+		scrollX: window.scrollX,
+		scrollY: window.scrollY,
+		width: window.innerWidth,
+		height: window.innerHeight,
+		devicePixelRatio: window.devicePixelRatio,
+	};
+})()
+"""
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+	"""Everything that changes when the serialized DOM state or the screenshot of a page could have changed."""
+
+	target_id: str
+	url: str
+	document: str
+	"""Tokens of the page's documents, new after every navigation of the page or one of its frames."""
+	changes: int
+	"""DOM mutations, input, focus, scroll, load, transition, animation and resize events recorded in these documents."""
+	scroll_x: float
+	scroll_y: float
+	viewport_width: int
+	viewport_height: int
+	device_pixel_ratio: float
+
+
+async def get_page_fingerprint(cdp_session: 'CDPSession', url: str) -> PageFingerprint | None:
+	"""Fingerprint the page of `cdp_session`, None if it can't be fingerprinted (e.g. it embeds cross origin iframes)."""
+	result = await cdp_session.cdp_client.send.Runtime.evaluate(
+		params={'expression': PAGE_FINGERPRINT_JS, 'returnByValue': True}, session_id=cdp_session.session_id
+	)
+	value = result.get('result', {}).get('value')
+	if not value:
+		return None
+	return PageFingerprint(
+		target_id=cdp_session.target_id,
+		url=url,
+		document=value['document'],
+		changes=value['changes'],
+		scroll_x=value['scrollX'],
+		scroll_y=value['scrollY'],
+		viewport_width=value['width'],
+		viewport_height=value['height'],
+		device_pixel_ratio=value['devicePixelRatio'],
+	)
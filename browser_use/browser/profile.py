@@ -634,6 +634,22 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=False,
 		description='Enable cross-origin iframe support (OOPIF/Out-of-Process iframes). When False (default), only same-origin frames are processed to avoid complexity and hanging.',
 	)
+	cross_origin_iframe_timeout: float = Field(
+		default=3.0,
+		description='Time budget in seconds for fetching the DOM of each cross-origin iframe (they are fetched concurrently). Iframes that take longer are left out of the page state.',
+	)
+	multiplex_cdp_sessions: bool = Field(
+		default=False,
+		description='Attach to all tabs and iframes over the single root CDP WebSocket and enable CDP domains on a target only when a command first needs them, instead of opening a WebSocket per target and enabling all domains on attach.',
+	)
+	reuse_unchanged_page_state: bool = Field(
+		default=False,
+		description='Reuse the previous DOM state and screenshot when the page did not change since (same documents, no DOM mutations, input, focus changes, scrolling of any element, resource loads, finished CSS transitions or animations, same scroll position and viewport), e.g. after a wait action, and skip the state rebuild between the actions of a step in that case. Changes that only show on screen, like canvas or video content, CSS :hover/:focus-visible/:active styles and timer driven style changes without transition or animation events, are not detected.',
+	)
+	ax_tree_mode: Literal['full', 'partial', 'none'] = Field(
+		default='full',
+		description="How much of the accessibility tree to fetch for the page state: 'full' fetches it for every frame, 'partial' only for candidate interactive elements (buttons, inputs, links, elements with a role, tabindex or event handler attributes...), 'none' skips it. 'partial' and 'none' trade some interactive element detection for a faster page state.",
+	)
 
 	# --- Page load/wait timings ---
 	default_navigation_timeout: float | None = Field(default=None, description='Default page navigation timeout.')
@@ -641,12 +657,49 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	minimum_wait_page_load_time: float = Field(default=0.25, description='Minimum time to wait before capturing page state.')
 	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
 	maximum_wait_page_load_time: float = Field(default=5.0, description='Maximum time to wait for page load.')
+	network_idle_window: float = Field(
+		default=0.25,
+		description='Capture the page state as soon as no relevant network request was in flight for this long, the minimum and network idle wait times become an upper bound. Set to 0 to always wait the full fixed times.',
+	)
 	wait_between_actions: float = Field(default=0.5, description='Time to wait between actions.')
 
 	# --- UI/viewport/DOM ---
 	include_dynamic_attributes: bool = Field(default=True, description='Include dynamic attributes in selectors.')
-	highlight_elements: bool = Field(default=True, description='Highlight interactive elements on the page.')
+	highlight_elements: bool = Field(
+		default=True,
+		description='Highlight interactive elements on the page. Without highlights the screenshot is captured concurrently with the DOM.',
+	)
+	highlight_rendering: Literal['page', 'screenshot'] = Field(
+		default='page',
+		description="Where highlights are drawn: 'page' injects an overlay into the page, 'screenshot' draws them onto the screenshot with Pillow, so the page is never touched and the screenshot is captured concurrently with the DOM. With the default 'page' (and highlight_elements=True) the screenshot still waits for the DOM and the highlights, as before.",
+	)
 	viewport_expansion: int = Field(default=500, description='Viewport expansion in pixels for LLM context.')
+	incremental_dom_updates: bool = Field(
+		default=False,
+		description='Patch the cached DOM tree from CDP DOM mutation events between steps instead of re-fetching the whole document. Falls back to a full rebuild after navigation, on large changes and on pages with cross-origin iframes.',
+	)
+	paint_order_filtering: bool = Field(
+		default=False,
+		description='Leave out interactive elements that are covered by an (almost) opaque element painted on top of them, e.g. the page behind a modal or the content scrolled under a sticky header. Overlays that let clicks through (pointer-events: none) hide nothing.',
+	)
+	screenshot_format: Literal['png', 'jpeg', 'webp'] = Field(
+		default='png',
+		description='Image format of the page screenshots sent to the LLM. jpeg and webp are much smaller and faster to encode than png.',
+	)
+	screenshot_quality: int | None = Field(
+		default=None,
+		ge=0,
+		le=100,
+		description='Compression quality of jpeg and webp screenshots (0-100), None for the browser default.',
+	)
+	screenshot_max_dimension: int | None = Field(
+		default=None,
+		ge=1,
+		description='Downscale screenshots in the browser so their largest side is at most this many pixels, None to keep the full resolution.',
+	)
+	screenshot_clip_to_viewport: bool = Field(
+		default=True, description='Capture only the visible viewport in screenshots, False to capture the whole page.'
+	)
 
 	# --- Downloads ---
 	auto_download_pdfs: bool = Field(default=True, description='Automatically download PDFs when navigating to PDF viewer pages.')
@@ -1,6 +1,7 @@
 """Event-driven browser session with backwards compatibility."""
 
 import asyncio
+import copy
 import logging
 from functools import cached_property
 from pathlib import Path
@@ -11,6 +12,7 @@ from bubus import EventBus
 from cdp_use import CDPClient
 from cdp_use.cdp.fetch import AuthRequiredEvent, RequestPausedEvent
 from cdp_use.cdp.network import Cookie
+from cdp_use.cdp.page import FrameTree
 from cdp_use.cdp.target import AttachedToTargetEvent, SessionID, TargetID
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from uuid_extensions import uuid7str
@@ -36,16 +38,22 @@ from browser_use.browser.events import (
 	TabClosedEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.frame_tree import FrameTreeCache
+from browser_use.browser.lazy_cdp_client import LazyDomainCDPClient
 from browser_use.browser.profile import BrowserProfile, ProxySettings
+from browser_use.browser.target_registry import TargetRegistry
 from browser_use.browser.views import BrowserStateSummary, TabInfo
 from browser_use.dom.views import EnhancedDOMTreeNode, TargetInfo
-from browser_use.utils import _log_pretty_url, is_new_tab_page
+from browser_use.utils import is_new_tab_page
 
 DEFAULT_BROWSER_PROFILE = BrowserProfile()
 
 MAX_SCREENSHOT_HEIGHT = 2000
 MAX_SCREENSHOT_WIDTH = 1920
 
+# enabled on every attached target session, lazily for sessions multiplexed over the root client
+DEFAULT_CDP_DOMAINS = ['Page', 'DOM', 'DOMSnapshot', 'Accessibility', 'Runtime', 'Inspector']
+
 _LOGGED_UNIQUE_SESSION_IDS = set()  # track unique session IDs that have been logged to make sure we always assign a unique enough id to new sessions and avoid ambiguity in logs
 red = '\033[91m'
 reset = '\033[0m'
@@ -77,6 +85,7 @@ class CDPSession(BaseModel):
 		new_socket: bool = False,
 		cdp_url: str | None = None,
 		domains: list[str] | None = None,
+		target_info: TargetInfo | None = None,
 	):
 		"""Create a CDP session for a target.
 
@@ -85,7 +94,8 @@ class CDPSession(BaseModel):
 			target_id: Target ID to attach to
 			new_socket: If True, create a dedicated WebSocket connection for this target
 			cdp_url: CDP URL (required if new_socket is True)
-			domains: List of CDP domains to enable. If None, enables default domains.
+			domains: List of CDP domains to enable. If None, enables default domains (lazily on a LazyDomainCDPClient).
+			target_info: Already known target info, saves a Target.getTargetInfo round trip for the title and url
 		"""
 		if new_socket:
 			if not cdp_url:
@@ -113,9 +123,9 @@ class CDPSession(BaseModel):
 				session_id='connecting',
 				owns_cdp_client=False,
 			)
-		return await cdp_session.attach(domains=domains)
+		return await cdp_session.attach(domains=domains, target_info=target_info)
 
-	async def attach(self, domains: list[str] | None = None) -> Self:
+	async def attach(self, domains: list[str] | None = None, target_info: TargetInfo | None = None) -> Self:
 		result = await self.cdp_client.send.Target.attachToTarget(
 			params={
 				'targetId': self.target_id,
@@ -128,8 +138,14 @@ class CDPSession(BaseModel):
 		)
 		self.session_id = result['sessionId']
 
+		if domains is None and isinstance(self.cdp_client, LazyDomainCDPClient):
+			# multiplexed session: each default domain is enabled right before the first command that uses it
+			self.cdp_client.enable_lazily(self.session_id, DEFAULT_CDP_DOMAINS)
+			await self._load_target_info(target_info)
+			return self
+
 		# Use specified domains or default domains
-		domains = domains or ['Page', 'DOM', 'DOMSnapshot', 'Accessibility', 'Runtime', 'Inspector']
+		domains = domains or DEFAULT_CDP_DOMAINS
 
 		# Enable all domains in parallel
 		enable_tasks = []
@@ -158,10 +174,13 @@ class CDPSession(BaseModel):
 			# self.logger.warning(f'Failed to disable page JS breakpoints: {e}')
 			pass
 
-		target_info = await self.get_target_info()
+		await self._load_target_info(target_info)
+		return self
+
+	async def _load_target_info(self, target_info: TargetInfo | None = None) -> None:
+		target_info = target_info or await self.get_target_info()
 		self.title = target_info['title']
 		self.url = target_info['url']
-		return self
 
 	async def disconnect(self) -> None:
 		"""Disconnect and cleanup if this session owns its CDP client."""
@@ -286,15 +305,27 @@ class BrowserSession(BaseModel):
 		window_size: dict | None = None,
 		window_position: dict | None = None,
 		cross_origin_iframes: bool | None = None,
+		cross_origin_iframe_timeout: float | None = None,
+		multiplex_cdp_sessions: bool | None = None,
+		reuse_unchanged_page_state: bool | None = None,
+		ax_tree_mode: Literal['full', 'partial', 'none'] | None = None,
 		default_navigation_timeout: float | None = None,
 		default_timeout: float | None = None,
 		minimum_wait_page_load_time: float | None = None,
 		wait_for_network_idle_page_load_time: float | None = None,
 		maximum_wait_page_load_time: float | None = None,
+		network_idle_window: float | None = None,
 		wait_between_actions: float | None = None,
 		include_dynamic_attributes: bool | None = None,
 		highlight_elements: bool | None = None,
+		highlight_rendering: Literal['page', 'screenshot'] | None = None,
 		viewport_expansion: int | None = None,
+		incremental_dom_updates: bool | None = None,
+		paint_order_filtering: bool | None = None,
+		screenshot_format: Literal['png', 'jpeg', 'webp'] | None = None,
+		screenshot_quality: int | None = None,
+		screenshot_max_dimension: int | None = None,
+		screenshot_clip_to_viewport: bool | None = None,
 		auto_download_pdfs: bool | None = None,
 		profile_directory: str | None = None,
 		cookies_file: Path | None = None,
@@ -346,6 +377,9 @@ class BrowserSession(BaseModel):
 	# Mutable private state shared between watchdogs
 	_cdp_client_root: CDPClient | None = PrivateAttr(default=None)
 	_cdp_session_pool: dict[str, CDPSession] = PrivateAttr(default_factory=dict)
+	_target_registry: TargetRegistry = PrivateAttr(default_factory=TargetRegistry)
+	_frame_tree_cache: FrameTreeCache = PrivateAttr(default_factory=FrameTreeCache)
+	_all_frames_cache: tuple[Any, dict[str, dict], dict[str, str]] | None = PrivateAttr(default=None)
 	_cached_browser_state_summary: Any = PrivateAttr(default=None)
 	_cached_selector_map: dict[int, EnhancedDOMTreeNode] = PrivateAttr(default_factory=dict)
 	_downloaded_files: list[str] = PrivateAttr(default_factory=list)  # Track files downloaded during this session
@@ -408,6 +442,9 @@ class BrowserSession(BaseModel):
 				await session.disconnect()
 		self._cdp_session_pool.clear()
 
+		self._target_registry.stop()
+		self._frame_tree_cache.clear()
+		self._all_frames_cache = None
 		self._cdp_client_root = None  # type: ignore
 		self._cached_browser_state_summary = None
 		self._cached_selector_map.clear()
@@ -856,8 +893,11 @@ class BrowserSession(BaseModel):
 			return self.agent_focus
 
 		# Create new session for this target
-		# Default to True for new sessions (each new target gets its own WebSocket)
-		should_use_new_socket = True if new_socket is None else new_socket
+		# Default to True for new sessions (each new target gets its own WebSocket), unless all sessions share the root one
+		if new_socket is None:
+			should_use_new_socket = not self.browser_profile.multiplex_cdp_sessions
+		else:
+			should_use_new_socket = new_socket
 		self.logger.debug(
 			f'[get_or_create_cdp_session] Creating new CDP session for target {target_id} (new_socket={should_use_new_socket})'
 		)
@@ -866,6 +906,7 @@ class BrowserSession(BaseModel):
 			target_id,
 			new_socket=should_use_new_socket,
 			cdp_url=self.cdp_url if should_use_new_socket else None,
+			target_info=self._target_registry.get(target_id),
 		)
 		self._cdp_session_pool[target_id] = session
 
@@ -1084,7 +1125,10 @@ class BrowserSession(BaseModel):
 			# Convert HTTP URL to WebSocket URL if needed
 
 			# Create and store the CDP client for direct CDP communication
-			self._cdp_client_root = CDPClient(self.cdp_url)
+			if self.browser_profile.multiplex_cdp_sessions:
+				self._cdp_client_root = LazyDomainCDPClient(self.cdp_url)
+			else:
+				self._cdp_client_root = CDPClient(self.cdp_url)
 			assert self._cdp_client_root is not None
 			await self._cdp_client_root.start()
 			await self._cdp_client_root.send.Target.setAutoAttach(
@@ -1092,13 +1136,13 @@ class BrowserSession(BaseModel):
 			)
 			self.logger.debug('CDP client connected successfully')
 
-			# Get browser targets to find available contexts/pages
-			targets = await self._cdp_client_root.send.Target.getTargets()
+			# Keep a live registry of all targets so tabs, titles and URLs can be read without CDP round trips
+			await self._target_registry.start(self._cdp_client_root)
 
 			# Find main browser pages (avoiding iframes, workers, extensions, etc.)
 			page_targets: list[TargetInfo] = [
 				t
-				for t in targets['targetInfos']
+				for t in self._target_registry.all()
 				if self._is_valid_target(
 					t, include_http=True, include_about=True, include_pages=True, include_iframes=False, include_workers=False
 				)
@@ -1155,7 +1199,9 @@ class BrowserSession(BaseModel):
 				self.agent_focus = redirect_sessions[target_id]
 			else:
 				# For the initial connection, we'll use the shared root WebSocket
-				self.agent_focus = await CDPSession.for_target(self._cdp_client_root, target_id, new_socket=False)
+				self.agent_focus = await CDPSession.for_target(
+					self._cdp_client_root, target_id, new_socket=False, target_info=self._target_registry.get(target_id)
+				)
 			if self.agent_focus:
 				self._cdp_session_pool[target_id] = self.agent_focus
 
@@ -1190,6 +1236,7 @@ class BrowserSession(BaseModel):
 			self.logger.error(f'❌ FATAL: Failed to setup CDP connection: {e}')
 			self.logger.error('❌ Browser cannot continue without CDP connection')
 			# Clean up any partial state
+			self._target_registry.stop()
 			self._cdp_client_root = None
 			self.agent_focus = None
 			# Re-raise as a fatal error
@@ -1344,7 +1391,7 @@ class BrowserSession(BaseModel):
 			self.logger.debug(f'Skipping proxy auth setup: {type(e).__name__}: {e}')
 
 	async def get_tabs(self) -> list[TabInfo]:
-		"""Get information about all open tabs using CDP Target.getTargetInfo for speed."""
+		"""Get information about all open tabs from the live target registry."""
 		tabs = []
 
 		# Safety check - return empty list if browser not connected yet
@@ -1354,48 +1401,32 @@ class BrowserSession(BaseModel):
 		# Get all page targets using CDP
 		pages = await self._cdp_get_all_pages()
 
-		for i, page_target in enumerate(pages):
+		for page_target in pages:
 			target_id = page_target['targetId']
 			url = page_target['url']
+			# kept up to date by Target.targetInfoChanged, no need to ask for each tab
+			title = page_target.get('title', '')
 
-			# Try to get the title directly from Target.getTargetInfo - much faster!
-			# The initial getTargets() doesn't include title, but getTargetInfo does
-			try:
-				target_info = await self.cdp_client.send.Target.getTargetInfo(params={'targetId': target_id})
-				# The title is directly available in targetInfo
-				title = target_info.get('targetInfo', {}).get('title', '')
-
-				# Skip JS execution for chrome:// pages and new tab pages
-				if is_new_tab_page(url) or url.startswith('chrome://'):
-					# Use URL as title for chrome pages, or mark new tabs as unusable
-					if is_new_tab_page(url):
-						title = 'ignore this tab and do not use it'
-					elif not title:
-						# For chrome:// pages without a title, use the URL itself
-						title = url
-
-				# Special handling for PDF pages without titles
-				if (not title or title == '') and (url.endswith('.pdf') or 'pdf' in url):
-					# PDF pages might not have a title, use URL filename
-					try:
-						from urllib.parse import urlparse
-
-						filename = urlparse(url).path.split('/')[-1]
-						if filename:
-							title = filename
-					except Exception:
-						pass
-
-			except Exception as e:
-				# Fallback to basic title handling
-				self.logger.debug(f'⚠️ Failed to get target info for tab #{i}: {_log_pretty_url(url)} - {type(e).__name__}')
-
+			# Skip JS execution for chrome:// pages and new tab pages
+			if is_new_tab_page(url) or url.startswith('chrome://'):
+				# Use URL as title for chrome pages, or mark new tabs as unusable
 				if is_new_tab_page(url):
 					title = 'ignore this tab and do not use it'
-				elif url.startswith('chrome://'):
+				elif not title:
+					# For chrome:// pages without a title, use the URL itself
 					title = url
-				else:
-					title = ''
+
+			# Special handling for PDF pages without titles
+			if (not title or title == '') and (url.endswith('.pdf') or 'pdf' in url):
+				# PDF pages might not have a title, use URL filename
+				try:
+					from urllib.parse import urlparse
+
+					filename = urlparse(url).path.split('/')[-1]
+					if filename:
+						title = filename
+				except Exception:
+					pass
 
 			tab_info = TabInfo(
 				target_id=target_id,
@@ -1414,10 +1445,12 @@ class BrowserSession(BaseModel):
 		if not self.agent_focus or not self.agent_focus.target_id:
 			return None
 
-		targets = await self.cdp_client.send.Target.getTargets()
-		for target in targets.get('targetInfos', []):
+		if self._target_registry.started:
+			# Still return even if it's not a "valid" target since we're looking for a specific ID
+			return self._target_registry.get(self.agent_focus.target_id)
+
+		for target in await self._cdp_get_all_targets():
 			if target.get('targetId') == self.agent_focus.target_id:
-				# Still return even if it's not a "valid" target since we're looking for a specific ID
 				return target
 		return None
 
@@ -1476,9 +1509,7 @@ class BrowserSession(BaseModel):
 				return full_target_id
 
 		# may not have a cached session, so we need to get all pages and find the target id
-		all_targets = await self.cdp_client.send.Target.getTargets()
-		# Filter for valid page/tab targets only
-		for target in all_targets.get('targetInfos', []):
+		for target in await self._cdp_get_all_targets():
 			if target['targetId'].endswith(tab_id):
 				return target['targetId']
 
@@ -1486,13 +1517,13 @@ class BrowserSession(BaseModel):
 
 	async def get_target_id_from_url(self, url: str) -> TargetID:
 		"""Get the TargetID from a URL."""
-		all_targets = await self.cdp_client.send.Target.getTargets()
-		for target in all_targets.get('targetInfos', []):
+		all_targets = await self._cdp_get_all_targets()
+		for target in all_targets:
 			if target['url'] == url and target['type'] == 'page':
 				return target['targetId']
 
 		# still not found, try substring match as fallback
-		for target in all_targets.get('targetInfos', []):
+		for target in all_targets:
 			if url in target['url'] and target['type'] == 'page':
 				return target['targetId']
 
@@ -1500,7 +1531,6 @@ class BrowserSession(BaseModel):
 
 	async def get_most_recently_opened_target_id(self) -> TargetID:
 		"""Get the most recently opened target ID."""
-		all_targets = await self.cdp_client.send.Target.getTargets()
 		return (await self._cdp_get_all_pages())[-1]['targetId']
 
 	def is_file_input(self, element: Any) -> bool:
@@ -1618,15 +1648,14 @@ class BrowserSession(BaseModel):
 		include_chrome_extensions: bool = False,
 		include_chrome_error: bool = False,
 	) -> list[TargetInfo]:
-		"""Get all browser pages/tabs using CDP Target.getTargets."""
+		"""Get all browser pages/tabs from the live target registry."""
 		# Safety check - return empty list if browser not connected yet
 		if not self._cdp_client_root:
 			return []
-		targets = await self.cdp_client.send.Target.getTargets()
 		# Filter for valid page/tab targets only
 		return [
 			t
-			for t in targets.get('targetInfos', [])
+			for t in await self._cdp_get_all_targets()
 			if self._is_valid_target(
 				t,
 				include_http=include_http,
@@ -1640,6 +1669,17 @@ class BrowserSession(BaseModel):
 			)
 		]
 
+	async def _cdp_get_all_targets(self) -> list[TargetInfo]:
+		"""Get all browser targets (pages, iframes, workers, ...) in the order they were opened.
+
+		Read from the target registry kept up to date by Target.setDiscoverTargets events, only falls back to a
+		Target.getTargets round trip if the registry isn't running.
+		"""
+		if self._target_registry.started:
+			return self._target_registry.all()
+		targets = await self.cdp_client.send.Target.getTargets()
+		return targets.get('targetInfos', [])
+
 	async def _cdp_create_new_page(self, url: str = 'about:blank', background: bool = False, new_window: bool = False) -> str:
 		"""Create a new page/tab using CDP Target.createTarget. Returns target ID."""
 		# Use the root CDP client to create tabs at the browser level
@@ -1820,6 +1860,9 @@ class BrowserSession(BaseModel):
 	async def get_all_frames(self) -> tuple[dict[str, dict], dict[str, str]]:
 		"""Get a complete frame hierarchy from all browser targets.
 
+		Frame trees come from the frame tree cache, and the hierarchy itself is only rebuilt when a target, a session or
+		one of the frame trees changed since the last call. Every call returns its own copy, so callers can modify it.
+
 		Returns:
 			Tuple of (all_frames, target_sessions) where:
 			- all_frames: dict mapping frame_id -> frame info dict with all metadata
@@ -1827,6 +1870,7 @@ class BrowserSession(BaseModel):
 		"""
 		all_frames = {}  # frame_id -> FrameInfo dict
 		target_sessions = {}  # target_id -> session_id (keep sessions alive during collection)
+		frame_trees: list[tuple[TargetInfo, FrameTree]] = []
 
 		# Check if cross-origin iframe support is enabled
 		include_cross_origin = self.browser_profile.cross_origin_iframes
@@ -1843,8 +1887,9 @@ class BrowserSession(BaseModel):
 			include_chrome_error=include_cross_origin,  # Only include error pages if cross-origin is enabled
 		)
 		all_targets = targets
+		self._frame_tree_cache.retain({target['targetId'] for target in all_targets})
 
-		# First pass: collect frame trees from ALL targets
+		# Collect frame trees from ALL targets
 		for target in all_targets:
 			target_id = target['targetId']
 
@@ -1868,89 +1913,103 @@ class BrowserSession(BaseModel):
 
 				try:
 					# Try to get frame tree (not all target types support this)
-					frame_tree_result = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
-
-					# Process the frame tree recursively
-					def process_frame_tree(node, parent_frame_id=None):
-						"""Recursively process frame tree and add to all_frames."""
-						frame = node.get('frame', {})
-						current_frame_id = frame.get('id')
-
-						if current_frame_id:
-							# For iframe targets, check if the frame has a parentId field
-							# This indicates it's an OOPIF with a parent in another target
-							actual_parent_id = frame.get('parentId') or parent_frame_id
-
-							# Create frame info with all CDP response data plus our additions
-							frame_info = {
-								**frame,  # Include all original frame data: id, url, parentId, etc.
-								'frameTargetId': target_id,  # Target that can access this frame
-								'parentFrameId': actual_parent_id,  # Use parentId from frame if available
-								'childFrameIds': [],  # Will be populated below
-								'isCrossOrigin': False,  # Will be determined based on context
-								'isValidTarget': self._is_valid_target(
-									target,
-									include_http=True,
-									include_about=True,
-									include_pages=True,
-									include_iframes=True,
-									include_workers=False,
-									include_chrome=False,  # chrome://newtab, chrome://settings, etc. are not valid frames we can control (for sanity reasons)
-									include_chrome_extensions=False,  # chrome-extension://
-									include_chrome_error=False,  # chrome-error://  (e.g. when iframes fail to load or are blocked by uBlock Origin)
-								),
-							}
-
-							# Check if frame is cross-origin based on crossOriginIsolatedContextType
-							cross_origin_type = frame.get('crossOriginIsolatedContextType')
-							if cross_origin_type and cross_origin_type != 'NotIsolated':
-								frame_info['isCrossOrigin'] = True
-
-							# For iframe targets, the frame itself is likely cross-origin
-							if target.get('type') == 'iframe':
-								frame_info['isCrossOrigin'] = True
-
-							# Skip cross-origin frames if support is disabled
-							if not include_cross_origin and frame_info.get('isCrossOrigin'):
-								return  # Skip this frame and its children
-
-							# Add child frame IDs (note: OOPIFs won't appear here)
-							child_frames = node.get('childFrames', [])
-							for child in child_frames:
-								child_frame = child.get('frame', {})
-								child_frame_id = child_frame.get('id')
-								if child_frame_id:
-									frame_info['childFrameIds'].append(child_frame_id)
-
-							# Store or merge frame info
-							if current_frame_id in all_frames:
-								# Frame already seen from another target, merge info
-								existing = all_frames[current_frame_id]
-								# If this is an iframe target, it has direct access to the frame
-								if target.get('type') == 'iframe':
-									existing['frameTargetId'] = target_id
-									existing['isCrossOrigin'] = True
-							else:
-								all_frames[current_frame_id] = frame_info
-
-							# Process child frames recursively (only if we're not skipping this frame)
-							if include_cross_origin or not frame_info.get('isCrossOrigin'):
-								for child in child_frames:
-									process_frame_tree(child, current_frame_id)
-
-					# Process the entire frame tree
-					process_frame_tree(frame_tree_result.get('frameTree', {}))
-
+					frame_trees.append((target, await self._frame_tree_cache.get_frame_tree(cdp_session)))
 				except Exception as e:
 					# Target doesn't support Page domain or has no frames
 					self.logger.debug(f'Failed to get frame tree for target {target_id}: {e}')
 
+		cache_key = (
+			include_cross_origin,
+			tuple((target['targetId'], target['type'], target['url']) for target in all_targets),
+			tuple(target_sessions.items()),
+			self._frame_tree_cache.generation,
+		)
+		if self._all_frames_cache and self._all_frames_cache[0] == cache_key:
+			_, all_frames, target_sessions = self._all_frames_cache
+			return copy.deepcopy(all_frames), dict(target_sessions)
+
+		# First pass: build the frame hierarchy from the frame trees
+		for target, frame_tree in frame_trees:
+			target_id = target['targetId']
+
+			# Process the frame tree recursively
+			def process_frame_tree(node, parent_frame_id=None):
+				"""Recursively process frame tree and add to all_frames."""
+				frame = node.get('frame', {})
+				current_frame_id = frame.get('id')
+
+				if current_frame_id:
+					# For iframe targets, check if the frame has a parentId field
+					# This indicates it's an OOPIF with a parent in another target
+					actual_parent_id = frame.get('parentId') or parent_frame_id
+
+					# Create frame info with all CDP response data plus our additions
+					frame_info = {
+						**frame,  # Include all original frame data: id, url, parentId, etc.
+						'frameTargetId': target_id,  # Target that can access this frame
+						'parentFrameId': actual_parent_id,  # Use parentId from frame if available
+						'childFrameIds': [],  # Will be populated below
+						'isCrossOrigin': False,  # Will be determined based on context
+						'isValidTarget': self._is_valid_target(
+							target,
+							include_http=True,
+							include_about=True,
+							include_pages=True,
+							include_iframes=True,
+							include_workers=False,
+							include_chrome=False,  # chrome://newtab, chrome://settings, etc. are not valid frames we can control (for sanity reasons)
+							include_chrome_extensions=False,  # chrome-extension://
+							include_chrome_error=False,  # chrome-error://  (e.g. when iframes fail to load or are blocked by uBlock Origin)
+						),
+					}
+
+					# Check if frame is cross-origin based on crossOriginIsolatedContextType
+					cross_origin_type = frame.get('crossOriginIsolatedContextType')
+					if cross_origin_type and cross_origin_type != 'NotIsolated':
+						frame_info['isCrossOrigin'] = True
+
+					# For iframe targets, the frame itself is likely cross-origin
+					if target.get('type') == 'iframe':
+						frame_info['isCrossOrigin'] = True
+
+					# Skip cross-origin frames if support is disabled
+					if not include_cross_origin and frame_info.get('isCrossOrigin'):
+						return  # Skip this frame and its children
+
+					# Add child frame IDs (note: OOPIFs won't appear here)
+					child_frames = node.get('childFrames', [])
+					for child in child_frames:
+						child_frame = child.get('frame', {})
+						child_frame_id = child_frame.get('id')
+						if child_frame_id:
+							frame_info['childFrameIds'].append(child_frame_id)
+
+					# Store or merge frame info
+					if current_frame_id in all_frames:
+						# Frame already seen from another target, merge info
+						existing = all_frames[current_frame_id]
+						# If this is an iframe target, it has direct access to the frame
+						if target.get('type') == 'iframe':
+							existing['frameTargetId'] = target_id
+							existing['isCrossOrigin'] = True
+					else:
+						all_frames[current_frame_id] = frame_info
+
+					# Process child frames recursively (only if we're not skipping this frame)
+					if include_cross_origin or not frame_info.get('isCrossOrigin'):
+						for child in child_frames:
+							process_frame_tree(child, current_frame_id)
+
+			# Process the entire frame tree
+			process_frame_tree(frame_tree)
+
 		# Second pass: populate backend node IDs and parent target IDs
 		# Only do this if cross-origin support is enabled
 		if include_cross_origin:
 			await self._populate_frame_metadata(all_frames, target_sessions)
 
-		return all_frames, target_sessions
+		self._all_frames_cache = (cache_key, all_frames, target_sessions)
+		return copy.deepcopy(all_frames), dict(target_sessions)
 
 	async def _populate_frame_metadata(self, all_frames: dict[str, dict], target_sessions: dict[str, str]) -> None:
 		"""Populate additional frame metadata like backend node IDs and parent target IDs.
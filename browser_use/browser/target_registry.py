@@ -0,0 +1,81 @@
+"""
+Live registry of the browser's targets (tabs, iframes, workers, ...), kept up to date from Target.targetCreated,
+Target.targetInfoChanged and Target.targetDestroyed, so reading tabs, titles and URLs doesn't need a CDP round trip.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from cdp_use.cdp.target.types import TargetID, TargetInfo
+
+if TYPE_CHECKING:
+	from cdp_use import CDPClient
+
+
+class TargetRegistry:
+	"""Target infos of the whole browser, in the order the targets were discovered."""
+
+	TRACKED_EVENTS = ('Target.targetCreated', 'Target.targetInfoChanged', 'Target.targetDestroyed')
+
+	def __init__(self, logger: logging.Logger | None = None):
+		self.logger = logger or logging.getLogger(__name__)
+		self.started = False
+
+		self._targets: dict[TargetID, TargetInfo] = {}
+		self._cdp_client: 'CDPClient | None' = None
+
+	def __len__(self) -> int:
+		return len(self._targets)
+
+	def __contains__(self, target_id: object) -> bool:
+		return target_id in self._targets
+
+	async def start(self, cdp_client: 'CDPClient') -> None:
+		"""Start target discovery on the browser level client and load the targets that already exist."""
+		if self.started:
+			return
+		self._cdp_client = cdp_client
+		for method in self.TRACKED_EVENTS:
+			cdp_client._event_registry.register(method, self._make_handler(method))
+		self.started = True
+
+		await cdp_client.send.Target.setDiscoverTargets(params={'discover': True})
+		# discovery reports the existing targets through events as well, this makes sure they're all known once we return
+		for target_info in (await cdp_client.send.Target.getTargets())['targetInfos']:
+			self._targets.setdefault(target_info['targetId'], target_info)
+
+	def stop(self) -> None:
+		"""Unregister the event handlers and forget all targets."""
+		if not self.started:
+			return
+		if self._cdp_client is not None:
+			for method in self.TRACKED_EVENTS:
+				self._cdp_client._event_registry.unregister(method)
+		self._cdp_client = None
+		self._targets.clear()
+		self.started = False
+
+	def get(self, target_id: TargetID) -> TargetInfo | None:
+		return self._targets.get(target_id)
+
+	def all(self) -> list[TargetInfo]:
+		"""Same shape as Target.getTargets()['targetInfos']."""
+		return list(self._targets.values())
+
+	def record(self, method: str, event: dict[str, Any]) -> None:
+		if method == 'Target.targetDestroyed':
+			self._targets.pop(event['targetId'], None)
+			return
+
+		target_info: TargetInfo = event['targetInfo']
+		target_id = target_info['targetId']
+		if method == 'Target.targetInfoChanged' and target_id not in self._targets:
+			self.logger.debug(f'Target info changed for unknown target {target_id}, adding it')
+		# updating an existing key keeps the target's position, new targets go last
+		self._targets[target_id] = target_info
+
+	def _make_handler(self, method: str):
+		def handler(event: Any, session_id: str | None = None) -> None:
+			self.record(method, event)
+
+		return handler
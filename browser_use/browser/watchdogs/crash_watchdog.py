@@ -109,7 +109,8 @@ class CrashWatchdog(BaseWatchdog):
 
 			def on_target_crashed(event: TargetCrashedEvent, session_id: SessionID | None = None):
 				# Create and track the task
-				task = asyncio.create_task(self._on_target_crash_cdp(target_id))
+				# sessions can share a client (and this handler), so trust the event over the closure
+				task = asyncio.create_task(self._on_target_crash_cdp(event.get('targetId', target_id)))
 				self._cdp_event_tasks.add(task)
 				# Remove from set when done
 				task.add_done_callback(lambda t: self._cdp_event_tasks.discard(t))
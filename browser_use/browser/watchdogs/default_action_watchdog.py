@@ -21,6 +21,7 @@ from browser_use.browser.events import (
 )
 from browser_use.browser.views import BrowserError, URLNotAllowedError
 from browser_use.browser.watchdog_base import BaseWatchdog
+from browser_use.dom.mutations import get_document
 from browser_use.dom.service import EnhancedDOMTreeNode
 
 # Import EnhancedDOMTreeNode and rebuild event models that have forward references to it
@@ -988,10 +989,10 @@ class DefaultActionWatchdog(BaseWatchdog):
 			# Element is in an iframe, need to get session for that frame
 			try:
 				# Get all targets
-				targets = await self.browser_session.cdp_client.send.Target.getTargets()
+				targets = await self.browser_session._cdp_get_all_targets()
 
 				# Find the target for this frame
-				for target in targets['targetInfos']:
+				for target in targets:
 					if target['type'] == 'iframe' and element_node.frame_id in str(target.get('targetId', '')):
 						# Create temporary session for iframe target without switching focus
 						target_id = target['targetId']
@@ -1306,7 +1307,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 		await cdp_client.send.DOM.enable(session_id=session_id)
 
 		# Get document
-		doc = await cdp_client.send.DOM.getDocument(params={'depth': -1}, session_id=session_id)
+		doc = await get_document(cdp_client, session_id, params={'depth': -1})
 		root_node_id = doc['root']['nodeId']
 
 		# Search for text using XPath
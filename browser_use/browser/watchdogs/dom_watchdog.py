@@ -1,6 +1,7 @@
 """DOM watchdog for browser DOM tree management using CDP."""
 
 import asyncio
+import dataclasses
 import time
 from typing import TYPE_CHECKING
 
@@ -10,6 +11,8 @@ from browser_use.browser.events import (
 	ScreenshotEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.network_idle import NetworkIdleTracker
+from browser_use.browser.page_fingerprint import PageFingerprint, get_page_fingerprint
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.dom.service import DomService
 from browser_use.dom.views import (
@@ -18,6 +21,7 @@ from browser_use.dom.views import (
 )
 
 if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
 	from browser_use.browser.views import BrowserStateSummary, PageInfo
 
 
@@ -36,9 +40,19 @@ class DOMWatchdog(BaseWatchdog):
 	selector_map: dict[int, EnhancedDOMTreeNode] | None = None
 	current_dom_state: SerializedDOMState | None = None
 	enhanced_dom_tree: EnhancedDOMTreeNode | None = None
+	network_wait_time_saved: float = 0.0
+	"""Total seconds of fixed page load waits skipped because the network went idle earlier."""
+	reused_state_count: int = 0
+	"""Number of browser state requests answered with the previous state because the page didn't change."""
+	last_state_time: float = 0.0
+	"""Seconds the last browser state that wasn't reused took to build."""
+	stale_check_time_saved: float = 0.0
+	"""Total seconds of state rebuilds between actions avoided by `is_element_still_valid`."""
 
 	# Internal DOM service
 	_dom_service: DomService | None = None
+	_network_idle_tracker: NetworkIdleTracker | None = None
+	_page_fingerprint: PageFingerprint | None = None
 
 	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
 		# self.logger.debug('Setting up init scripts in browser')
@@ -149,6 +163,7 @@ class DOMWatchdog(BaseWatchdog):
 		from browser_use.browser.views import BrowserStateSummary, PageInfo
 
 		self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: STARTING browser state request')
+		state_start = time.time()
 		page_url = await self.browser_session.get_current_page_url()
 		self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got page URL: {page_url}')
 		if self.browser_session.agent_focus:
@@ -232,65 +247,88 @@ class DOMWatchdog(BaseWatchdog):
 					recent_events=self._get_recent_events_str() if event.include_recent_events else None,
 				)
 
-			# Normal path: Build DOM tree if requested
-			if event.include_dom:
-				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🌳 Building DOM tree...')
-
-				# Build the DOM directly using the internal method
-				previous_state = (
-					self.browser_session._cached_browser_state_summary.dom_state
-					if self.browser_session._cached_browser_state_summary
-					else None
+			# Fast path for pages that didn't change since the last state, e.g. after a wait or a click that did nothing
+			fingerprint = await self._get_page_fingerprint(page_url) if event.include_dom else None
+			cached_state = self.browser_session._cached_browser_state_summary
+			if (
+				fingerprint is not None
+				and fingerprint == self._page_fingerprint
+				and cached_state is not None
+				and cached_state.url == page_url
+				and cached_state.dom_state is self.current_dom_state
+				and (cached_state.screenshot or not event.include_screenshot)
+			):
+				self.logger.debug('⚡ Page unchanged since the last browser state, reusing it')
+				self.reused_state_count += 1
+				return dataclasses.replace(
+					cached_state,
+					tabs=tabs_info,
+					recent_events=self._get_recent_events_str() if event.include_recent_events else None,
 				)
+			self._page_fingerprint = None
+
+			# The screenshot only has to wait for the DOM when it shows the highlights injected into the page for the new DOM
+			# state, otherwise it's captured at the same time as the DOM snapshot, DOM tree and AX tree. It captures the page
+			# session explicitly, building the DOM opens sessions for the page's iframe targets meanwhile
+			screenshot_task = None
+			needs_page_highlights = event.include_dom and self._highlights_on_page
+			if (
+				event.include_screenshot
+				and not needs_page_highlights
+				and self.browser_session._screenshot_watchdog is not None
+				and self.browser_session.agent_focus is not None
+			):
+				screenshot_task = asyncio.create_task(self._capture_screenshot(cdp_session=self.browser_session.agent_focus))
 
-				try:
-					# Call the DOM building method directly
-					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Starting _build_dom_tree...')
-					content = await self._build_dom_tree(previous_state)
-					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ _build_dom_tree completed')
-				except Exception as e:
-					self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: DOM build failed: {e}, using minimal state')
-					content = SerializedDOMState(_root=None, selector_map={})
+			try:
+				# Normal path: Build DOM tree if requested
+				if event.include_dom:
+					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🌳 Building DOM tree...')
+
+					# Build the DOM directly using the internal method
+					previous_state = (
+						self.browser_session._cached_browser_state_summary.dom_state
+						if self.browser_session._cached_browser_state_summary
+						else None
+					)
 
-				if not content:
-					# Fallback to minimal DOM state
-					self.logger.warning('DOM build returned no content, using minimal state')
+					try:
+						# Call the DOM building method directly
+						self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Starting _build_dom_tree...')
+						content = await self._build_dom_tree(previous_state)
+						self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ _build_dom_tree completed')
+					except Exception as e:
+						self.logger.warning(
+							f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: DOM build failed: {e}, using minimal state'
+						)
+						content = SerializedDOMState(_root=None, selector_map={})
+
+					if not content:
+						# Fallback to minimal DOM state
+						self.logger.warning('DOM build returned no content, using minimal state')
+						content = SerializedDOMState(_root=None, selector_map={})
+				else:
+					# Skip DOM building if not requested
 					content = SerializedDOMState(_root=None, selector_map={})
-			else:
-				# Skip DOM building if not requested
-				content = SerializedDOMState(_root=None, selector_map={})
-
-			# re-focus top-level page session context
-			assert self.browser_session.agent_focus is not None, 'No current target ID'
-			await self.browser_session.get_or_create_cdp_session(target_id=self.browser_session.agent_focus.target_id, focus=True)
 
-			# Get screenshot if requested
-			screenshot_b64 = None
-			if event.include_screenshot:
-				self.logger.debug(
-					f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: 📸 DOM watchdog requesting screenshot, include_screenshot={event.include_screenshot}'
+				# re-focus top-level page session context
+				assert self.browser_session.agent_focus is not None, 'No current target ID'
+				await self.browser_session.get_or_create_cdp_session(
+					target_id=self.browser_session.agent_focus.target_id, focus=True
 				)
-				try:
-					# Check if handler is registered
-					handlers = self.event_bus.handlers.get('ScreenshotEvent', [])
-					handler_names = [getattr(h, '__name__', str(h)) for h in handlers]
-					self.logger.debug(f'📸 ScreenshotEvent handlers registered: {len(handlers)} - {handler_names}')
-
-					screenshot_event = self.event_bus.dispatch(ScreenshotEvent(full_page=False))
-					self.logger.debug('📸 Dispatched ScreenshotEvent, waiting for event to complete...')
 
-					# Wait for the event itself to complete (this waits for all handlers)
-					await screenshot_event
-
-					# Get the single handler result
-					screenshot_b64 = await screenshot_event.event_result(raise_if_any=True, raise_if_none=True)
-				except TimeoutError:
-					self.logger.warning('📸 Screenshot timed out after 6 seconds - no handler registered or slow page?')
-
-				except Exception as e:
-					self.logger.warning(f'📸 Screenshot failed: {type(e).__name__}: {e}')
-			else:
-				self.logger.debug(f'📸 Skipping screenshot, include_screenshot={event.include_screenshot}')
+				# Get screenshot if requested
+				screenshot_b64 = None
+				if screenshot_task is not None:
+					screenshot_b64 = await screenshot_task
+				elif event.include_screenshot:
+					screenshot_b64 = await self._capture_screenshot()
+				else:
+					self.logger.debug(f'📸 Skipping screenshot, include_screenshot={event.include_screenshot}')
+			finally:
+				# the DOM build or the re-focus failed (or we got cancelled) before the screenshot was awaited
+				if screenshot_task is not None and not screenshot_task.done():
+					screenshot_task.cancel()
 
 			# Tabs info already fetched at the beginning
 
@@ -327,6 +365,9 @@ class DOMWatchdog(BaseWatchdog):
 					pixels_right=0,
 				)
 
+			if screenshot_b64 and self._highlights_on_screenshot and content.selector_map:
+				screenshot_b64 = await self._draw_highlights(screenshot_b64, content, page_info)
+
 			# Check for PDF viewer
 			is_pdf_viewer = page_url.endswith('.pdf') or '/pdf/' in page_url
 
@@ -354,8 +395,10 @@ class DOMWatchdog(BaseWatchdog):
 				recent_events=self._get_recent_events_str() if event.include_recent_events else None,
 			)
 
-			# Cache the state
+			# Cache the state, the fingerprint was taken before building it so changes made meanwhile invalidate it
 			self.browser_session._cached_browser_state_summary = browser_state
+			self._page_fingerprint = fingerprint if self.current_dom_state is content else None
+			self.last_state_time = time.time() - state_start
 
 			self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ COMPLETED - Returning browser state')
 			return browser_state
@@ -402,8 +445,9 @@ class DOMWatchdog(BaseWatchdog):
 			self.logger.debug('🔍 DOMWatchdog._build_dom_tree: STARTING DOM tree build')
 			# Remove any existing highlights before building new DOM
 			try:
-				self.logger.debug('🔍 DOMWatchdog._build_dom_tree: Removing existing highlights...')
-				await self.browser_session.remove_highlights()
+				if self._highlights_on_page:
+					self.logger.debug('🔍 DOMWatchdog._build_dom_tree: Removing existing highlights...')
+					await self.browser_session.remove_highlights()
 				# self.logger.debug('🔍 DOMWatchdog._build_dom_tree: ✅ Highlights removed')
 			except Exception as e:
 				self.logger.debug(f'🔍 DOMWatchdog._build_dom_tree: Failed to remove existing highlights: {e}')
@@ -415,6 +459,10 @@ class DOMWatchdog(BaseWatchdog):
 					browser_session=self.browser_session,
 					logger=self.logger,
 					cross_origin_iframes=self.browser_session.browser_profile.cross_origin_iframes,
+					cross_origin_iframe_timeout=self.browser_session.browser_profile.cross_origin_iframe_timeout,
+					incremental_dom_updates=self.browser_session.browser_profile.incremental_dom_updates,
+					ax_tree_mode=self.browser_session.browser_profile.ax_tree_mode,
+					paint_order_filtering=self.browser_session.browser_profile.paint_order_filtering,
 				)
 				# self.logger.debug('🔍 DOMWatchdog._build_dom_tree: ✅ DomService created')
 			# else:
@@ -441,7 +489,7 @@ class DOMWatchdog(BaseWatchdog):
 			self.logger.debug(f'🔍 DOMWatchdog._build_dom_tree: ✅ Selector maps updated, {len(self.selector_map)} elements')
 
 			# Inject highlighting for visual feedback if we have elements
-			if self.selector_map and self._dom_service:
+			if self._highlights_on_page and self.selector_map and self._dom_service:
 				try:
 					self.logger.debug('🔍 DOMWatchdog._build_dom_tree: Injecting highlighting script...')
 					from browser_use.dom.debug.highlights import inject_highlighting_script
@@ -467,17 +515,37 @@ class DOMWatchdog(BaseWatchdog):
 			raise
 
 	async def _wait_for_stable_network(self):
-		"""Wait for page stability - simplified for CDP-only branch."""
+		"""Wait for page stability - simplified for CDP-only branch.
+
+		Returns as soon as the network is idle for `network_idle_window`, the fixed wait times are only an upper bound.
+		"""
 		start_time = time.time()
+		profile = self.browser_session.browser_profile
+		max_wait = profile.minimum_wait_page_load_time + profile.wait_for_network_idle_page_load_time
+
+		if profile.network_idle_window > 0 and max_wait > 0:
+			tracker = await self._get_network_idle_tracker()
+			if tracker is not None:
+				is_idle = await tracker.wait_for_idle(idle_time=profile.network_idle_window, timeout=max_wait)
+				elapsed = time.time() - start_time
+				saved = max(max_wait - elapsed, 0.0)
+				self.network_wait_time_saved += saved
+				if is_idle:
+					self.logger.debug(f'✅ Network idle after {elapsed:.2f}s, saved {saved:.2f}s of fixed page load wait')
+				else:
+					self.logger.debug(
+						f'⏳ Network still busy after {elapsed:.2f}s ({tracker.in_flight_requests} requests in flight), continuing'
+					)
+				return
 
 		# Apply minimum wait time first (let page settle)
-		min_wait = self.browser_session.browser_profile.minimum_wait_page_load_time
+		min_wait = profile.minimum_wait_page_load_time
 		if min_wait > 0:
 			self.logger.debug(f'⏳ Minimum wait: {min_wait}s')
 			await asyncio.sleep(min_wait)
 
 		# Apply network idle wait time (for dynamic content like iframes)
-		network_idle_wait = self.browser_session.browser_profile.wait_for_network_idle_page_load_time
+		network_idle_wait = profile.wait_for_network_idle_page_load_time
 		if network_idle_wait > 0:
 			self.logger.debug(f'⏳ Network idle wait: {network_idle_wait}s')
 			await asyncio.sleep(network_idle_wait)
@@ -485,6 +553,138 @@ class DOMWatchdog(BaseWatchdog):
 		elapsed = time.time() - start_time
 		self.logger.debug(f'✅ Page stability wait completed in {elapsed:.2f}s')
 
+	async def _get_network_idle_tracker(self) -> NetworkIdleTracker | None:
+		"""Network idle tracker for the focused target, or None if the Network domain can't be followed."""
+		agent_focus = self.browser_session.agent_focus
+		if agent_focus is None:
+			return None
+
+		tracker = self._network_idle_tracker
+		if tracker is not None and tracker.cdp_session.session_id == agent_focus.session_id:
+			return tracker
+
+		if tracker is not None:
+			await tracker.stop()
+			self._network_idle_tracker = None
+
+		tracker = NetworkIdleTracker(agent_focus, logger=self.logger)
+		try:
+			await tracker.start()
+		except Exception as e:
+			self.logger.debug(f'Failed to start network idle tracking, using fixed page load waits: {e}')
+			await tracker.stop()
+			return None
+		self._network_idle_tracker = tracker
+		return tracker
+
+	@property
+	def _highlights_on_page(self) -> bool:
+		profile = self.browser_session.browser_profile
+		return profile.highlight_elements and profile.highlight_rendering == 'page'
+
+	@property
+	def _highlights_on_screenshot(self) -> bool:
+		profile = self.browser_session.browser_profile
+		return profile.highlight_elements and profile.highlight_rendering == 'screenshot'
+
+	async def _draw_highlights(self, screenshot_b64: str, dom_state: SerializedDOMState, page_info: 'PageInfo') -> str:
+		"""Draw the highlights of `dom_state` onto the screenshot, off the event loop. Returns it unchanged on failure."""
+		from browser_use.dom.debug.highlights import draw_highlights_on_screenshot
+
+		profile = self.browser_session.browser_profile
+		if profile.screenshot_clip_to_viewport:
+			css_width, offset_x, offset_y = page_info.viewport_width, 0, 0
+		else:
+			css_width, offset_x, offset_y = page_info.page_width, page_info.scroll_x, page_info.scroll_y
+		try:
+			return await asyncio.to_thread(
+				draw_highlights_on_screenshot,
+				screenshot_b64,
+				dom_state.selector_map,
+				css_width,
+				offset_x,
+				offset_y,
+				profile.screenshot_quality,
+			)
+		except Exception as e:
+			self.logger.warning(f'📸 Failed to draw highlights onto the screenshot: {type(e).__name__}: {e}')
+			return screenshot_b64
+
+	async def _capture_screenshot(self, cdp_session: 'CDPSession | None' = None) -> str | None:
+		"""Capture a screenshot of the focused page, None if that failed.
+
+		With a `cdp_session` that page is captured concurrently with the DOM by calling the ScreenshotWatchdog directly:
+		dispatching the ScreenshotEvent from a concurrent task would process the event queue next to the running
+		BrowserStateRequestEvent handler.
+		"""
+		screenshot_watchdog = self.browser_session._screenshot_watchdog
+		try:
+			if cdp_session is not None and screenshot_watchdog is not None:
+				self.logger.debug('📸 Capturing screenshot concurrently with the DOM')
+				return await asyncio.wait_for(
+					screenshot_watchdog.capture_screenshot(cdp_session=cdp_session),
+					timeout=ScreenshotEvent.model_fields['event_timeout'].default,
+				)
+
+			# Check if handler is registered
+			handlers = self.event_bus.handlers.get('ScreenshotEvent', [])
+			handler_names = [getattr(h, '__name__', str(h)) for h in handlers]
+			self.logger.debug(f'📸 ScreenshotEvent handlers registered: {len(handlers)} - {handler_names}')
+
+			screenshot_event = self.event_bus.dispatch(ScreenshotEvent(full_page=False))
+			self.logger.debug('📸 Dispatched ScreenshotEvent, waiting for event to complete...')
+
+			# Wait for the event itself to complete (this waits for all handlers)
+			await screenshot_event
+
+			# Get the single handler result
+			return await screenshot_event.event_result(raise_if_any=True, raise_if_none=True)
+		except TimeoutError:
+			self.logger.warning('📸 Screenshot timed out after 6 seconds - no handler registered or slow page?')
+		except Exception as e:
+			self.logger.warning(f'📸 Screenshot failed: {type(e).__name__}: {e}')
+		return None
+
+	async def is_element_still_valid(self, node: EnhancedDOMTreeNode) -> bool:
+		"""Cheap check that the cached DOM state, and `node` from its selector map, still describe the page.
+
+		True when the page fingerprint still matches the one taken for the cached state, i.e. nothing navigated, mutated,
+		scrolled or got typed into since, so no element can have changed or appeared, and the node still resolves over CDP.
+		False means a full state rebuild is needed to tell.
+
+		Waits for the network to settle first like the rebuild does, so the DOM changes of requests started by the previous
+		action (e.g. a click that fetches and renders results) are part of the fingerprint.
+		"""
+		if self.current_dom_state is None or self._page_fingerprint is None:
+			return False
+		try:
+			await self._wait_for_stable_network()
+		except Exception as e:
+			self.logger.debug(f'Network waiting failed before the stale element check: {e}')
+			return False
+		fingerprint = await self._get_page_fingerprint(await self.browser_session.get_current_page_url())
+		if fingerprint is None or fingerprint != self._page_fingerprint or self.current_dom_state is None:
+			return False
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=node.target_id, focus=False)
+			await cdp_session.cdp_client.send.DOM.describeNode(
+				params={'backendNodeId': node.backend_node_id}, session_id=cdp_session.session_id
+			)
+		except Exception as e:
+			self.logger.debug(f'Element {node.backend_node_id} no longer resolves: {type(e).__name__}: {e}')
+			return False
+		return True
+
+	async def _get_page_fingerprint(self, page_url: str) -> PageFingerprint | None:
+		"""Fingerprint the focused page, None when reusing unchanged page states is disabled or it can't be fingerprinted."""
+		if not self.browser_session.browser_profile.reuse_unchanged_page_state or not self.browser_session.agent_focus:
+			return None
+		try:
+			return await asyncio.wait_for(get_page_fingerprint(self.browser_session.agent_focus, page_url), timeout=2.0)
+		except Exception as e:
+			self.logger.debug(f'Failed to fingerprint the page: {type(e).__name__}: {e}')
+			return None
+
 	async def _get_page_info(self) -> 'PageInfo':
 		"""Get comprehensive page information using a single CDP call.
 
@@ -581,6 +781,7 @@ class DOMWatchdog(BaseWatchdog):
 		self.selector_map = None
 		self.current_dom_state = None
 		self.enhanced_dom_tree = None
+		self._page_fingerprint = None
 		# Keep the DOM service instance to reuse its CDP client connection
 
 	def is_file_input(self, element: EnhancedDOMTreeNode) -> bool:
@@ -597,6 +798,9 @@ class DOMWatchdog(BaseWatchdog):
 
 	async def __aexit__(self, exc_type, exc_value, traceback):
 		"""Clean up DOM service on exit."""
+		if self._network_idle_tracker:
+			await self._network_idle_tracker.stop()
+			self._network_idle_tracker = None
 		if self._dom_service:
 			await self._dom_service.__aexit__(exc_type, exc_value, traceback)
 			self._dom_service = None
@@ -606,3 +810,4 @@ class DOMWatchdog(BaseWatchdog):
 		super().__del__()
 		# DOM service will clean up its own CDP client
 		self._dom_service = None
+		self._network_idle_tracker = None
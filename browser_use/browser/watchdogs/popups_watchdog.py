@@ -78,6 +78,8 @@ class PopupsWatchdog(BaseWatchdog):
 					self.logger.error(f'Failed to accept dialog: {e}')
 
 			cdp_session.cdp_client.register.Page.javascriptDialogOpening(handle_dialog)  # type: ignore[arg-type]
+			# dialogs are only reported with the Page domain enabled, which multiplexed sessions only do on first use
+			await cdp_session.cdp_client.send.Page.enable(session_id=cdp_session.session_id)
 			self.logger.debug(
 				f'Successfully registered Page.javascriptDialogOpening handler for session {cdp_session.session_id}'
 			)
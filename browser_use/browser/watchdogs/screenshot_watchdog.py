@@ -1,16 +1,17 @@
 """Screenshot watchdog for handling screenshot requests using CDP."""
 
+import time
 from typing import TYPE_CHECKING, Any, ClassVar
 
 from bubus import BaseEvent
-from cdp_use.cdp.page import CaptureScreenshotParameters
+from cdp_use.cdp.page import CaptureScreenshotParameters, Viewport
 
 from browser_use.browser.events import ScreenshotEvent
 from browser_use.browser.views import BrowserError
 from browser_use.browser.watchdog_base import BaseWatchdog
 
 if TYPE_CHECKING:
-	pass
+	from browser_use.browser.session import CDPSession
 
 
 class ScreenshotWatchdog(BaseWatchdog):
@@ -22,6 +23,11 @@ class ScreenshotWatchdog(BaseWatchdog):
 	# Events this watchdog emits
 	EMITS: ClassVar[list[type[BaseEvent[Any]]]] = []
 
+	last_screenshot_size: int = 0
+	"""Size in bytes of the last screenshot (decoded)."""
+	last_screenshot_time: float = 0.0
+	"""Seconds the last screenshot took to capture and encode."""
+
 	async def on_ScreenshotEvent(self, event: ScreenshotEvent) -> str:
 		"""Handle screenshot request using CDP.
 
@@ -29,15 +35,43 @@ class ScreenshotWatchdog(BaseWatchdog):
 			event: ScreenshotEvent with optional full_page and clip parameters
 
 		Returns:
-			Dict with 'screenshot' key containing base64-encoded screenshot or None
+			Base64-encoded screenshot
 		"""
 		self.logger.debug('[ScreenshotWatchdog] Handler START - on_ScreenshotEvent called')
+		try:
+			return await self.capture_screenshot(full_page=event.full_page, clip=event.clip)
+		finally:
+			# Try to remove highlights even on failure
+			profile = self.browser_session.browser_profile
+			if profile.highlight_elements and profile.highlight_rendering == 'page':
+				try:
+					await self.browser_session.remove_highlights()
+				except Exception:
+					pass
+
+	async def capture_screenshot(
+		self, full_page: bool = False, clip: dict[str, float] | None = None, cdp_session: 'CDPSession | None' = None
+	) -> str:
+		"""Capture the focused page without going through the event bus, e.g. concurrently with the DOM capture.
+
+		Format, quality, size and clipping come from the browser profile (`screenshot_*` settings) and are all applied by
+		the browser, so the image is never decoded and re-encoded on our side. Unlike `on_ScreenshotEvent` this leaves the
+		element highlights on the page.
+
+		Args:
+			cdp_session: Page to capture instead of the focused one, for captures that run while the focus can move
+
+		Returns:
+			Base64-encoded screenshot
+		"""
 		try:
 			# Get CDP client and session for current target
-			cdp_session = await self.browser_session.get_or_create_cdp_session()
+			if cdp_session is None:
+				cdp_session = await self.browser_session.get_or_create_cdp_session()
+			start = time.time()
 
 			# Prepare screenshot parameters
-			params = CaptureScreenshotParameters(format='png', captureBeyondViewport=False)
+			params = await self._get_screenshot_params(cdp_session, full_page, clip)
 
 			# Take screenshot using CDP
 			self.logger.debug(f'[ScreenshotWatchdog] Taking screenshot with params: {params}')
@@ -45,16 +79,59 @@ class ScreenshotWatchdog(BaseWatchdog):
 
 			# Return base64-encoded screenshot data
 			if result and 'data' in result:
-				self.logger.debug('[ScreenshotWatchdog] Screenshot captured successfully')
+				self.last_screenshot_time = time.time() - start
+				self.last_screenshot_size = len(result['data']) * 3 // 4
+				self.logger.debug(
+					f'[ScreenshotWatchdog] Screenshot captured successfully: {params.get("format", "png")}, '
+					f'{self.last_screenshot_size / 1024:.0f} KB in {self.last_screenshot_time * 1000:.0f} ms'
+				)
 				return result['data']
 
 			raise BrowserError('[ScreenshotWatchdog] Screenshot result missing data')
 		except Exception as e:
 			self.logger.error(f'[ScreenshotWatchdog] Screenshot failed: {e}')
 			raise
-		finally:
-			# Try to remove highlights even on failure
-			try:
-				await self.browser_session.remove_highlights()
-			except Exception:
-				pass
+
+	async def _get_screenshot_params(
+		self, cdp_session: 'CDPSession', full_page: bool, clip: dict[str, float] | None
+	) -> CaptureScreenshotParameters:
+		"""Build the Page.captureScreenshot parameters from the profile's screenshot settings."""
+		profile = self.browser_session.browser_profile
+		full_page = full_page or not profile.screenshot_clip_to_viewport
+
+		params = CaptureScreenshotParameters(format=profile.screenshot_format, captureBeyondViewport=full_page)
+		if profile.screenshot_format != 'png':
+			# faster encoding for a slightly larger image, with png the images would get a lot larger
+			params['optimizeForSpeed'] = True
+			if profile.screenshot_quality is not None:
+				params['quality'] = profile.screenshot_quality
+
+		# captureBeyondViewport alone still returns the viewport, the full page has to be clipped to the content size
+		if profile.screenshot_max_dimension is not None or (full_page and clip is None):
+			metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id)
+			viewport = metrics['cssVisualViewport']
+			if full_page and clip is None:
+				content_size = metrics['cssContentSize']
+				clip = {'x': 0, 'y': 0, 'width': content_size['width'], 'height': content_size['height']}
+
+			if profile.screenshot_max_dimension is not None:
+				if clip is None:
+					clip = {
+						'x': viewport['pageX'],
+						'y': viewport['pageY'],
+						'width': viewport['clientWidth'],
+						'height': viewport['clientHeight'],
+					}
+				# clip is in CSS pixels, the image comes out in device pixels
+				device_pixel_ratio = (
+					metrics['visualViewport']['clientWidth'] / viewport['clientWidth'] if viewport['clientWidth'] else 1.0
+				)
+				largest_side = max(clip['width'], clip['height']) * device_pixel_ratio
+				scale = min(1.0, profile.screenshot_max_dimension / largest_side) if largest_side else 1.0
+				clip = {**clip, 'scale': clip.get('scale', 1.0) * scale}
+
+		if clip is not None:
+			params['clip'] = Viewport(
+				x=clip['x'], y=clip['y'], width=clip['width'], height=clip['height'], scale=clip.get('scale', 1.0)
+			)
+		return params
@@ -35,6 +35,8 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		# Action models by the names of the actions they include, with the actions they were built from
+		self._action_model_cache: dict[tuple[str, ...], tuple[tuple[RegisteredAction, ...], type[ActionModel]]] = {}
 
 	def _get_special_param_types(self) -> dict[str, type | UnionType | None]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
@@ -337,8 +339,7 @@ class Registry(Generic[Context]):
 				if browser_session and browser_session.current_target_id:
 					try:
 						# Get current page info using CDP
-						targets = await browser_session.cdp_client.send.Target.getTargets()
-						for target in targets.get('targetInfos', []):
+						for target in await browser_session._cdp_get_all_targets():
 							if target.get('targetId') == browser_session.current_target_id:
 								current_url = target.get('url')
 								break
@@ -480,8 +481,6 @@ class Registry(Generic[Context]):
 		Each action model contains only the specific action being used,
 		rather than all actions with most set to None.
 		"""
-		from typing import Union
-
 		# Filter actions based on page_url if provided:
 		#   if page_url is None, only include actions with no filters
 		#   if page_url is provided, only include actions that match the URL
@@ -504,6 +503,22 @@ class Registry(Generic[Context]):
 			if domain_is_allowed:
 				available_actions[name] = action
 
+		# Steps on the same site select the same actions, so reuse the model built for them the last time.
+		# The actions are compared by identity too, re-registering an action under the same name builds a new model.
+		cache_key = tuple(available_actions)
+		actions = tuple(available_actions.values())
+		cached = self._action_model_cache.get(cache_key)
+		if cached is not None and all(cached_action is action for cached_action, action in zip(cached[0], actions)):
+			return cached[1]
+
+		action_model = self._build_action_model(available_actions)
+		self._action_model_cache[cache_key] = (actions, action_model)
+		return action_model
+
+	def _build_action_model(self, available_actions: dict[str, RegisteredAction]) -> type[ActionModel]:
+		"""Build the action model for `create_action_model` from the actions available on the page"""
+		from typing import Union
+
 		# Create individual action models for each action
 		individual_action_models: list[type[BaseModel]] = []
 
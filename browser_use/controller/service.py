@@ -47,6 +47,7 @@ from browser_use.controller.views import (
 	SwitchTabAction,
 	UploadFileAction,
 )
+from browser_use.dom.mutations import get_document
 from browser_use.dom.service import EnhancedDOMTreeNode
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
@@ -610,7 +611,7 @@ Please provide a direct, factual answer."""
 
 			try:
 				# Get the HTML content
-				body_id = await cdp_session.cdp_client.send.DOM.getDocument(session_id=cdp_session.session_id)
+				body_id = await get_document(cdp_session.cdp_client, cdp_session.session_id)
 				page_html_result = await cdp_session.cdp_client.send.DOM.getOuterHTML(
 					params={'backendNodeId': body_id['root']['backendNodeId']}, session_id=cdp_session.session_id
 				)
@@ -1,5 +1,7 @@
 # 100% vibe coded
 
+import base64
+import io
 import json
 import logging
 import traceback
@@ -9,6 +11,10 @@ from browser_use.dom.views import DOMSelectorMap
 
 logger = logging.getLogger(__name__)
 
+# same look as the page overlay below: orange outlines with the interactive index in a label above the top left corner
+HIGHLIGHT_COLOR = '#fd7e14'
+HIGHLIGHT_PIL_FORMATS = {'image/png': 'PNG', 'image/jpeg': 'JPEG', 'image/webp': 'WEBP'}
+
 
 def convert_dom_selector_map_to_highlight_format(selector_map: DOMSelectorMap) -> list[dict]:
 	"""Convert DOMSelectorMap to the format expected by the highlighting script."""
@@ -403,3 +409,60 @@ async def inject_highlighting_script(dom_service: DomService, interactive_elemen
 	except Exception as e:
 		logger.debug(f'❌ Error injecting enhanced highlighting script: {e}')
 		traceback.print_exc()
+
+
+def draw_highlights_on_screenshot(
+	screenshot_b64: str,
+	interactive_elements: DOMSelectorMap,
+	css_width: float,
+	offset_x: float = 0.0,
+	offset_y: float = 0.0,
+	quality: int | None = None,
+) -> str:
+	"""Draw the highlights onto a screenshot with PIL instead of injecting them into the page.
+
+	Args:
+		screenshot_b64: Base64 encoded png, jpeg or webp screenshot, re-encoded in the same format
+		interactive_elements: Elements to highlight, their positions are relative to the viewport in CSS pixels
+		css_width: Width of the captured area in CSS pixels, to scale positions to the screenshot's pixels
+		offset_x: Horizontal position of the viewport within the captured area (scroll position for full page screenshots)
+		offset_y: Vertical position of the viewport within the captured area
+		quality: Compression quality for jpeg and webp screenshots
+	"""
+	from PIL import Image, ImageDraw, ImageFont
+
+	from browser_use.screenshots.service import get_screenshot_media_type
+
+	image = Image.open(io.BytesIO(base64.b64decode(screenshot_b64)))
+	media_type = get_screenshot_media_type(screenshot_b64)
+	if image.mode not in ('RGB', 'RGBA') or media_type == 'image/jpeg':
+		image = image.convert('RGB')
+
+	scale = image.width / css_width if css_width else 1.0
+	outline_width = max(1, round(2 * scale))
+	font = ImageFont.load_default(size=max(8, round(11 * scale)))
+	draw = ImageDraw.Draw(image)
+
+	for element in convert_dom_selector_map_to_highlight_format(interactive_elements):
+		left = (element['x'] + offset_x) * scale
+		top = (element['y'] + offset_y) * scale
+		right = left + element['width'] * scale
+		bottom = top + element['height'] * scale
+		if right < 0 or bottom < 0 or left > image.width or top > image.height:
+			continue
+		draw.rectangle((left, top, right, bottom), outline=HIGHLIGHT_COLOR, width=outline_width)
+
+		label = str(element['interactive_index'])
+		text_left, text_top, text_right, text_bottom = draw.textbbox((0, 0), label, font=font)
+		padding = round(3 * scale)
+		label_width = text_right - text_left + 2 * padding
+		label_height = text_bottom - text_top + 2 * padding
+		# above the element like the page overlay, inside it when that would leave the screenshot
+		label_top = top - label_height if top - label_height >= 0 else top
+		draw.rectangle((left, label_top, left + label_width, label_top + label_height), fill=HIGHLIGHT_COLOR)
+		draw.text((left + padding - text_left, label_top + padding - text_top), label, fill='white', font=font)
+
+	output = io.BytesIO()
+	save_kwargs = {'quality': quality} if quality is not None and media_type != 'image/png' else {}
+	image.save(output, format=HIGHLIGHT_PIL_FORMATS[media_type], **save_kwargs)
+	return base64.b64encode(output.getvalue()).decode()
@@ -1,15 +1,19 @@
 """
 Enhanced snapshot processing for browser-use DOM tree extraction.
 
-This module provides stateless functions for parsing Chrome DevTools Protocol (CDP) DOMSnapshot data
-to extract visibility, clickability, cursor styles, and other layout information.
+This module parses Chrome DevTools Protocol (CDP) DOMSnapshot data to extract visibility, clickability, cursor styles,
+and other layout information. The parsed data is kept in a columnar `SnapshotLayoutStore` (geometry in float arrays,
+computed styles as interned integer codes) that hands out `EnhancedSnapshotNode`s by backend node id on demand.
 """
 
+import math
+from array import array
+from collections.abc import Iterator, Mapping
+
 from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.domsnapshot.types import (
 	LayoutTreeSnapshot,
 	NodeTreeSnapshot,
-	RareBooleanData,
 )
 
 from browser_use.dom.views import DOMRect, EnhancedSnapshotNode
@@ -45,11 +49,6 @@ REQUIRED_COMPUTED_STYLES = [
 ]
 
 
-def _parse_rare_boolean_data(rare_data: RareBooleanData, index: int) -> bool | None:
-	"""Parse rare boolean data from snapshot - returns True if index is in the rare data."""
-	return index in rare_data['index']
-
-
 def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict[str, str]:
 	"""Parse computed styles from layout tree using string indices."""
 	styles = {}
@@ -59,111 +58,217 @@ def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict
 	return styles
 
 
-def build_snapshot_lookup(
+def _build_layout_index(layout: LayoutTreeSnapshot) -> dict[int, int]:
+	"""Invert `layout['nodeIndex']` into a snapshot node index -> layout index lookup.
+
+	Only layout nodes that have bounds are considered, and the first layout node wins if a snapshot node appears twice.
+	"""
+	layout_index: dict[int, int] = {}
+	node_indices = layout.get('nodeIndex', [])
+	bounds_count = len(layout.get('bounds', []))
+	for layout_idx, node_index in enumerate(node_indices[:bounds_count]):
+		if node_index not in layout_index:
+			layout_index[node_index] = layout_idx
+	return layout_index
+
+
+_NAN = float('nan')
+_NO_RECT = (_NAN, _NAN, _NAN, _NAN)
+
+
+def _rect_values(rect_data: list[float] | None, scale: float | None = None) -> tuple[float, float, float, float]:
+	"""Read a `[x, y, width, height]` rectangle from the layout tree, optionally dividing it by `scale` (NaNs if missing)."""
+	if not rect_data or len(rect_data) < 4:
+		return _NO_RECT
+	if scale is None:
+		return (rect_data[0], rect_data[1], rect_data[2], rect_data[3])
+	return (rect_data[0] / scale, rect_data[1] / scale, rect_data[2] / scale, rect_data[3] / scale)
+
+
+def _rect_at(column: array, row: int) -> DOMRect | None:
+	offset = row * 4
+	x = column[offset]
+	if math.isnan(x):
+		return None
+	return DOMRect(x=x, y=column[offset + 1], width=column[offset + 2], height=column[offset + 3])
+
+
+class SnapshotLayoutStore(Mapping[int, EnhancedSnapshotNode]):
+	"""Columnar layout data of a captureSnapshot response, indexed by backend node id.
+
+	Every snapshot node gets one row. Rectangles are stored as 4 consecutive floats per row (NaN when the node has no
+	such rect), bounds already converted to CSS pixels. Computed styles are stored as codes into `styles`, where every
+	distinct style row is parsed once. Missing integers are stored as -1.
+
+	Reading it like a `dict[int, EnhancedSnapshotNode]` materializes nodes lazily (and only once), so only the nodes
+	that are actually part of the DOM tree pay for the per-node objects, while whole-page passes can work on the columns.
+	"""
+
+	def __init__(self) -> None:
+		self.rows: dict[int, int] = {}
+		"""backend node id -> row"""
+		self.bounds = array('d')
+		self.client_rects = array('d')
+		self.scroll_rects = array('d')
+		self.style_codes = array('q')
+		self.styles: list[dict[str, str]] = []
+		"""interned computed styles, indexed by style code"""
+		self.paint_orders = array('q')
+		self.stacking_contexts = array('q')
+		self.clickable = array('b')
+		"""1/0, or -1 when the document didn't report clickability at all"""
+
+		self._nodes: dict[int, EnhancedSnapshotNode] = {}
+
+	def row(self, backend_node_id: int) -> int | None:
+		return self.rows.get(backend_node_id)
+
+	def bounds_at(self, row: int) -> DOMRect | None:
+		return _rect_at(self.bounds, row)
+
+	def computed_styles_at(self, row: int) -> dict[str, str] | None:
+		style_code = self.style_codes[row]
+		return self.styles[style_code] or None if style_code >= 0 else None
+
+	def _materialize(self, row: int) -> EnhancedSnapshotNode:
+		clickable = self.clickable[row]
+		style_code = self.style_codes[row]
+		computed_styles = self.styles[style_code] if style_code >= 0 else None
+		paint_order = self.paint_orders[row]
+		stacking_contexts = self.stacking_contexts[row]
+		return EnhancedSnapshotNode(
+			is_clickable=None if clickable < 0 else bool(clickable),
+			cursor_style=computed_styles.get('cursor') if computed_styles is not None else None,
+			bounds=_rect_at(self.bounds, row),
+			clientRects=_rect_at(self.client_rects, row),
+			scrollRects=_rect_at(self.scroll_rects, row),
+			computed_styles=computed_styles if computed_styles else None,
+			paint_order=paint_order if paint_order >= 0 else None,
+			stacking_contexts=stacking_contexts if stacking_contexts >= 0 else None,
+		)
+
+	def __getitem__(self, backend_node_id: int) -> EnhancedSnapshotNode:
+		node = self._nodes.get(backend_node_id)
+		if node is None:
+			node = self._materialize(self.rows[backend_node_id])
+			self._nodes[backend_node_id] = node
+		return node
+
+	def get(self, backend_node_id: int, default: EnhancedSnapshotNode | None = None) -> EnhancedSnapshotNode | None:  # type: ignore[override]
+		if backend_node_id not in self.rows:
+			return default
+		return self[backend_node_id]
+
+	def __contains__(self, backend_node_id: object) -> bool:
+		return backend_node_id in self.rows
+
+	def __iter__(self) -> Iterator[int]:
+		return iter(self.rows)
+
+	def __len__(self) -> int:
+		return len(self.rows)
+
+
+def build_snapshot_layout_store(
 	snapshot: CaptureSnapshotReturns,
 	device_pixel_ratio: float = 1.0,
-) -> dict[int, EnhancedSnapshotNode]:
-	"""Build a lookup table of backend node ID to enhanced snapshot data with everything calculated upfront."""
-	snapshot_lookup: dict[int, EnhancedSnapshotNode] = {}
+) -> SnapshotLayoutStore:
+	"""Parse a captureSnapshot response into a `SnapshotLayoutStore`.
+
+	Runs in a single pass per document: `nodeIndex` is inverted once, the layout columns are read by index and
+	computed styles are parsed once per distinct style row.
+	"""
+	store = SnapshotLayoutStore()
 
 	if not snapshot['documents']:
-		return snapshot_lookup
+		return store
 
 	strings = snapshot['strings']
 
+	# Computed styles are read-only after parsing, so identical style rows share one code across all documents
+	style_codes: dict[tuple[int, ...], int] = {}
+
+	rows = store.rows
+	bounds = store.bounds
+	client_rects = store.client_rects
+	scroll_rects = store.scroll_rects
+	node_style_codes = store.style_codes
+	paint_orders = store.paint_orders
+	node_stacking_contexts = store.stacking_contexts
+	clickable = store.clickable
+
 	for document in snapshot['documents']:
 		nodes: NodeTreeSnapshot = document['nodes']
 		layout: LayoutTreeSnapshot = document['layout']
 
-		# Build backend node id to snapshot index lookup
+		# Build snapshot index -> layout index lookup once (instead of scanning nodeIndex for every node)
+		layout_index = _build_layout_index(layout)
+
+		# Layout columns
+		bounds_column = layout.get('bounds', [])
+		styles_column = layout.get('styles', [])
+		paint_orders_column = layout.get('paintOrders', [])
+		client_rects_column = layout.get('clientRects', [])
+		scroll_rects_column = layout.get('scrollRects', [])
+		stacking_contexts_data = layout.get('stackingContexts', {})
+
+		clickable_indices = set(nodes['isClickable']['index']) if 'isClickable' in nodes else None
+
+		# Build backend node id to snapshot index lookup (last occurrence wins)
 		backend_node_to_snapshot_index = {}
 		if 'backendNodeId' in nodes:
 			for i, backend_node_id in enumerate(nodes['backendNodeId']):
 				backend_node_to_snapshot_index[backend_node_id] = i
 
-		# Build snapshot lookup for each backend node id
 		for backend_node_id, snapshot_index in backend_node_to_snapshot_index.items():
-			is_clickable = None
-			if 'isClickable' in nodes:
-				is_clickable = _parse_rare_boolean_data(nodes['isClickable'], snapshot_index)
-
-			# Find corresponding layout node
-			cursor_style = None
-			is_visible = None
-			bounding_box = None
-			computed_styles = {}
-
-			# Look for layout tree node that corresponds to this snapshot node
-			paint_order = None
-			client_rects = None
-			scroll_rects = None
-			stacking_contexts = None
-			for layout_idx, node_index in enumerate(layout.get('nodeIndex', [])):
-				if node_index == snapshot_index and layout_idx < len(layout.get('bounds', [])):
-					# Parse bounding box
-					bounds = layout['bounds'][layout_idx]
-					if len(bounds) >= 4:
-						# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels
-						# by dividing by the device pixel ratio
-						raw_x, raw_y, raw_width, raw_height = bounds[0], bounds[1], bounds[2], bounds[3]
-
-						# Apply device pixel ratio scaling to convert device pixels to CSS pixels
-						bounding_box = DOMRect(
-							x=raw_x / device_pixel_ratio,
-							y=raw_y / device_pixel_ratio,
-							width=raw_width / device_pixel_ratio,
-							height=raw_height / device_pixel_ratio,
-						)
-
-					# Parse computed styles for this layout node
-					if layout_idx < len(layout.get('styles', [])):
-						style_indices = layout['styles'][layout_idx]
-						computed_styles = _parse_computed_styles(strings, style_indices)
-						cursor_style = computed_styles.get('cursor')
-
-					# Extract paint order if available
-					if layout_idx < len(layout.get('paintOrders', [])):
-						paint_order = layout.get('paintOrders', [])[layout_idx]
-
-					# Extract client rects if available
-					client_rects_data = layout.get('clientRects', [])
-					if layout_idx < len(client_rects_data):
-						client_rect_data = client_rects_data[layout_idx]
-						if client_rect_data and len(client_rect_data) >= 4:
-							client_rects = DOMRect(
-								x=client_rect_data[0],
-								y=client_rect_data[1],
-								width=client_rect_data[2],
-								height=client_rect_data[3],
-							)
-
-					# Extract scroll rects if available
-					scroll_rects_data = layout.get('scrollRects', [])
-					if layout_idx < len(scroll_rects_data):
-						scroll_rect_data = scroll_rects_data[layout_idx]
-						if scroll_rect_data and len(scroll_rect_data) >= 4:
-							scroll_rects = DOMRect(
-								x=scroll_rect_data[0],
-								y=scroll_rect_data[1],
-								width=scroll_rect_data[2],
-								height=scroll_rect_data[3],
-							)
-
-					# Extract stacking contexts if available
-					if layout_idx < len(layout.get('stackingContexts', [])):
-						stacking_contexts = layout.get('stackingContexts', {}).get('index', [])[layout_idx]
-
-					break
-
-			snapshot_lookup[backend_node_id] = EnhancedSnapshotNode(
-				is_clickable=is_clickable,
-				cursor_style=cursor_style,
-				bounds=bounding_box,
-				clientRects=client_rects,
-				scrollRects=scroll_rects,
-				computed_styles=computed_styles if computed_styles else None,
-				paint_order=paint_order,
-				stacking_contexts=stacking_contexts,
+			rows[backend_node_id] = len(paint_orders)
+			clickable.append(-1 if clickable_indices is None else int(snapshot_index in clickable_indices))
+
+			layout_idx = layout_index.get(snapshot_index)
+			if layout_idx is None:
+				bounds.extend(_NO_RECT)
+				client_rects.extend(_NO_RECT)
+				scroll_rects.extend(_NO_RECT)
+				node_style_codes.append(-1)
+				paint_orders.append(-1)
+				node_stacking_contexts.append(-1)
+				continue
+
+			# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels by dividing by the device pixel ratio
+			bounds.extend(_rect_values(bounds_column[layout_idx], device_pixel_ratio))
+
+			style_code = -1
+			if layout_idx < len(styles_column):
+				style_key = tuple(styles_column[layout_idx])
+				style_code = style_codes.get(style_key, -1)
+				if style_code < 0:
+					style_code = style_codes[style_key] = len(store.styles)
+					store.styles.append(_parse_computed_styles(strings, styles_column[layout_idx]))
+			node_style_codes.append(style_code)
+
+			paint_orders.append(paint_orders_column[layout_idx] if layout_idx < len(paint_orders_column) else -1)
+			client_rects.extend(
+				_rect_values(client_rects_column[layout_idx]) if layout_idx < len(client_rects_column) else _NO_RECT
 			)
+			scroll_rects.extend(
+				_rect_values(scroll_rects_column[layout_idx]) if layout_idx < len(scroll_rects_column) else _NO_RECT
+			)
+
+			stacking_contexts = -1
+			if layout_idx < len(stacking_contexts_data):
+				stacking_contexts = stacking_contexts_data.get('index', [])[layout_idx]
+			node_stacking_contexts.append(stacking_contexts)
+
+	return store
+
+
+def build_snapshot_lookup(
+	snapshot: CaptureSnapshotReturns,
+	device_pixel_ratio: float = 1.0,
+) -> dict[int, EnhancedSnapshotNode]:
+	"""Build a lookup table of backend node ID to enhanced snapshot data with everything calculated upfront.
 
-	return snapshot_lookup
+	Nodes with identical computed styles share the same dict. Prefer `build_snapshot_layout_store` when only some of the
+	nodes are needed.
+	"""
+	return dict(build_snapshot_layout_store(snapshot, device_pixel_ratio).items())
@@ -0,0 +1,174 @@
+"""
+Records DOM mutation events (DOM.childNodeInserted, DOM.attributeModified, ...) for a single CDP session, so the
+cached enhanced DOM tree can be patched between steps instead of being rebuilt from DOM.getDocument.
+
+Chrome only reports mutations for nodes the client already knows about, which after DOM.getDocument(depth=-1) is the
+whole document. Nodes inserted later are sent without their children, so those are requested right away to keep the
+whole subtree observed.
+
+DOM.getDocument makes Chrome forget the nodes it reported before, so code outside of the DomService has to fetch the
+document through `get_document`, which sends the trackers of that session back to a full rebuild.
+"""
+
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from cdp_use.cdp.dom.commands import GetDocumentParameters, GetDocumentReturns
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+
+
+@dataclass(slots=True)
+class DOMMutation:
+	"""A single DOM domain event, `method` is the event name without the `DOM.` prefix."""
+
+	method: str
+	params: dict[str, Any]
+
+
+class DOMMutationTracker:
+	"""Queues DOM mutation events of one CDP session until the next DOM tree update drains them."""
+
+	TRACKED_EVENTS = (
+		'childNodeInserted',
+		'childNodeRemoved',
+		'setChildNodes',
+		'attributeModified',
+		'attributeRemoved',
+		'characterDataModified',
+		'inlineStyleInvalidated',
+		'shadowRootPushed',
+		'shadowRootPopped',
+		'documentUpdated',
+	)
+
+	_active: ClassVar['weakref.WeakSet[DOMMutationTracker]'] = weakref.WeakSet()
+
+	def __init__(self, cdp_session: 'CDPSession', max_mutations: int = 1000, logger: logging.Logger | None = None):
+		self.cdp_session = cdp_session
+		self.max_mutations = max_mutations
+		self.logger = logger or logging.getLogger(__name__)
+
+		self.mutations: list[DOMMutation] = []
+		self.overflowed = False
+		"""Set when the queued mutations can't be replayed anymore (too many of them or the whole document changed)."""
+		self.started = False
+
+		self._child_node_requests: set[asyncio.Task] = set()
+
+	@property
+	def target_id(self) -> str:
+		return self.cdp_session.target_id
+
+	def start(self) -> None:
+		"""Register the DOM event handlers on the session's CDP client."""
+		if self.started:
+			return
+		registry = self.cdp_session.cdp_client._event_registry
+		for method in self.TRACKED_EVENTS:
+			registry.register(f'DOM.{method}', self._make_handler(method))
+		self.started = True
+		DOMMutationTracker._active.add(self)
+
+	def stop(self) -> None:
+		"""Unregister the DOM event handlers and forget everything that was recorded."""
+		if not self.started:
+			return
+		registry = self.cdp_session.cdp_client._event_registry
+		for method in self.TRACKED_EVENTS:
+			registry.unregister(f'DOM.{method}')
+		DOMMutationTracker._active.discard(self)
+		for task in self._child_node_requests:
+			task.cancel()
+		self._child_node_requests.clear()
+		self.started = False
+		self.reset()
+
+	def reset(self) -> None:
+		"""Forget all recorded mutations, called right before the tree is fetched from scratch."""
+		self.mutations = []
+		self.overflowed = False
+
+	@classmethod
+	def invalidate(cls, session_id: str | None) -> None:
+		"""Send the running trackers of a session to a full rebuild, its node ids were reset by another DOM.getDocument."""
+		for tracker in list(cls._active):
+			if tracker.cdp_session.session_id == session_id:
+				tracker.overflowed = True
+				tracker.mutations = []
+
+	async def drain(self) -> tuple[list[DOMMutation], bool]:
+		"""Return (mutations, overflowed) recorded since the last drain/reset and start a new batch.
+
+		Waits for in-flight DOM.requestChildNodes calls first, so the children of freshly inserted nodes are part of the batch.
+		"""
+		if self._child_node_requests:
+			await asyncio.gather(*self._child_node_requests, return_exceptions=True)
+
+		mutations, overflowed = self.mutations, self.overflowed
+		self.reset()
+		return mutations, overflowed
+
+	def record(self, method: str, params: dict[str, Any]) -> None:
+		"""Queue a mutation, events are handled in order of arrival."""
+		if self.overflowed:
+			return
+
+		if method == 'documentUpdated' or len(self.mutations) >= self.max_mutations:
+			# node ids are not valid anymore / replaying would be slower than fetching the document again
+			self.overflowed = True
+			self.mutations = []
+			return
+
+		self.mutations.append(DOMMutation(method=method, params=params))
+
+		if method == 'childNodeInserted':
+			node = params['node']
+			if node.get('childNodeCount') and 'children' not in node:
+				self._request_child_nodes(node['nodeId'])
+
+	def _make_handler(self, method: str):
+		def handler(event: Any, session_id: str | None = None) -> None:
+			if session_id is not None and session_id != self.cdp_session.session_id:
+				return
+			self.record(method, event)
+
+		return handler
+
+	def _request_child_nodes(self, node_id: int) -> None:
+		# can't be awaited inside the event handler, the response is read by the same message loop that called us
+		task = asyncio.create_task(
+			self.cdp_session.cdp_client.send.DOM.requestChildNodes(
+				params={'nodeId': node_id, 'depth': -1, 'pierce': True},
+				session_id=self.cdp_session.session_id,
+			)
+		)
+		self._child_node_requests.add(task)
+		task.add_done_callback(self._on_child_nodes_requested)
+
+	def _on_child_nodes_requested(self, task: asyncio.Task) -> None:
+		self._child_node_requests.discard(task)
+		if task.cancelled():
+			return
+		if error := task.exception():
+			# the subtree is unknown to us now, so later mutations inside it would be silently missed
+			self.logger.debug(f'DOM.requestChildNodes failed, falling back to a full DOM rebuild: {error}')
+			self.overflowed = True
+			self.mutations = []
+
+
+async def get_document(
+	cdp_client: Any, session_id: str | None, params: GetDocumentParameters | None = None
+) -> GetDocumentReturns:
+	"""DOM.getDocument for callers outside of the DomService, e.g. actions that read the page HTML.
+
+	Chrome stops reporting mutations for the nodes it sent before the call, so the mutation trackers of the session are
+	marked overflowed and the next DOM update rebuilds the tree instead of replaying an incomplete batch.
+	"""
+	document = await cdp_client.send.DOM.getDocument(params=params, session_id=session_id)
+	DOMMutationTracker.invalidate(session_id)
+	return document
@@ -1,7 +1,9 @@
 # @file purpose: Serializes enhanced DOM trees to string format for LLM consumption
 
+import io
 
 from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
+from browser_use.dom.serializer.spatial_index import IndexedRect, SpatialIndex
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	DOMRect,
@@ -32,7 +34,11 @@ class DOMTreeSerializer:
 		# {'tag': 'div', 'role': 'link'},     # <div role="link">
 		# {'tag': 'span', 'role': 'link'},    # <span role="link">
 	]
-	DEFAULT_CONTAINMENT_THRESHOLD = 0.99  # 99% containment by default
+	# 99% containment by default. Paint order filtering reuses it as the share of an element that has to be covered, which
+	# has to be above 0.5 (the spatial index only looks for covering elements at the element's center)
+	DEFAULT_CONTAINMENT_THRESHOLD = 0.99
+	# an element painted on top needs an (almost) opaque background to hide what's below it
+	MIN_OCCLUDING_OPACITY = 0.8
 
 	def __init__(
 		self,
@@ -40,11 +46,13 @@ class DOMTreeSerializer:
 		previous_cached_state: SerializedDOMState | None = None,
 		enable_bbox_filtering: bool = True,
 		containment_threshold: float | None = None,
+		enable_paint_order_filtering: bool = False,
 	):
 		self.root_node = root_node
 		self._interactive_counter = 1
 		self._selector_map: DOMSelectorMap = {}
-		self._previous_cached_selector_map = previous_cached_state.selector_map if previous_cached_state else None
+		self._previous_cached_state = previous_cached_state
+		self._previous_backend_node_ids: frozenset[int] | None = None
 		# Add timing tracking
 		self.timing_info: dict[str, float] = {}
 		# Cache for clickable element detection to avoid redundant calls
@@ -52,6 +60,12 @@ class DOMTreeSerializer:
 		# Bounding box filtering configuration
 		self.enable_bbox_filtering = enable_bbox_filtering
 		self.containment_threshold = containment_threshold or self.DEFAULT_CONTAINMENT_THRESHOLD
+		if enable_paint_order_filtering and not 0.5 < self.containment_threshold <= 1.0:
+			raise ValueError(
+				f'containment_threshold must be above 0.5 and at most 1.0 for paint order filtering, got {self.containment_threshold}'
+			)
+		# Hide interactive elements that are covered by other elements painted on top of them (modals, sticky headers)
+		self.enable_paint_order_filtering = enable_paint_order_filtering
 
 	def serialize_accessible_elements(self) -> tuple[SerializedDOMState, dict[str, float]]:
 		import time
@@ -64,6 +78,11 @@ class DOMTreeSerializer:
 		self._semantic_groups = []
 		self._clickable_cache = {}  # Clear cache for new serialization
 
+		# Step 0: Index the previous selector map once (usually already built by the previous step's serializer)
+		start_step0 = time.time()
+		self._previous_backend_node_ids = self._previous_cached_state.backend_node_ids if self._previous_cached_state else None
+		self.timing_info['previous_state_index'] = time.time() - start_step0
+
 		# Step 1: Create simplified tree (includes clickable element detection)
 		start_step1 = time.time()
 		simplified_tree = self._create_simplified_tree(self.root_node)
@@ -89,16 +108,32 @@ class DOMTreeSerializer:
 		else:
 			filtered_tree = optimized_tree
 
+		# Step 3b: Hide interactive elements covered by opaque elements painted on top of them
+		if self.enable_paint_order_filtering and filtered_tree:
+			start_step3b = time.time()
+			spatial_index = SpatialIndex.from_dom_tree(self.root_node)
+			self.timing_info['build_spatial_index'] = time.time() - start_step3b
+			self._apply_paint_order_filtering(filtered_tree, spatial_index)
+			self.timing_info['paint_order_filtering'] = time.time() - start_step3b
+
 		# Step 4: Assign interactive indices to clickable elements
 		start_step4 = time.time()
 		self._assign_interactive_indices_and_mark_new_nodes(filtered_tree)
 		end_step4 = time.time()
 		self.timing_info['assign_interactive_indices'] = end_step4 - start_step4
 
+		# Step 5: Index this selector map for the next step
+		start_step5 = time.time()
+		backend_node_ids = frozenset(node.backend_node_id for node in self._selector_map.values())
+		self.timing_info['selector_map_index'] = time.time() - start_step5
+
 		end_total = time.time()
 		self.timing_info['serialize_accessible_elements_total'] = end_total - start_total
 
-		return SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map), self.timing_info
+		return (
+			SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map, _backend_node_ids=backend_node_ids),
+			self.timing_info,
+		)
 
 	def _is_interactive_cached(self, node: EnhancedDOMTreeNode) -> bool:
 		"""Cached version of clickable element detection to avoid redundant calls."""
@@ -228,8 +263,8 @@ class DOMTreeSerializer:
 		if not node:
 			return
 
-		# Skip assigning index to excluded nodes
-		if not (hasattr(node, 'excluded_by_parent') and node.excluded_by_parent):
+		# Skip assigning index to excluded and covered nodes
+		if not node.excluded_by_parent and not node.ignored_by_paint_order:
 			# Assign index to clickable elements that are also visible
 			is_interactive_assign = self._is_interactive_cached(node.original_node)
 			is_visible = node.original_node.snapshot_node and node.original_node.is_visible
@@ -242,10 +277,8 @@ class DOMTreeSerializer:
 				self._interactive_counter += 1
 
 				# Check if node is new
-				if self._previous_cached_selector_map:
-					previous_backend_node_ids = {node.backend_node_id for node in self._previous_cached_selector_map.values()}
-					if node.original_node.backend_node_id not in previous_backend_node_ids:
-						node.is_new = True
+				if self._previous_backend_node_ids and node.original_node.backend_node_id not in self._previous_backend_node_ids:
+					node.is_new = True
 
 		# Process children
 		for child in node.children:
@@ -382,6 +415,68 @@ class DOMTreeSerializer:
 		containment_ratio = intersection_area / child_area
 		return containment_ratio >= threshold
 
+	def _apply_paint_order_filtering(self, root: SimplifiedNode, spatial_index: SpatialIndex) -> None:
+		"""Mark interactive elements that are covered by an opaque element painted after them (and outside of their own
+		subtree) as `ignored_by_paint_order`, they can't be clicked anyway."""
+		ignored_count = 0
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			stack.extend(node.children)
+
+			if node.excluded_by_parent or not self._is_interactive_cached(node.original_node):
+				continue
+
+			rect = spatial_index.get(node.original_node)
+			if rect is not None and self._is_covered(rect, spatial_index):
+				node.ignored_by_paint_order = True
+				ignored_count += 1
+
+		if ignored_count > 0:
+			import logging
+
+			logging.debug(f'Paint order filtering ignored {ignored_count} covered elements')
+
+	def _is_covered(self, rect: IndexedRect, spatial_index: SpatialIndex) -> bool:
+		"""Check if an opaque element painted on top of `rect` covers it."""
+		if rect.paint_order is None:
+			return False
+
+		for other in spatial_index.containing(rect, self.containment_threshold):
+			if other.paint_order is None or other.paint_order <= rect.paint_order:
+				continue
+			# descendants paint over their ancestors (and are part of them), that's not occlusion
+			if rect.is_ancestor_of(other) or other.is_ancestor_of(rect):
+				continue
+			if self._is_opaque(other.node):
+				return True
+
+		return False
+
+	def _is_opaque(self, node: EnhancedDOMTreeNode) -> bool:
+		"""Whether an element hides what is painted below it: visible background color and (almost) fully opaque, and it
+		catches the clicks meant for what's below (overlays with `pointer-events: none` let them through)."""
+		styles = node.snapshot_node.computed_styles if node.snapshot_node else None
+		if not styles or styles.get('pointer-events') == 'none':
+			return False
+
+		try:
+			if float(styles.get('opacity', '1')) < self.MIN_OCCLUDING_OPACITY:
+				return False
+		except ValueError:
+			return False
+
+		background_color = styles.get('background-color', '').strip().lower()
+		if not background_color or background_color == 'transparent':
+			return False
+		if background_color.startswith('rgba('):
+			try:
+				alpha = float(background_color[5:-1].split(',')[3])
+			except (IndexError, ValueError):
+				return False
+			return alpha >= self.MIN_OCCLUDING_OPACITY
+		return True
+
 	def _count_excluded_nodes(self, node: SimplifiedNode, count: int = 0) -> int:
 		"""Count how many nodes were excluded (for debugging)."""
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
@@ -407,67 +502,94 @@ class DOMTreeSerializer:
 	@staticmethod
 	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
 		"""Serialize the optimized tree to string format."""
+		text, _, _ = DOMTreeSerializer.serialize_tree_with_budget(node, include_attributes, depth=depth)
+		return text
+
+	@staticmethod
+	def serialize_tree_with_budget(
+		node: SimplifiedNode | None, include_attributes: list[str], max_length: int | None = None, depth: int = 0
+	) -> tuple[str, bool, int]:
+		"""Serialize the optimized tree line by line, stopping as soon as `max_length` characters are written.
+
+		Returns (text, whether it was truncated, number of interactive elements that didn't make it into the text). The
+		text is the same as the full serialization cut to `max_length` characters, but lines past the budget are never built.
+		"""
 		if not node:
-			return ''
+			return '', False, 0
+
+		output = io.StringIO()
+		written = 0
+		stack: list[tuple[SimplifiedNode, int]] = [(node, depth)]
+		while stack:
+			current, current_depth = stack.pop()
+			line, child_depth = DOMTreeSerializer._serialize_node_line(current, include_attributes, current_depth)
+
+			if line is not None:
+				if written:
+					line = '\n' + line
+				if max_length is not None and written + len(line) > max_length:
+					output.write(line[: max_length - written])
+					# the element that was cut off counts as omitted, its index may not be readable anymore
+					stack.append((current, child_depth))
+					return output.getvalue(), True, DOMTreeSerializer._count_rendered_interactive(stack)
+				output.write(line)
+				written += len(line)
+
+			for child in reversed(current.children):
+				stack.append((child, child_depth))
+
+		return output.getvalue(), False, 0
+
+	@staticmethod
+	def _serialize_node_line(node: SimplifiedNode, include_attributes: list[str], depth: int) -> tuple[str | None, int]:
+		"""Build the line for a single node (None if it isn't rendered) and the depth its children are rendered at."""
+		# Skip rendering excluded and covered nodes, but process their children
+		if node.excluded_by_parent or node.ignored_by_paint_order:
+			return None, depth
 
-		# Skip rendering excluded nodes, but process their children
-		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			formatted_text = []
-			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-				if child_text:
-					formatted_text.append(child_text)
-			return '\n'.join(formatted_text)
-
-		formatted_text = []
 		depth_str = depth * '\t'
-		next_depth = depth
 
 		if node.original_node.node_type == NodeType.ELEMENT_NODE:
 			# Skip displaying nodes marked as should_display=False
 			if not node.should_display:
-				for child in node.children:
-					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-					if child_text:
-						formatted_text.append(child_text)
-				return '\n'.join(formatted_text)
+				return None, depth
 
 			# Add element with interactive_index if clickable, scrollable, or iframe
 			is_any_scrollable = node.original_node.is_actually_scrollable or node.original_node.is_scrollable
 			should_show_scroll = node.original_node.should_show_scroll_info
-			if node.interactive_index is not None or is_any_scrollable or node.original_node.tag_name.upper() == 'IFRAME':
-				next_depth += 1
-
-				# Build attributes string
-				attributes_html_str = DOMTreeSerializer._build_attributes_string(node.original_node, include_attributes, '')
-
-				# Build the line
-				if should_show_scroll and node.interactive_index is None:
-					# Scrollable container but not clickable
-					line = f'{depth_str}|SCROLL|<{node.original_node.tag_name}'
-				elif node.interactive_index is not None:
-					# Clickable (and possibly scrollable)
-					new_prefix = '*' if node.is_new else ''
-					scroll_prefix = '|SCROLL+' if should_show_scroll else '['
-					line = f'{depth_str}{new_prefix}{scroll_prefix}{node.interactive_index}]<{node.original_node.tag_name}'
-				elif node.original_node.tag_name.upper() == 'IFRAME':
-					# Iframe element (not interactive)
-					line = f'{depth_str}|IFRAME|<{node.original_node.tag_name}'
-				else:
-					line = f'{depth_str}<{node.original_node.tag_name}'
-
-				if attributes_html_str:
-					line += f' {attributes_html_str}'
-
-				line += ' />'
-
-				# Add scroll information only when we should show it
-				if should_show_scroll:
-					scroll_info_text = node.original_node.get_scroll_info_text()
-					if scroll_info_text:
-						line += f' ({scroll_info_text})'
-
-				formatted_text.append(line)
+			if node.interactive_index is None and not is_any_scrollable and node.original_node.tag_name.upper() != 'IFRAME':
+				return None, depth
+
+			# Build attributes string
+			attributes_html_str = DOMTreeSerializer._build_attributes_string(node.original_node, include_attributes, '')
+
+			# Build the line
+			if should_show_scroll and node.interactive_index is None:
+				# Scrollable container but not clickable
+				line = f'{depth_str}|SCROLL|<{node.original_node.tag_name}'
+			elif node.interactive_index is not None:
+				# Clickable (and possibly scrollable)
+				new_prefix = '*' if node.is_new else ''
+				scroll_prefix = '|SCROLL+' if should_show_scroll else '['
+				line = f'{depth_str}{new_prefix}{scroll_prefix}{node.interactive_index}]<{node.original_node.tag_name}'
+			elif node.original_node.tag_name.upper() == 'IFRAME':
+				# Iframe element (not interactive)
+				line = f'{depth_str}|IFRAME|<{node.original_node.tag_name}'
+			else:
+				line = f'{depth_str}<{node.original_node.tag_name}'
+
+			if attributes_html_str:
+				line += f' {attributes_html_str}'
+
+			line += ' />'
+
+			# Add scroll information only when we should show it
+			if should_show_scroll:
+				scroll_info_text = node.original_node.get_scroll_info_text()
+				if scroll_info_text:
+					line += f' ({scroll_info_text})'
+
+			return line, depth + 1
 
 		elif node.original_node.node_type == NodeType.TEXT_NODE:
 			# Include visible text
@@ -479,15 +601,27 @@ class DOMTreeSerializer:
 				and len(node.original_node.node_value.strip()) > 1
 			):
 				clean_text = node.original_node.node_value.strip()
-				formatted_text.append(f'{depth_str}{clean_text}')
+				return f'{depth_str}{clean_text}', depth
 
-		# Process children
-		for child in node.children:
-			child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
-			if child_text:
-				formatted_text.append(child_text)
+		return None, depth
 
-		return '\n'.join(formatted_text)
+	@staticmethod
+	def _count_rendered_interactive(stack: list[tuple[SimplifiedNode, int]]) -> int:
+		"""Count the interactive elements that would be rendered for the remaining subtrees, without building any text."""
+		count = 0
+		nodes = [node for node, _ in stack]
+		while nodes:
+			node = nodes.pop()
+			nodes.extend(node.children)
+			if (
+				node.interactive_index is not None
+				and node.should_display
+				and not node.excluded_by_parent
+				and not node.ignored_by_paint_order
+				and node.original_node.node_type == NodeType.ELEMENT_NODE
+			):
+				count += 1
+		return count
 
 	@staticmethod
 	def _build_attributes_string(node: EnhancedDOMTreeNode, include_attributes: list[str], text: str) -> str:
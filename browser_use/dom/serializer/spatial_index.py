@@ -0,0 +1,141 @@
+# @file purpose: Uniform grid spatial index over element bounds, answers containment and occlusion queries in sub-linear time
+
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+
+
+@dataclass(slots=True)
+class IndexedRect:
+	"""Bounds of a visible element together with what's needed to compare it with other elements."""
+
+	node: EnhancedDOMTreeNode
+	x1: float
+	y1: float
+	x2: float
+	y2: float
+	paint_order: int | None
+	document: int
+	"""Bounds and paint orders are per document, so only rects of the same document can be compared"""
+	order: int
+	"""Pre-order position in the DOM tree"""
+	subtree_end: int
+	"""Last pre-order position inside this element's subtree (shadow roots and content documents included)"""
+
+	@property
+	def area(self) -> float:
+		return (self.x2 - self.x1) * (self.y2 - self.y1)
+
+	def is_ancestor_of(self, other: 'IndexedRect') -> bool:
+		return self.order < other.order <= self.subtree_end
+
+	def overlap_area(self, other: 'IndexedRect') -> float:
+		x_overlap = min(self.x2, other.x2) - max(self.x1, other.x1)
+		y_overlap = min(self.y2, other.y2) - max(self.y1, other.y1)
+		if x_overlap <= 0 or y_overlap <= 0:
+			return 0.0
+		return x_overlap * y_overlap
+
+
+class SpatialIndex:
+	"""Uniform grid over element bounds, built once per snapshot.
+
+	Every rect is registered in the cells it overlaps. Rects spanning more than `max_cells_per_rect` cells (page wrappers,
+	full screen overlays) are kept in a separate list that is part of every query, so building stays linear.
+	"""
+
+	def __init__(self, cell_size: float = 256.0, max_cells_per_rect: int = 64):
+		self.cell_size = cell_size
+		self.max_cells_per_rect = max_cells_per_rect
+		self._cells: defaultdict[tuple[int, int], list[IndexedRect]] = defaultdict(list)
+		self._large_rects: list[IndexedRect] = []
+		self._rects_by_node: dict[int, IndexedRect] = {}
+
+	def __len__(self) -> int:
+		return len(self._rects_by_node)
+
+	def insert(self, rect: IndexedRect) -> None:
+		self._rects_by_node[id(rect.node)] = rect
+
+		cell_size = self.cell_size
+		first_col, last_col = int(rect.x1 // cell_size), int(rect.x2 // cell_size)
+		first_row, last_row = int(rect.y1 // cell_size), int(rect.y2 // cell_size)
+		if (last_col - first_col + 1) * (last_row - first_row + 1) > self.max_cells_per_rect:
+			self._large_rects.append(rect)
+			return
+
+		for col in range(first_col, last_col + 1):
+			for row in range(first_row, last_row + 1):
+				self._cells[(col, row)].append(rect)
+
+	def get(self, node: EnhancedDOMTreeNode) -> IndexedRect | None:
+		return self._rects_by_node.get(id(node))
+
+	def at_point(self, x: float, y: float) -> Iterator[IndexedRect]:
+		"""Rects containing the point (x, y)."""
+		cell = self._cells.get((int(x // self.cell_size), int(y // self.cell_size)), ())
+		for rect in (*cell, *self._large_rects):
+			if rect.x1 <= x <= rect.x2 and rect.y1 <= y <= rect.y2:
+				yield rect
+
+	def containing(self, rect: IndexedRect, threshold: float) -> Iterator[IndexedRect]:
+		"""Rects of the same document that cover at least `threshold` of `rect`'s area (`rect` itself excluded).
+
+		With a threshold above 0.5 a covering rect always contains `rect`'s center, so only one cell has to be looked at.
+		Lower thresholds would miss covering rects that don't reach the center, they are rejected.
+		"""
+		if not 0.5 < threshold <= 1.0:
+			raise ValueError(f'threshold must be above 0.5 and at most 1.0, got {threshold}')
+		area = rect.area
+		if area <= 0:
+			return
+		for other in self.at_point((rect.x1 + rect.x2) / 2, (rect.y1 + rect.y2) / 2):
+			if other is not rect and other.document == rect.document and rect.overlap_area(other) / area >= threshold:
+				yield other
+
+	@classmethod
+	def from_dom_tree(cls, root: EnhancedDOMTreeNode, **kwargs) -> 'SpatialIndex':
+		"""Index every visible element of the tree that has non-empty bounds."""
+		index = cls(**kwargs)
+
+		order = 0
+		next_document = 1
+		# (node, document, rect waiting for its subtree end) - a None node closes the rect's subtree
+		stack: list[tuple[EnhancedDOMTreeNode | None, int, IndexedRect | None]] = [(root, 0, None)]
+		while stack:
+			node, document, open_rect = stack.pop()
+			if node is None:
+				assert open_rect is not None
+				open_rect.subtree_end = order - 1
+				continue
+
+			position = order
+			order += 1
+
+			bounds = node.snapshot_node.bounds if node.snapshot_node else None
+			if node.node_type == NodeType.ELEMENT_NODE and node.is_visible and bounds and bounds.width > 0 and bounds.height > 0:
+				rect = IndexedRect(
+					node=node,
+					x1=bounds.x,
+					y1=bounds.y,
+					x2=bounds.x + bounds.width,
+					y2=bounds.y + bounds.height,
+					paint_order=node.snapshot_node.paint_order if node.snapshot_node else None,
+					document=document,
+					order=position,
+					subtree_end=position,
+				)
+				index.insert(rect)
+				stack.append((None, document, rect))
+
+			for child in reversed(node.children_nodes or []):
+				stack.append((child, document, None))
+			for shadow_root in reversed(node.shadow_roots or []):
+				stack.append((shadow_root, document, None))
+			if node.content_document:
+				stack.append((node.content_document, next_document, None))
+				next_document += 1
+
+		return index
@@ -1,17 +1,22 @@
 import asyncio
+import copy
 import logging
+import math
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXNode
 from cdp_use.cdp.dom.types import Node
+from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.target import TargetID
 
 from browser_use.dom.enhanced_snapshot import (
 	REQUIRED_COMPUTED_STYLES,
-	build_snapshot_lookup,
+	SnapshotLayoutStore,
+	build_snapshot_layout_store,
 )
+from browser_use.dom.mutations import DOMMutation, DOMMutationTracker
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
 from browser_use.dom.views import (
 	CurrentPageTargets,
@@ -25,7 +30,18 @@ from browser_use.dom.views import (
 )
 
 if TYPE_CHECKING:
-	from browser_use.browser.session import BrowserSession
+	from browser_use.browser.session import BrowserSession, CDPSession
+
+# elements whose AX node is fetched in the 'partial' AX tree mode, the ones the serializer may consider interactive
+AX_CANDIDATE_TAGS = frozenset({'button', 'input', 'select', 'textarea', 'a', 'label', 'details', 'summary', 'option', 'optgroup'})
+AX_CANDIDATE_ATTRIBUTES = frozenset({'role', 'tabindex', 'contenteditable'})
+
+
+def _is_ax_candidate(node: Node) -> bool:
+	if node.get('localName', '').lower() in AX_CANDIDATE_TAGS:
+		return True
+	attribute_names = node.get('attributes', [])[::2]
+	return any(name in AX_CANDIDATE_ATTRIBUTES or name.startswith('on') or name.startswith('aria-') for name in attribute_names)
 
 
 class DomService:
@@ -40,17 +56,54 @@ class DomService:
 	logger: logging.Logger
 
 	def __init__(
-		self, browser_session: 'BrowserSession', logger: logging.Logger | None = None, cross_origin_iframes: bool = False
+		self,
+		browser_session: 'BrowserSession',
+		logger: logging.Logger | None = None,
+		cross_origin_iframes: bool = False,
+		incremental_dom_updates: bool = False,
+		max_dom_mutations: int = 1000,
+		max_ax_refresh_nodes: int = 50,
+		cross_origin_iframe_timeout: float = 3.0,
+		max_concurrent_iframe_captures: int = 4,
+		ax_tree_mode: Literal['full', 'partial', 'none'] = 'full',
+		partial_ax_tree_fallback_threshold: int = 300,
+		max_concurrent_ax_requests: int = 16,
+		paint_order_filtering: bool = False,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
 		self.cross_origin_iframes = cross_origin_iframes
+		# cross origin iframes are fetched concurrently, each one gets this much time before it's left out of the tree
+		self.cross_origin_iframe_timeout = cross_origin_iframe_timeout
+		self.max_concurrent_iframe_captures = max_concurrent_iframe_captures
+		# full: Accessibility.getFullAXTree per frame, partial: getPartialAXTree for candidate interactive nodes only
+		# (falling back to full above partial_ax_tree_fallback_threshold candidates), none: no accessibility data at all
+		self.ax_tree_mode = ax_tree_mode
+		self.partial_ax_tree_fallback_threshold = partial_ax_tree_fallback_threshold
+		# getPartialAXTree requests in flight at once, for the partial mode and for refreshing patched nodes
+		self.max_concurrent_ax_requests = max_concurrent_ax_requests
+		# hide interactive elements covered by opaque elements painted on top of them, see DOMTreeSerializer
+		self.paint_order_filtering = paint_order_filtering
+
+		# incremental updates: the tree of the previous call is patched with the DOM mutations recorded since
+		self.incremental_dom_updates = incremental_dom_updates
+		self.max_dom_mutations = max_dom_mutations
+		# patched trees refresh the AX nodes of up to this many changed nodes one by one, more get the full AX tree
+		self.max_ax_refresh_nodes = max_ax_refresh_nodes
+		self._mutation_tracker: DOMMutationTracker | None = None
+		self._cached_dom_tree: EnhancedDOMTreeNode | None = None
+		self._cached_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
 
 	async def __aenter__(self):
 		return self
 
 	async def __aexit__(self, exc_type, exc_value, traceback):
-		pass  # no need to cleanup anything, browser_session auto handles cleaning up session cache
+		# browser_session auto handles cleaning up session cache, only the DOM event handlers are ours
+		if self._mutation_tracker is not None:
+			self._mutation_tracker.stop()
+			self._mutation_tracker = None
+		self._cached_dom_tree = None
+		self._cached_node_lookup = {}
 
 	async def _get_targets_for_page(self, target_id: TargetID | None = None) -> CurrentPageTargets:
 		"""Get the target info for a specific page.
@@ -58,7 +111,7 @@ class DomService:
 		Args:
 			target_id: The target ID to get info for. If None, uses current_target_id.
 		"""
-		targets = await self.browser_session.cdp_client.send.Target.getTargets()
+		targets = await self.browser_session._cdp_get_all_targets()
 
 		# Use provided target_id or fall back to current_target_id
 		if target_id is None:
@@ -67,7 +120,7 @@ class DomService:
 				raise ValueError('No current target ID set in browser session')
 
 		# Find main page target by ID
-		main_target = next((t for t in targets['targetInfos'] if t['targetId'] == target_id), None)
+		main_target = next((t for t in targets if t['targetId'] == target_id), None)
 
 		if not main_target:
 			raise ValueError(f'No target found for target ID: {target_id}')
@@ -84,9 +137,7 @@ class DomService:
 				parent_target = frame_info.get('parentTargetId', frame_info.get('frameTargetId'))
 				if parent_target == target_id:
 					# Find the target info for this iframe
-					iframe_target = next(
-						(t for t in targets['targetInfos'] if t['targetId'] == frame_info['frameTargetId']), None
-					)
+					iframe_target = next((t for t in targets if t['targetId'] == frame_info['frameTargetId']), None)
 					if iframe_target:
 						iframe_targets.append(iframe_target)
 
@@ -124,7 +175,8 @@ class DomService:
 
 	async def _get_viewport_ratio(self, target_id: TargetID) -> float:
 		"""Get viewport dimensions, device pixel ratio, and scroll position using CDP."""
-		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=True)
+		# without moving the agent focus, the screenshot can be captured from it at the same time
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
 		try:
 			# Get the layout metrics which includes the visual viewport
@@ -151,98 +203,134 @@ class DomService:
 			# Fallback to default viewport size
 			return 1.0
 
-	@classmethod
-	def is_element_visible_according_to_all_parents(
-		cls, node: EnhancedDOMTreeNode, html_frames: list[EnhancedDOMTreeNode]
-	) -> bool:
-		"""Check if the element is visible according to all its parent HTML frames."""
-
-		if not node.snapshot_node:
+	@staticmethod
+	def _is_hidden_by_style(computed_styles: dict[str, str] | None) -> bool:
+		"""Whether computed styles alone hide an element (display: none, visibility: hidden or opacity: 0)."""
+		if not computed_styles:
 			return False
 
-		computed_styles = node.snapshot_node.computed_styles or {}
-
 		display = computed_styles.get('display', '').lower()
 		visibility = computed_styles.get('visibility', '').lower()
 		opacity = computed_styles.get('opacity', '1')
 
 		if display == 'none' or visibility == 'hidden':
-			return False
+			return True
 
 		try:
 			if float(opacity) <= 0:
-				return False
+				return True
 		except (ValueError, TypeError):
 			pass
 
-		# Start with the element's local bounds (in its own frame's coordinate system)
-		current_bounds = node.snapshot_node.bounds
+		return False
 
-		if not current_bounds:
-			return False  # If there are no bounds, the element is not visible
+	@staticmethod
+	def _frame_viewports(html_frames: list[EnhancedDOMTreeNode]) -> list[tuple[float, float, float, float]]:
+		"""Viewports an element inside `html_frames` has to intersect, as (left, top, right, bottom) in the element's own
+		frame coordinates.
 
+		Going from the innermost frame outwards, an iframe shifts everything inside it by its bounds and an HTML document
+		clips to its client rect, shifted by its scroll position. Doing this once per frame chain turns the per element
+		check into plain rectangle comparisons.
 		"""
-		Reverse iterate through the html frames (that can be either iframe or document -> if it's a document frame compare if the current bounds interest with it (taking scroll into account) otherwise move the current bounds by the iframe offset)
-		"""
+		offset_x = 0.0
+		offset_y = 0.0
+		viewports: list[tuple[float, float, float, float]] = []
+
 		for frame in reversed(html_frames):
-			if (
-				frame.node_type == NodeType.ELEMENT_NODE
-				and frame.node_name.upper() == 'IFRAME'
-				and frame.snapshot_node
-				and frame.snapshot_node.bounds
-			):
-				iframe_bounds = frame.snapshot_node.bounds
+			snapshot_node = frame.snapshot_node
+			if not snapshot_node or frame.node_type != NodeType.ELEMENT_NODE:
+				continue
 
-				# negate the values added in `_construct_enhanced_node`
-				current_bounds.x += iframe_bounds.x
-				current_bounds.y += iframe_bounds.y
+			if frame.node_name.upper() == 'IFRAME' and snapshot_node.bounds:
+				offset_x += snapshot_node.bounds.x
+				offset_y += snapshot_node.bounds.y
 
-			if (
-				frame.node_type == NodeType.ELEMENT_NODE
-				and frame.node_name == 'HTML'
-				and frame.snapshot_node
-				and frame.snapshot_node.scrollRects
-				and frame.snapshot_node.clientRects
-			):
-				# For iframe content, we need to check visibility within the iframe's viewport
-				# The scrollRects represent the current scroll position
-				# The clientRects represent the viewport size
-				# Elements are visible if they fall within the viewport after accounting for scroll
-
-				# The viewport of the frame (what's actually visible)
-				viewport_left = 0  # Viewport always starts at 0 in frame coordinates
-				viewport_top = 0
-				viewport_right = frame.snapshot_node.clientRects.width
-				viewport_bottom = frame.snapshot_node.clientRects.height
-
-				# Adjust element bounds by the scroll offset to get position relative to viewport
-				# When scrolled down, scrollRects.y is positive, so we subtract it from element's y
-				adjusted_x = current_bounds.x - frame.snapshot_node.scrollRects.x
-				adjusted_y = current_bounds.y - frame.snapshot_node.scrollRects.y
-
-				frame_intersects = (
-					adjusted_x < viewport_right
-					and adjusted_x + current_bounds.width > viewport_left
-					and adjusted_y < viewport_bottom
-					and adjusted_y + current_bounds.height > viewport_top
-				)
+			if frame.node_name == 'HTML' and snapshot_node.scrollRects and snapshot_node.clientRects:
+				# Elements are visible if they fall within the frame's viewport after accounting for scroll
+				left = snapshot_node.scrollRects.x - offset_x
+				top = snapshot_node.scrollRects.y - offset_y
+				viewports.append((left, top, left + snapshot_node.clientRects.width, top + snapshot_node.clientRects.height))
+				offset_x -= snapshot_node.scrollRects.x
+				offset_y -= snapshot_node.scrollRects.y
 
-				if not frame_intersects:
-					return False
+		return viewports
 
-				# Keep the original coordinate adjustment to maintain consistency
-				# This adjustment is needed for proper coordinate transformation
-				current_bounds.x -= frame.snapshot_node.scrollRects.x
-				current_bounds.y -= frame.snapshot_node.scrollRects.y
+	@classmethod
+	def is_element_visible_according_to_all_parents(
+		cls, node: EnhancedDOMTreeNode, html_frames: list[EnhancedDOMTreeNode]
+	) -> bool:
+		"""Check if the element is visible according to all its parent HTML frames.
 
-		# If we reach here, element is visible in main viewport and all containing iframes
-		return True
+		Doesn't modify the node, its bounds stay in its own frame's document coordinates.
+		"""
+
+		if not node.snapshot_node:
+			return False
+
+		if cls._is_hidden_by_style(node.snapshot_node.computed_styles):
+			return False
+
+		# The element's local bounds (in its own frame's coordinate system)
+		bounds = node.snapshot_node.bounds
+
+		if not bounds:
+			return False  # If there are no bounds, the element is not visible
+
+		return all(
+			bounds.x < right and bounds.x + bounds.width > left and bounds.y < bottom and bounds.y + bounds.height > top
+			for left, top, right, bottom in cls._frame_viewports(html_frames)
+		)
+
+	def _apply_visibility(
+		self,
+		laid_out: list[tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode]]],
+		layout_store: SnapshotLayoutStore,
+	) -> None:
+		"""Set `is_visible` for all laid out nodes in one pass over the layout store's columns.
+
+		Same result as `is_element_visible_according_to_all_parents` for every node, but styles are checked once per
+		distinct style row and frame viewports are computed once per frame chain (nodes in the same frame share the same
+		`html_frames` list). Nothing is mutated besides `is_visible`.
+		"""
+		hidden_style_codes = [self._is_hidden_by_style(styles) for styles in layout_store.styles]
+		bounds = layout_store.bounds
+		style_codes = layout_store.style_codes
+
+		# group nodes with layout by frame chain: id(html_frames) -> (html_frames, nodes, rows)
+		groups: dict[int, tuple[list[EnhancedDOMTreeNode], list[EnhancedDOMTreeNode], list[int]]] = {}
+		for dom_tree_node, html_frames in laid_out:
+			row = layout_store.row(dom_tree_node.backend_node_id) if dom_tree_node.snapshot_node else None
+			style_code = style_codes[row] if row is not None else -1
+			if row is None or math.isnan(bounds[row * 4]) or (style_code >= 0 and hidden_style_codes[style_code]):
+				dom_tree_node.is_visible = False
+				continue
+
+			group = groups.get(id(html_frames))
+			if group is None:
+				group = groups[id(html_frames)] = (html_frames, [], [])
+			group[1].append(dom_tree_node)
+			group[2].append(row)
+
+		for html_frames, nodes, rows in groups.values():
+			visible = [True] * len(rows)
+			for left, top, right, bottom in self._frame_viewports(html_frames):
+				visible = [
+					is_visible
+					and bounds[row * 4] < right
+					and bounds[row * 4] + bounds[row * 4 + 2] > left
+					and bounds[row * 4 + 1] < bottom
+					and bounds[row * 4 + 1] + bounds[row * 4 + 3] > top
+					for is_visible, row in zip(visible, rows)
+				]
+			for dom_tree_node, is_visible in zip(nodes, visible):
+				dom_tree_node.is_visible = is_visible
 
 	async def _get_ax_tree_for_all_frames(self, target_id: TargetID) -> GetFullAXTreeReturns:
 		"""Recursively collect all frames and merge their accessibility trees into a single array."""
 
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
-		frame_tree = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
+		frame_tree = await self.browser_session._frame_tree_cache.get_frame_tree(cdp_session)
 
 		def collect_all_frame_ids(frame_tree_node) -> list[str]:
 			"""Recursively collect all frame IDs from the frame tree."""
@@ -255,7 +343,7 @@ class DomService:
 			return frame_ids
 
 		# Collect all frame IDs recursively
-		all_frame_ids = collect_all_frame_ids(frame_tree['frameTree'])
+		all_frame_ids = collect_all_frame_ids(frame_tree)
 
 		# Get accessibility tree for each frame
 		ax_tree_requests = []
@@ -275,6 +363,57 @@ class DomService:
 
 		return {'nodes': merged_nodes}
 
+	async def _get_partial_ax_tree(self, cdp_session: 'CDPSession', root: Node) -> GetFullAXTreeReturns:
+		"""Fetch the AX nodes of candidate interactive elements only, see `_is_ax_candidate`.
+
+		Pages with more candidates than `partial_ax_tree_fallback_threshold` get the full AX tree instead, one request per
+		frame is cheaper than hundreds of partial ones.
+		"""
+		candidates: list[int] = []
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			if node['nodeType'] == NodeType.ELEMENT_NODE.value and _is_ax_candidate(node):
+				candidates.append(node['backendNodeId'])
+			stack.extend(node.get('children', []))
+			stack.extend(node.get('shadowRoots', []))
+			if 'contentDocument' in node:
+				stack.append(node['contentDocument'])
+
+		if len(candidates) > self.partial_ax_tree_fallback_threshold:
+			self.logger.debug(f'{len(candidates)} AX candidates, fetching the full AX tree instead')
+			return await self._get_ax_tree_for_all_frames(cdp_session.target_id)
+
+		return {'nodes': await self._get_partial_ax_nodes(cdp_session, candidates)}
+
+	async def _get_partial_ax_nodes(self, cdp_session: 'CDPSession', backend_node_ids: list[int]) -> list[AXNode]:
+		"""Fetch the AX nodes of the given nodes, at most `max_concurrent_ax_requests` requests at a time. Nodes that can't
+		be fetched (e.g. removed in the meantime) are left out."""
+		semaphore = asyncio.Semaphore(self.max_concurrent_ax_requests)
+
+		async def fetch(backend_node_id: int) -> list[AXNode]:
+			async with semaphore:
+				result = await cdp_session.cdp_client.send.Accessibility.getPartialAXTree(
+					params={'backendNodeId': backend_node_id, 'fetchRelatives': False},
+					session_id=cdp_session.session_id,
+				)
+			return result['nodes']
+
+		results = await asyncio.gather(*(fetch(backend_node_id) for backend_node_id in backend_node_ids), return_exceptions=True)
+		return [ax_node for result in results if not isinstance(result, BaseException) for ax_node in result]
+
+	async def _capture_snapshot(self, cdp_session: 'CDPSession') -> CaptureSnapshotReturns:
+		return await cdp_session.cdp_client.send.DOMSnapshot.captureSnapshot(
+			params={
+				'computedStyles': REQUIRED_COMPUTED_STYLES,
+				'includePaintOrder': True,
+				'includeDOMRects': True,
+				'includeBlendedBackgroundColors': False,
+				'includeTextColorOpacities': False,
+			},
+			session_id=cdp_session.session_id,
+		)
+
 	async def _get_all_trees(self, target_id: TargetID) -> TargetAllTrees:
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
@@ -328,31 +467,31 @@ class DomService:
 
 		# Define CDP request factories to avoid duplication
 		def create_snapshot_request():
-			return cdp_session.cdp_client.send.DOMSnapshot.captureSnapshot(
-				params={
-					'computedStyles': REQUIRED_COMPUTED_STYLES,
-					'includePaintOrder': True,
-					'includeDOMRects': True,
-					'includeBlendedBackgroundColors': False,
-					'includeTextColorOpacities': False,
-				},
-				session_id=cdp_session.session_id,
-			)
+			return self._capture_snapshot(cdp_session)
 
 		def create_dom_tree_request():
 			return cdp_session.cdp_client.send.DOM.getDocument(
 				params={'depth': -1, 'pierce': True}, session_id=cdp_session.session_id
 			)
 
+		request_factories = {
+			'snapshot': create_snapshot_request,
+			'dom_tree': create_dom_tree_request,
+			'device_pixel_ratio': lambda: self._get_viewport_ratio(target_id),
+		}
+		if self.ax_tree_mode == 'full':
+			request_factories['ax_tree'] = lambda: self._get_ax_tree_for_all_frames(target_id)
+
 		start = time.time()
+		finished_at: dict[str, float] = {}
+
+		def create_task(key: str) -> asyncio.Task:
+			task = asyncio.create_task(request_factories[key]())
+			task.add_done_callback(lambda _: finished_at.__setitem__(key, time.time()))
+			return task
 
 		# Create initial tasks
-		tasks = {
-			'snapshot': asyncio.create_task(create_snapshot_request()),
-			'dom_tree': asyncio.create_task(create_dom_tree_request()),
-			'ax_tree': asyncio.create_task(self._get_ax_tree_for_all_frames(target_id)),
-			'device_pixel_ratio': asyncio.create_task(self._get_viewport_ratio(target_id)),
-		}
+		tasks = {key: create_task(key) for key in request_factories}
 
 		# Wait for all tasks with timeout
 		done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
@@ -362,18 +501,10 @@ class DomService:
 			for task in pending:
 				task.cancel()
 
-			# Retry mapping for pending tasks
-			retry_map = {
-				tasks['snapshot']: lambda: asyncio.create_task(create_snapshot_request()),
-				tasks['dom_tree']: lambda: asyncio.create_task(create_dom_tree_request()),
-				tasks['ax_tree']: lambda: asyncio.create_task(self._get_ax_tree_for_all_frames(target_id)),
-				tasks['device_pixel_ratio']: lambda: asyncio.create_task(self._get_viewport_ratio(target_id)),
-			}
-
 			# Create new tasks only for the ones that didn't complete
 			for key, task in tasks.items():
-				if task in pending and task in retry_map:
-					tasks[key] = retry_map[task]()
+				if task in pending:
+					tasks[key] = create_task(key)
 
 			# Wait again with shorter timeout
 			done2, pending2 = await asyncio.wait([t for t in tasks.values() if not t.done()], timeout=2.0)
@@ -400,12 +531,23 @@ class DomService:
 		if failed:
 			raise TimeoutError(f'CDP requests failed or timed out: {", ".join(failed)}')
 
+		# the AX strategy trades accessibility data for latency, see `ax_tree_mode`
+		if self.ax_tree_mode == 'full':
+			ax_tree_timing = finished_at['ax_tree'] - start
+		elif self.ax_tree_mode == 'partial':
+			ax_tree_start = time.time()
+			results['ax_tree'] = await self._get_partial_ax_tree(cdp_session, results['dom_tree']['root'])
+			ax_tree_timing = time.time() - ax_tree_start
+		else:
+			results['ax_tree'] = GetFullAXTreeReturns(nodes=[])
+			ax_tree_timing = 0.0
+
 		snapshot = results['snapshot']
 		dom_tree = results['dom_tree']
 		ax_tree = results['ax_tree']
 		device_pixel_ratio = results['device_pixel_ratio']
 		end = time.time()
-		cdp_timing = {'cdp_calls_total': end - start}
+		cdp_timing = {'cdp_calls_total': end - start, f'ax_tree_{self.ax_tree_mode}': ax_tree_timing}
 
 		# DEBUG: Log snapshot info
 		if snapshot and 'documents' in snapshot:
@@ -426,173 +568,265 @@ class DomService:
 			cdp_timing=cdp_timing,
 		)
 
-	async def get_dom_tree(
+	def _build_enhanced_dom_tree(
 		self,
+		trees: TargetAllTrees,
 		target_id: TargetID,
 		initial_html_frames: list[EnhancedDOMTreeNode] | None = None,
 		initial_total_frame_offset: DOMRect | None = None,
-	) -> EnhancedDOMTreeNode:
-		"""Get the DOM tree for a specific target.
+	) -> tuple[EnhancedDOMTreeNode, dict[int, EnhancedDOMTreeNode], list[tuple[EnhancedDOMTreeNode, str, DOMRect]]]:
+		"""Build the enhanced DOM tree for a single target from already fetched CDP trees.
 
-		Args:
-			target_id: Target ID of the page to get the DOM tree for.
-			initial_html_frames: List of HTML frame nodes encountered so far
-			initial_total_frame_offset: Accumulated coordinate offset
+		This is fully synchronous and uses explicit stacks, so deep pages can't hit the recursion limit and no coroutine is
+		created per node. The nodes are constructed from the DOM and AX trees first (`_construct_enhanced_nodes`), then the
+		snapshot layout is bound to them (`_apply_snapshot_layout`), which is also how a patched cached tree gets refreshed.
+
+		Returns:
+			Tuple of (root node, NodeId -> node lookup, cross origin iframes that still need their content document fetched
+			from their own target as `(iframe node, frame id, total frame offset)`)
 		"""
+		ax_tree_lookup: dict[int, AXNode] = {
+			ax_node['backendDOMNodeId']: ax_node for ax_node in trees.ax_tree['nodes'] if 'backendDOMNodeId' in ax_node
+		}
 
-		trees = await self._get_all_trees(target_id)
+		node_lookup: dict[int, EnhancedDOMTreeNode] = {}
+		root_node, cross_origin_iframes = self._construct_enhanced_nodes(
+			trees.dom_tree['root'], target_id, ax_tree_lookup, node_lookup
+		)
 
-		dom_tree = trees.dom_tree
-		ax_tree = trees.ax_tree
-		snapshot = trees.snapshot
-		device_pixel_ratio = trees.device_pixel_ratio
+		# Parse snapshot data into columns, nodes are materialized when the layout pass asks for them
+		layout_store = build_snapshot_layout_store(trees.snapshot, trees.device_pixel_ratio)
+		iframe_offsets = self._apply_snapshot_layout(
+			root_node, target_id, layout_store, initial_html_frames, initial_total_frame_offset
+		)
 
-		ax_tree_lookup: dict[int, AXNode] = {
-			ax_node['backendDOMNodeId']: ax_node for ax_node in ax_tree['nodes'] if 'backendDOMNodeId' in ax_node
-		}
+		pending_iframes = [
+			(iframe_node, iframe_node.frame_id, iframe_offsets[iframe_node.node_id])
+			for iframe_node in cross_origin_iframes
+			if iframe_node.frame_id
+		]
+		return root_node, node_lookup, pending_iframes
 
-		enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
-		""" NodeId (NOT backend node id) -> enhanced dom tree node"""  # way to get the parent/content node
+	def _construct_enhanced_nodes(
+		self,
+		root: Node,
+		target_id: TargetID,
+		ax_tree_lookup: dict[int, AXNode],
+		node_lookup: dict[int, EnhancedDOMTreeNode],
+	) -> tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode]]:
+		"""Construct enhanced nodes for a CDP node and all of its descendants, without any layout data.
 
-		# Parse snapshot data with everything calculated upfront
-		snapshot_lookup = build_snapshot_lookup(snapshot, device_pixel_ratio)
+		Every new node is added to `node_lookup` (NodeId, NOT backend node id -> node). The returned root isn't attached to
+		a parent, that's up to the caller.
 
-		async def _construct_enhanced_node(
-			node: Node, html_frames: list[EnhancedDOMTreeNode] | None, total_frame_offset: DOMRect | None
-		) -> EnhancedDOMTreeNode:
-			"""
-			Recursively construct enhanced DOM tree nodes.
+		Returns:
+			Tuple of (root node, iframes without a content document that have to be fetched from their own target)
+		"""
+		session_id = self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None
 
-			Args:
-				node: The DOM node to construct
-				html_frames: List of HTML frame nodes encountered so far
-				accumulated_iframe_offset: Accumulated coordinate translation from parent iframes (includes scroll corrections)
-			"""
+		# (node, parent enhanced node, relation to parent)
+		stack: list[tuple[Node, EnhancedDOMTreeNode | None, str | None]] = [(root, None, None)]
+		cross_origin_iframes: list[EnhancedDOMTreeNode] = []
+		root_node: EnhancedDOMTreeNode | None = None
 
-			# Initialize lists if not provided
-			if html_frames is None:
-				html_frames = []
+		while stack:
+			node, parent, relation = stack.pop()
 
-			# to get rid of the pointer references
-			if total_frame_offset is None:
-				total_frame_offset = DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
-			else:
-				total_frame_offset = DOMRect(
-					total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height
+			# memoize the mf (I don't know if some nodes are duplicated)
+			dom_tree_node = node_lookup.get(node['nodeId'])
+			if dom_tree_node is None:
+				ax_node = ax_tree_lookup.get(node['backendNodeId'])
+				enhanced_ax_node = self._build_enhanced_ax_node(ax_node) if ax_node else None
+
+				# To make attributes more readable
+				attributes: dict[str, str] = {}
+				if 'attributes' in node and node['attributes']:
+					node_attributes = node['attributes']
+					for i in range(0, len(node_attributes), 2):
+						attributes[node_attributes[i]] = node_attributes[i + 1]
+
+				shadow_root_type = node.get('shadowRootType') or None
+
+				dom_tree_node = EnhancedDOMTreeNode(
+					node_id=node['nodeId'],
+					backend_node_id=node['backendNodeId'],
+					node_type=NodeType(node['nodeType']),
+					node_name=node['nodeName'],
+					node_value=node['nodeValue'],
+					attributes=attributes,
+					is_scrollable=node.get('isScrollable', None),
+					frame_id=node.get('frameId', None),
+					session_id=session_id,
+					target_id=target_id,
+					content_document=None,
+					shadow_root_type=shadow_root_type,
+					shadow_roots=None,
+					# children point at the node they were listed under, same as looking up their parentId
+					parent_node=parent,
+					children_nodes=None,
+					ax_node=enhanced_ax_node,
+					snapshot_node=None,
+					is_visible=None,
+					absolute_position=None,
+					element_index=None,
 				)
 
-			# memoize the mf (I don't know if some nodes are duplicated)
-			if node['nodeId'] in enhanced_dom_tree_node_lookup:
-				return enhanced_dom_tree_node_lookup[node['nodeId']]
+				node_lookup[node['nodeId']] = dom_tree_node
 
-			ax_node = ax_tree_lookup.get(node['backendNodeId'])
-			if ax_node:
-				enhanced_ax_node = self._build_enhanced_ax_node(ax_node)
+				# handle cross origin iframe (the content document is fetched from the iframe's own target afterwards)
+				if (
+					# TODO: hacky way to disable cross origin iframes for now
+					self.cross_origin_iframes
+					and node['nodeName'].upper() == 'IFRAME'
+					and node.get('contentDocument', None) is None
+				):  # None meaning there is no content
+					cross_origin_iframes.append(dom_tree_node)
+
+				# Push in reverse so nodes are constructed in the same order as a recursive walk:
+				# content document, then shadow roots, then children
+				if 'children' in node and node['children']:
+					dom_tree_node.children_nodes = []
+					for child in reversed(node['children']):
+						stack.append((child, dom_tree_node, 'child'))
+
+				if 'shadowRoots' in node and node['shadowRoots']:
+					dom_tree_node.shadow_roots = []
+					for shadow_root in reversed(node['shadowRoots']):
+						stack.append((shadow_root, dom_tree_node, 'shadow_root'))
+
+				if 'contentDocument' in node and node['contentDocument']:
+					stack.append((node['contentDocument'], dom_tree_node, 'content_document'))
+
+			# Attach the node to its parent
+			if parent is None:
+				root_node = dom_tree_node
+			elif relation == 'content_document':
+				parent.content_document = dom_tree_node
+				# forcefully set the parent node to the content document node (helps traverse the tree)
+				dom_tree_node.parent_node = parent
+			elif relation == 'shadow_root':
+				# forcefully set the parent node to the shadow root node (helps traverse the tree)
+				dom_tree_node.parent_node = parent
+				assert parent.shadow_roots is not None
+				parent.shadow_roots.append(dom_tree_node)
 			else:
-				enhanced_ax_node = None
+				assert parent.children_nodes is not None
+				parent.children_nodes.append(dom_tree_node)
 
-			# To make attributes more readable
-			attributes: dict[str, str] | None = None
-			if 'attributes' in node and node['attributes']:
-				attributes = {}
-				for i in range(0, len(node['attributes']), 2):
-					attributes[node['attributes'][i]] = node['attributes'][i + 1]
+		assert root_node is not None
+		return root_node, cross_origin_iframes
 
-			shadow_root_type = None
-			if 'shadowRootType' in node and node['shadowRootType']:
-				try:
-					shadow_root_type = node['shadowRootType']
-				except ValueError:
-					pass
+	def _apply_snapshot_layout(
+		self,
+		root_node: EnhancedDOMTreeNode,
+		target_id: TargetID,
+		layout_store: SnapshotLayoutStore,
+		initial_html_frames: list[EnhancedDOMTreeNode] | None = None,
+		initial_total_frame_offset: DOMRect | None = None,
+	) -> dict[int, DOMRect]:
+		"""Bind snapshot data to the nodes of `target_id` and compute their absolute positions and visibility.
+
+		Nodes inside the same HTML frame share the same `html_frames` list and frame offset, a new list/offset is only
+		created when entering an HTML document or an iframe. Content documents of other targets (cross origin iframes) are
+		skipped, they were laid out from their own target's snapshot.
+
+		Returns:
+			Total frame offset of every IFRAME's content, by the iframe's NodeId
+		"""
+		# to get rid of the pointer references
+		if initial_total_frame_offset is None:
+			root_frame_offset = DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
+		else:
+			root_frame_offset = DOMRect(
+				initial_total_frame_offset.x,
+				initial_total_frame_offset.y,
+				initial_total_frame_offset.width,
+				initial_total_frame_offset.height,
+			)
+
+		# (node, html frames, total frame offset)
+		stack: list[tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode], DOMRect]] = [
+			(root_node, initial_html_frames or [], root_frame_offset)
+		]
+		visited: set[int] = set()
+		# nodes in pre-order, together with the html frames used for their visibility check
+		laid_out: list[tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode]]] = []
+		iframe_offsets: dict[int, DOMRect] = {}
+
+		while stack:
+			dom_tree_node, html_frames, total_frame_offset = stack.pop()
+			if dom_tree_node.target_id != target_id or id(dom_tree_node) in visited:
+				continue
+			visited.add(id(dom_tree_node))
 
 			# Get snapshot data and calculate absolute position
-			snapshot_data = snapshot_lookup.get(node['backendNodeId'], None)
-			absolute_position = None
+			snapshot_data = layout_store.get(dom_tree_node.backend_node_id, None)
+			dom_tree_node.snapshot_node = snapshot_data
+			dom_tree_node.absolute_position = None
+			# assigned again by the serializer, a cached tree might still carry the index from the previous step
+			dom_tree_node.element_index = None
 			if snapshot_data and snapshot_data.bounds:
-				absolute_position = DOMRect(
+				dom_tree_node.absolute_position = DOMRect(
 					x=snapshot_data.bounds.x + total_frame_offset.x,
 					y=snapshot_data.bounds.y + total_frame_offset.y,
 					width=snapshot_data.bounds.width,
 					height=snapshot_data.bounds.height,
 				)
 
-			dom_tree_node = EnhancedDOMTreeNode(
-				node_id=node['nodeId'],
-				backend_node_id=node['backendNodeId'],
-				node_type=NodeType(node['nodeType']),
-				node_name=node['nodeName'],
-				node_value=node['nodeValue'],
-				attributes=attributes or {},
-				is_scrollable=node.get('isScrollable', None),
-				frame_id=node.get('frameId', None),
-				session_id=self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None,
-				target_id=target_id,
-				content_document=None,
-				shadow_root_type=shadow_root_type,
-				shadow_roots=None,
-				parent_node=None,
-				children_nodes=None,
-				ax_node=enhanced_ax_node,
-				snapshot_node=snapshot_data,
-				is_visible=None,
-				absolute_position=absolute_position,
-				element_index=None,
-			)
-
-			enhanced_dom_tree_node_lookup[node['nodeId']] = dom_tree_node
-
-			if 'parentId' in node and node['parentId']:
-				dom_tree_node.parent_node = enhanced_dom_tree_node_lookup[
-					node['parentId']
-				]  # parents should always be in the lookup
+			# Only HTML documents and iframes change the frame context, everything else shares the parent's
+			updated_html_frames = html_frames
+			updated_frame_offset = total_frame_offset
 
 			# Check if this is an HTML frame node and add it to the list
-			updated_html_frames = html_frames.copy()
-			if node['nodeType'] == NodeType.ELEMENT_NODE.value and node['nodeName'] == 'HTML' and node.get('frameId') is not None:
-				updated_html_frames.append(dom_tree_node)
+			if (
+				dom_tree_node.node_type == NodeType.ELEMENT_NODE
+				and dom_tree_node.node_name == 'HTML'
+				and dom_tree_node.frame_id is not None
+			):
+				updated_html_frames = [*html_frames, dom_tree_node]
 
 				# and adjust the total frame offset by scroll
 				if snapshot_data and snapshot_data.scrollRects:
-					total_frame_offset.x -= snapshot_data.scrollRects.x
-					total_frame_offset.y -= snapshot_data.scrollRects.y
+					updated_frame_offset = DOMRect(
+						x=total_frame_offset.x - snapshot_data.scrollRects.x,
+						y=total_frame_offset.y - snapshot_data.scrollRects.y,
+						width=total_frame_offset.width,
+						height=total_frame_offset.height,
+					)
 					# DEBUG: Log iframe scroll information
 					self.logger.debug(
-						f'🔍 DEBUG: HTML frame scroll - scrollY={snapshot_data.scrollRects.y}, scrollX={snapshot_data.scrollRects.x}, frameId={node.get("frameId")}, nodeId={node["nodeId"]}'
+						f'🔍 DEBUG: HTML frame scroll - scrollY={snapshot_data.scrollRects.y}, scrollX={snapshot_data.scrollRects.x}, frameId={dom_tree_node.frame_id}, nodeId={dom_tree_node.node_id}'
 					)
 
 			# Calculate new iframe offset for content documents, accounting for iframe scroll
-			if node['nodeName'].upper() == 'IFRAME' and snapshot_data and snapshot_data.bounds:
-				if snapshot_data.bounds:
-					updated_html_frames.append(dom_tree_node)
+			if dom_tree_node.node_name.upper() == 'IFRAME':
+				if snapshot_data and snapshot_data.bounds:
+					updated_html_frames = [*updated_html_frames, dom_tree_node]
+					updated_frame_offset = DOMRect(
+						x=updated_frame_offset.x + snapshot_data.bounds.x,
+						y=updated_frame_offset.y + snapshot_data.bounds.y,
+						width=updated_frame_offset.width,
+						height=updated_frame_offset.height,
+					)
+				iframe_offsets[dom_tree_node.node_id] = updated_frame_offset
 
-					total_frame_offset.x += snapshot_data.bounds.x
-					total_frame_offset.y += snapshot_data.bounds.y
+			laid_out.append((dom_tree_node, updated_html_frames))
 
-			if 'contentDocument' in node and node['contentDocument']:
-				dom_tree_node.content_document = await _construct_enhanced_node(
-					node['contentDocument'], updated_html_frames, total_frame_offset
-				)
-				dom_tree_node.content_document.parent_node = dom_tree_node
-				# forcefully set the parent node to the content document node (helps traverse the tree)
+			# same order as construction: content document, then shadow roots, then children
+			if dom_tree_node.children_nodes:
+				for child in reversed(dom_tree_node.children_nodes):
+					stack.append((child, updated_html_frames, updated_frame_offset))
 
-			if 'shadowRoots' in node and node['shadowRoots']:
-				dom_tree_node.shadow_roots = []
-				for shadow_root in node['shadowRoots']:
-					shadow_root_node = await _construct_enhanced_node(shadow_root, updated_html_frames, total_frame_offset)
-					# forcefully set the parent node to the shadow root node (helps traverse the tree)
-					shadow_root_node.parent_node = dom_tree_node
-					dom_tree_node.shadow_roots.append(shadow_root_node)
-
-			if 'children' in node and node['children']:
-				dom_tree_node.children_nodes = []
-				for child in node['children']:
-					dom_tree_node.children_nodes.append(
-						await _construct_enhanced_node(child, updated_html_frames, total_frame_offset)
-					)
+			if dom_tree_node.shadow_roots:
+				for shadow_root in reversed(dom_tree_node.shadow_roots):
+					stack.append((shadow_root, updated_html_frames, updated_frame_offset))
+
+			if dom_tree_node.content_document:
+				stack.append((dom_tree_node.content_document, updated_html_frames, updated_frame_offset))
 
-			# Set visibility using the collected HTML frames
-			dom_tree_node.is_visible = self.is_element_visible_according_to_all_parents(dom_tree_node, updated_html_frames)
+		self._apply_visibility(laid_out, layout_store)
 
+		for dom_tree_node, _ in laid_out:
 			# DEBUG: Log visibility info for form elements in iframes
 			if dom_tree_node.tag_name and dom_tree_node.tag_name.upper() in ['INPUT', 'SELECT', 'TEXTAREA', 'LABEL']:
 				attrs = dom_tree_node.attributes or {}
@@ -610,47 +844,439 @@ class DomService:
 						f"🔍 DEBUG: Form element {dom_tree_node.tag_name} id='{elem_id}' name='{elem_name}' - visible={dom_tree_node.is_visible}, bounds={dom_tree_node.snapshot_node.bounds if dom_tree_node.snapshot_node else 'NO_SNAPSHOT'}"
 					)
 
-			# handle cross origin iframe (just recursively call the main function with the proper target if it exists in iframes)
-			# only do this if the iframe is visible (otherwise it's not worth it)
+		return iframe_offsets
 
-			if (
-				# TODO: hacky way to disable cross origin iframes for now
-				self.cross_origin_iframes and node['nodeName'].upper() == 'IFRAME' and node.get('contentDocument', None) is None
-			):  # None meaning there is no content
-				# Use get_all_frames to find the iframe's target
-				frame_id = node.get('frameId', None)
-				if frame_id:
-					all_frames, _ = await self.browser_session.get_all_frames()
-					frame_info = all_frames.get(frame_id)
-					iframe_document_target = None
-					if frame_info and frame_info.get('frameTargetId'):
-						# Get the target info for this iframe
-						targets = await self.browser_session.cdp_client.send.Target.getTargets()
-						iframe_document_target = next(
-							(t for t in targets['targetInfos'] if t['targetId'] == frame_info['frameTargetId']), None
-						)
-				else:
-					iframe_document_target = None
-				# if target actually exists in one of the frames, just recursively build the dom tree for it
-				if iframe_document_target:
-					self.logger.debug(f'Getting content document for iframe {node.get("frameId", None)}')
-					content_document = await self.get_dom_tree(
-						target_id=iframe_document_target.get('targetId'),
-						# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
-						# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
-						# initial_html_frames=updated_html_frames,
-						initial_total_frame_offset=total_frame_offset,
+	async def _capture_all_trees(self, target_id: TargetID) -> tuple[TargetAllTrees, dict[TargetID, TargetAllTrees | None]]:
+		"""Fetch the trees of `target_id` and, with cross origin iframes enabled, of all the iframe targets below it.
+
+		The iframe targets are listed up front from the frame hierarchy and fetched while the page's own trees are, see
+		`_capture_iframe_trees`.
+
+		Returns:
+			Tuple of (trees of the target, iframe target id -> its trees, None if they couldn't be fetched in time)
+		"""
+		if not self.cross_origin_iframes:
+			return await self._get_all_trees(target_id), {}
+
+		async def capture_iframe_trees() -> dict[TargetID, TargetAllTrees | None]:
+			try:
+				iframe_target_ids = await self._list_cross_origin_iframe_targets(target_id)
+			except Exception as e:
+				# not fatal, iframes found while building the tree are fetched afterwards
+				self.logger.debug(f'Failed to list the cross origin iframes of target {target_id}: {e}')
+				return {}
+			return await self._capture_iframe_trees(iframe_target_ids)
+
+		trees, iframe_trees = await asyncio.gather(self._get_all_trees(target_id), capture_iframe_trees())
+		return trees, iframe_trees
+
+	async def _list_cross_origin_iframe_targets(self, target_id: TargetID) -> list[TargetID]:
+		"""All iframe targets whose iframe element is inside `target_id`, directly or through other iframe targets."""
+		all_frames, _ = await self.browser_session.get_all_frames()
+		target_types = {t['targetId']: t['type'] for t in await self.browser_session._cdp_get_all_targets()}
+
+		children: dict[str, list[TargetID]] = {}  # target id -> iframe targets embedded in it
+		for frame_info in all_frames.values():
+			frame_target_id = frame_info.get('frameTargetId')
+			parent_target_id = frame_info.get('parentTargetId')
+			if not frame_target_id or not parent_target_id or parent_target_id == frame_target_id:
+				continue
+			if target_types.get(frame_target_id) == 'iframe':
+				children.setdefault(parent_target_id, []).append(frame_target_id)
+
+		iframe_target_ids: list[TargetID] = []
+		stack = [target_id]
+		while stack:
+			for child_target_id in children.get(stack.pop(), []):
+				if child_target_id not in iframe_target_ids and child_target_id != target_id:
+					iframe_target_ids.append(child_target_id)
+					stack.append(child_target_id)
+		return iframe_target_ids
+
+	async def _capture_iframe_trees(self, target_ids: list[TargetID]) -> dict[TargetID, TargetAllTrees | None]:
+		"""Fetch the trees of several iframe targets concurrently, at most `max_concurrent_iframe_captures` at a time.
+
+		An iframe that takes longer than `cross_origin_iframe_timeout` or fails is left out (None) instead of stalling or
+		failing the whole page.
+		"""
+		semaphore = asyncio.Semaphore(self.max_concurrent_iframe_captures)
+
+		async def capture(target_id: TargetID) -> TargetAllTrees | None:
+			async with semaphore:
+				try:
+					return await asyncio.wait_for(self._get_all_trees(target_id), timeout=self.cross_origin_iframe_timeout)
+				except TimeoutError:
+					self.logger.warning(
+						f'Cross origin iframe {target_id} took longer than {self.cross_origin_iframe_timeout}s, leaving out its content'
+					)
+				except Exception as e:
+					self.logger.warning(
+						f'Failed to get the trees of cross origin iframe {target_id}, leaving out its content: {e}'
 					)
+				return None
+
+		results = await asyncio.gather(*(capture(target_id) for target_id in target_ids))
+		return dict(zip(target_ids, results))
+
+	async def _attach_cross_origin_iframes(
+		self,
+		pending_iframes: list[tuple[EnhancedDOMTreeNode, str, DOMRect]],
+		iframe_trees: dict[TargetID, TargetAllTrees | None],
+	) -> None:
+		"""Build the content documents of cross origin iframes from their own targets' trees and attach them to the iframe nodes.
+
+		Trees missing from `iframe_trees` (iframes that weren't known up front) are fetched concurrently, one level of
+		nested iframes at a time.
+		"""
+		# Use get_all_frames to find the iframes' targets
+		all_frames, _ = await self.browser_session.get_all_frames()
+		target_ids = {t['targetId'] for t in await self.browser_session._cdp_get_all_targets()}
+
+		while pending_iframes:
+			resolved: list[tuple[EnhancedDOMTreeNode, TargetID, DOMRect]] = []
+			for iframe_node, frame_id, total_frame_offset in pending_iframes:
+				frame_info = all_frames.get(frame_id)
+				# only if the target actually exists in one of the frames
+				if frame_info and frame_info.get('frameTargetId') in target_ids:
+					resolved.append((iframe_node, frame_info['frameTargetId'], total_frame_offset))
+
+			missing = list(dict.fromkeys(target_id for _, target_id, _ in resolved if target_id not in iframe_trees))
+			if missing:
+				iframe_trees.update(await self._capture_iframe_trees(missing))
+
+			pending_iframes = []
+			for iframe_node, target_id, total_frame_offset in resolved:
+				trees = iframe_trees.get(target_id)
+				if trees is None:
+					continue
+
+				self.logger.debug(f'Building content document for iframe {iframe_node.frame_id} from target {target_id}')
+				content_document, _, nested_iframes = self._build_enhanced_dom_tree(
+					trees,
+					target_id,
+					# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
+					# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
+					# initial_html_frames=updated_html_frames,
+					initial_total_frame_offset=total_frame_offset,
+				)
+				iframe_node.content_document = content_document
+				iframe_node.content_document.parent_node = iframe_node
+				pending_iframes.extend(nested_iframes)
+
+	async def get_dom_tree(
+		self,
+		target_id: TargetID,
+		initial_html_frames: list[EnhancedDOMTreeNode] | None = None,
+		initial_total_frame_offset: DOMRect | None = None,
+	) -> EnhancedDOMTreeNode:
+		"""Get the DOM tree for a specific target.
+
+		The trees of the target and of its cross origin iframes are fetched concurrently, then the whole tree is built
+		synchronously.
+
+		Args:
+			target_id: Target ID of the page to get the DOM tree for.
+			initial_html_frames: List of HTML frame nodes encountered so far
+			initial_total_frame_offset: Accumulated coordinate offset
+		"""
 
-					dom_tree_node.content_document = content_document
-					dom_tree_node.content_document.parent_node = dom_tree_node
+		trees, iframe_trees = await self._capture_all_trees(target_id)
 
-			return dom_tree_node
+		enhanced_dom_tree_node, _, pending_iframes = self._build_enhanced_dom_tree(
+			trees, target_id, initial_html_frames, initial_total_frame_offset
+		)
 
-		enhanced_dom_tree_node = await _construct_enhanced_node(dom_tree['root'], initial_html_frames, initial_total_frame_offset)
+		if pending_iframes:
+			await self._attach_cross_origin_iframes(pending_iframes, iframe_trees)
 
 		return enhanced_dom_tree_node
 
+	# region - Incremental updates
+
+	async def _get_dom_tree_incremental(self, target_id: TargetID) -> tuple[EnhancedDOMTreeNode, dict[str, float]]:
+		"""Get the DOM tree of `target_id` by patching the tree of the previous call with the DOM mutations recorded since.
+
+		Falls back to a full rebuild when there is no cached tree for this target's CDP session, when too many mutations were
+		recorded or the document was replaced, and when a mutation can't be applied (e.g. it refers to an unknown node).
+
+		The patched tree is a copy, the nodes of the previous call stay untouched for the DOM states that still refer to
+		them (the cached browser state, the selector map of a running multi_act and the new element detection).
+
+		Returns:
+			Tuple of (enhanced dom tree root, timing info)
+		"""
+		start = time.time()
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+		tracker = self._mutation_tracker
+
+		if self._cached_dom_tree is not None and tracker is not None and tracker.cdp_session is cdp_session:
+			mutations, overflowed = await tracker.drain()
+			dirty_nodes = None
+			if not overflowed:
+				self._copy_cached_dom_tree()
+				dirty_nodes = await self._apply_dom_mutations(mutations, target_id)
+
+			if dirty_nodes is not None:
+				await self._refresh_cached_dom_tree(target_id, dirty_nodes)
+				return self._cached_dom_tree, {
+					'dom_tree_incremental_update': time.time() - start,
+					'dom_mutations_applied': float(len(mutations)),
+				}
+
+			self.logger.debug(f'Could not apply {len(mutations)} DOM mutations incrementally, rebuilding the DOM tree')
+
+		enhanced_dom_tree = await self._rebuild_cached_dom_tree(target_id)
+		return enhanced_dom_tree, {'dom_tree_full_rebuild': time.time() - start}
+
+	async def _rebuild_cached_dom_tree(self, target_id: TargetID) -> EnhancedDOMTreeNode:
+		"""Fetch the whole DOM tree of `target_id` and start recording mutations against it."""
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+
+		if self._mutation_tracker is None or self._mutation_tracker.cdp_session is not cdp_session:
+			if self._mutation_tracker is not None:
+				self._mutation_tracker.stop()
+			self._mutation_tracker = DOMMutationTracker(cdp_session, max_mutations=self.max_dom_mutations, logger=self.logger)
+			self._mutation_tracker.start()
+
+		self._cached_dom_tree = None
+		self._cached_node_lookup = {}
+
+		# Everything recorded until now refers to the previous document. Mutations that still arrive before the
+		# DOM.getDocument response use node ids that won't be in the new lookup, so at worst they cause another full rebuild.
+		self._mutation_tracker.reset()
+		trees, iframe_trees = await self._capture_all_trees(target_id)
+		enhanced_dom_tree, node_lookup, pending_iframes = self._build_enhanced_dom_tree(trees, target_id)
+
+		if pending_iframes:
+			# mutations inside other targets aren't recorded, so a tree with cross origin content is never patched
+			await self._attach_cross_origin_iframes(pending_iframes, iframe_trees)
+		else:
+			self._cached_dom_tree = enhanced_dom_tree
+			self._cached_node_lookup = node_lookup
+
+		return enhanced_dom_tree
+
+	def _copy_cached_dom_tree(self) -> None:
+		"""Replace the cached tree with a shallow copy of every node, so patching it doesn't change the previous DOM state.
+
+		Only the node objects, their links and their attributes are copied, everything that's replaced rather than modified
+		(AX and snapshot nodes, positions, memoized hashers) is shared with the previous tree.
+		"""
+		assert self._cached_dom_tree is not None
+		copies: dict[int, EnhancedDOMTreeNode] = {id(node): copy.copy(node) for node in self._cached_node_lookup.values()}
+		for node in copies.values():
+			node.attributes = dict(node.attributes)
+			if node.parent_node is not None:
+				node.parent_node = copies[id(node.parent_node)]
+			if node.children_nodes is not None:
+				node.children_nodes = [copies[id(child)] for child in node.children_nodes]
+			if node.shadow_roots is not None:
+				node.shadow_roots = [copies[id(shadow_root)] for shadow_root in node.shadow_roots]
+			if node.content_document is not None:
+				node.content_document = copies[id(node.content_document)]
+
+		self._cached_dom_tree = copies[id(self._cached_dom_tree)]
+		self._cached_node_lookup = {node_id: copies[id(node)] for node_id, node in self._cached_node_lookup.items()}
+
+	async def _apply_dom_mutations(self, mutations: list[DOMMutation], target_id: TargetID) -> list[EnhancedDOMTreeNode] | None:
+		"""Patch the cached tree in place with recorded DOM mutations.
+
+		Returns:
+			The inserted or changed nodes (their AX nodes need refreshing), or None if the mutations couldn't be applied and
+			the tree has to be rebuilt.
+		"""
+		node_lookup = self._cached_node_lookup
+		dirty: dict[int, EnhancedDOMTreeNode] = {}
+		invalidated_styles: set[int] = set()
+		structure_changed = False
+
+		def construct(node: Node) -> EnhancedDOMTreeNode | None:
+			new_nodes: dict[int, EnhancedDOMTreeNode] = {}
+			enhanced_node, cross_origin_iframes = self._construct_enhanced_nodes(node, target_id, {}, new_nodes)
+			if cross_origin_iframes:
+				return None
+			node_lookup.update(new_nodes)
+			dirty.update(new_nodes)
+			return enhanced_node
+
+		def forget(enhanced_node: EnhancedDOMTreeNode) -> None:
+			stack = [enhanced_node]
+			while stack:
+				current = stack.pop()
+				if node_lookup.get(current.node_id) is current:
+					del node_lookup[current.node_id]
+				dirty.pop(current.node_id, None)
+				stack.extend(current.children)
+				stack.extend(current.shadow_roots or [])
+				if current.content_document:
+					stack.append(current.content_document)
+
+		for mutation in mutations:
+			params = mutation.params
+			method = mutation.method
+
+			if method == 'attributeModified' or method == 'attributeRemoved':
+				node = node_lookup.get(params['nodeId'])
+				if node is None:
+					return None
+				if method == 'attributeModified':
+					node.attributes[params['name']] = params['value']
+				else:
+					node.attributes.pop(params['name'], None)
+				dirty[node.node_id] = node
+
+			elif method == 'characterDataModified':
+				node = node_lookup.get(params['nodeId'])
+				if node is None:
+					return None
+				node.node_value = params['characterData']
+				dirty[node.node_id] = node
+				# the text is part of the parent's accessible name
+				if node.parent_node is not None:
+					dirty[node.parent_node.node_id] = node.parent_node
+
+			elif method == 'inlineStyleInvalidated':
+				invalidated_styles.update(params['nodeIds'])
+
+			elif method == 'childNodeInserted':
+				structure_changed = True
+				parent = node_lookup.get(params['parentNodeId'])
+				inserted = construct(params['node'])
+				if parent is None or inserted is None:
+					return None
+				inserted.parent_node = parent
+
+				if inserted.node_type == NodeType.DOCUMENT_NODE:
+					# a same origin iframe navigated
+					parent.content_document = inserted
+					continue
+
+				children = parent.children_nodes if parent.children_nodes is not None else []
+				previous_node_id = params['previousNodeId']
+				if not previous_node_id:
+					position = 0
+				else:
+					position = next((i + 1 for i, child in enumerate(children) if child.node_id == previous_node_id), None)
+					if position is None:
+						return None
+				children.insert(position, inserted)
+				parent.children_nodes = children
+
+			elif method == 'childNodeRemoved':
+				structure_changed = True
+				parent = node_lookup.get(params['parentNodeId'])
+				node = node_lookup.get(params['nodeId'])
+				if parent is None or node is None:
+					return None
+				if parent.content_document is node:
+					parent.content_document = None
+				elif parent.children_nodes and any(child is node for child in parent.children_nodes):
+					parent.children_nodes = [child for child in parent.children_nodes if child is not node]
+				else:
+					return None
+				forget(node)
+
+			elif method == 'setChildNodes':
+				structure_changed = True
+				parent = node_lookup.get(params['parentId'])
+				if parent is None:
+					return None
+				for child in parent.children:
+					forget(child)
+				children = []
+				for child_node in params['nodes']:
+					child = construct(child_node)
+					if child is None:
+						return None
+					child.parent_node = parent
+					children.append(child)
+				parent.children_nodes = children
+
+			elif method == 'shadowRootPushed':
+				host = node_lookup.get(params['hostId'])
+				shadow_root = construct(params['root'])
+				if host is None or shadow_root is None:
+					return None
+				shadow_root.parent_node = host
+				host.shadow_roots = [*(host.shadow_roots or []), shadow_root]
+
+			elif method == 'shadowRootPopped':
+				host = node_lookup.get(params['hostId'])
+				shadow_root = node_lookup.get(params['rootId'])
+				if host is None or shadow_root is None or not host.shadow_roots:
+					return None
+				host.shadow_roots = [root for root in host.shadow_roots if root is not shadow_root] or None
+				forget(shadow_root)
+
+		# inline style changes through element.style only invalidate the style attribute, read it back once per node
+		if invalidated_styles:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+			nodes = [node_lookup[node_id] for node_id in invalidated_styles if node_id in node_lookup]
+			results = await asyncio.gather(
+				*(
+					cdp_session.cdp_client.send.DOM.getAttributes(
+						params={'nodeId': node.node_id}, session_id=cdp_session.session_id
+					)
+					for node in nodes
+				),
+				return_exceptions=True,
+			)
+			for node, result in zip(nodes, results):
+				if isinstance(result, BaseException):
+					return None
+				node_attributes = result['attributes']
+				node.attributes = {node_attributes[i]: node_attributes[i + 1] for i in range(0, len(node_attributes), 2)}
+				dirty[node.node_id] = node
+
+		for node in dirty.values():
+			node.invalidate_element_hash()
+		if structure_changed:
+			# sibling positions can shift anywhere below a changed parent, recomputing them lazily is cheap
+			for node in node_lookup.values():
+				node.invalidate_xpath()
+
+		return list(dirty.values())
+
+	async def _refresh_cached_dom_tree(self, target_id: TargetID, dirty_nodes: list[EnhancedDOMTreeNode]) -> None:
+		"""Re-capture the layout of the patched cached tree and refresh the AX nodes of the nodes that changed.
+
+		DOMSnapshot.captureSnapshot can't be scoped to a subtree (and any mutation can move everything after it), so the
+		snapshot is always taken for the whole page. DOM.getDocument and the full AX tree are what's skipped.
+		"""
+		assert self._cached_dom_tree is not None
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+
+		snapshot, device_pixel_ratio, _ = await asyncio.gather(
+			self._capture_snapshot(cdp_session),
+			self._get_viewport_ratio(target_id),
+			self._refresh_ax_nodes(target_id, dirty_nodes),
+		)
+
+		layout_store = build_snapshot_layout_store(snapshot, device_pixel_ratio)
+		self._apply_snapshot_layout(self._cached_dom_tree, target_id, layout_store)
+
+	async def _refresh_ax_nodes(self, target_id: TargetID, dirty_nodes: list[EnhancedDOMTreeNode]) -> None:
+		"""Fetch AX nodes for the given nodes only, or the full AX tree when that's cheaper than many partial requests."""
+		if not dirty_nodes or self.ax_tree_mode == 'none':
+			return
+
+		if len(dirty_nodes) > self.max_ax_refresh_nodes:
+			nodes = list(self._cached_node_lookup.values())
+			ax_nodes = (await self._get_ax_tree_for_all_frames(target_id))['nodes']
+		else:
+			nodes = dirty_nodes
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+			ax_nodes = await self._get_partial_ax_nodes(cdp_session, [node.backend_node_id for node in nodes])
+
+		ax_tree_lookup: dict[int, AXNode] = {
+			ax_node['backendDOMNodeId']: ax_node for ax_node in ax_nodes if 'backendDOMNodeId' in ax_node
+		}
+		for node in nodes:
+			ax_node = ax_tree_lookup.get(node.backend_node_id)
+			node.ax_node = self._build_enhanced_ax_node(ax_node) if ax_node else None
+
+	# endregion - Incremental updates
+
 	async def get_serialized_dom_tree(
 		self, previous_cached_state: SerializedDOMState | None = None
 	) -> tuple[SerializedDOMState, EnhancedDOMTreeNode, dict[str, float]]:
@@ -662,17 +1288,21 @@ class DomService:
 
 		# Use current target (None means use current)
 		assert self.browser_session.current_target_id is not None
-		enhanced_dom_tree = await self.get_dom_tree(target_id=self.browser_session.current_target_id)
+		if self.incremental_dom_updates:
+			enhanced_dom_tree, dom_tree_timing = await self._get_dom_tree_incremental(self.browser_session.current_target_id)
+		else:
+			enhanced_dom_tree = await self.get_dom_tree(target_id=self.browser_session.current_target_id)
+			dom_tree_timing = {}
 
 		start = time.time()
 		serialized_dom_state, serializer_timing = DOMTreeSerializer(
-			enhanced_dom_tree, previous_cached_state
+			enhanced_dom_tree, previous_cached_state, enable_paint_order_filtering=self.paint_order_filtering
 		).serialize_accessible_elements()
 
 		end = time.time()
 		serialize_total_timing = {'serialize_dom_tree_total': end - start}
 
 		# Combine all timing info
-		all_timing = {**serializer_timing, **serialize_total_timing}
+		all_timing = {**dom_tree_timing, **serializer_timing, **serialize_total_timing}
 
 		return serialized_dom_state, enhanced_dom_tree, all_timing
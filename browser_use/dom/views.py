@@ -90,6 +90,7 @@ class SimplifiedNode:
 
 	is_new: bool = False
 	excluded_by_parent: bool = False  # New field for bbox filtering
+	ignored_by_paint_order: bool = False  # covered by an element painted on top of it
 
 	def __json__(self) -> dict:
 		original_node_json = self.original_node.__json__()
@@ -202,6 +203,10 @@ class EnhancedSnapshotNode:
 # 	element_index: int | None
 
 
+# shared by all nodes without element ancestors, never updated in place (hashers are copied before being extended)
+_EMPTY_BRANCH_HASHER = hashlib.sha256()
+
+
 @dataclass(slots=True)
 class EnhancedDOMTreeNode:
 	"""
@@ -278,6 +283,14 @@ class EnhancedDOMTreeNode:
 
 	uuid: str = field(default_factory=uuid7str)
 
+	# memoized hashes, see `parent_branch_hash` and `__hash__`
+	_branch_hasher: Any = field(default=None, repr=False, compare=False)
+	_parent_branch_hash: int | None = field(default=None, repr=False, compare=False)
+	_element_hash: int | None = field(default=None, repr=False, compare=False)
+	# memoized XPath, see `xpath`
+	_xpath: str | None = field(default=None, repr=False, compare=False)
+	_sibling_position: int | None = field(default=None, repr=False, compare=False)
+
 	@property
 	def parent(self) -> 'EnhancedDOMTreeNode | None':
 		return self.parent_node
@@ -293,7 +306,8 @@ class EnhancedDOMTreeNode:
 		"""
 		children = self.children_nodes or []
 		if self.shadow_roots:
-			children.extend(self.shadow_roots)
+			# don't extend children_nodes in place, the tree can be serialized more than once
+			children = [*children, *self.shadow_roots]
 		return children
 
 	@property
@@ -302,52 +316,83 @@ class EnhancedDOMTreeNode:
 
 	@property
 	def xpath(self) -> str:
-		"""Generate XPath for this DOM node, stopping at shadow boundaries or iframes."""
-		segments = []
-		current_element = self
-
-		while current_element and (
-			current_element.node_type == NodeType.ELEMENT_NODE or current_element.node_type == NodeType.DOCUMENT_FRAGMENT_NODE
-		):
-			# just pass through shadow roots
-			if current_element.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+		"""Generate XPath for this DOM node, stopping at shadow boundaries or iframes.
+
+		Memoized per node and built from the parent's memoized XPath, so generating XPaths for a whole tree is linear.
+		"""
+		if self._xpath is None:
+			chain: list[EnhancedDOMTreeNode] = []
+			current_element: EnhancedDOMTreeNode | None = self
+			while current_element is not None and current_element._xpath is None:
+				chain.append(current_element)
+				# stop ONLY if we hit iframe, the XPath of the iframe's content starts over
+				if (
+					current_element.node_type == NodeType.ELEMENT_NODE
+					and current_element.parent_node
+					and current_element.parent_node.node_name.lower() == 'iframe'
+				):
+					break
 				current_element = current_element.parent_node
-				continue
 
-			# stop ONLY if we hit iframe
-			if current_element.parent_node and current_element.parent_node.node_name.lower() == 'iframe':
-				break
+			for node in reversed(chain):
+				node._xpath = node._xpath_from_parent()
 
-			position = self._get_element_position(current_element)
-			tag_name = current_element.node_name.lower()
-			xpath_index = f'[{position}]' if position > 0 else ''
-			segments.insert(0, f'{tag_name}{xpath_index}')
+		assert self._xpath is not None
+		return self._xpath
 
-			current_element = current_element.parent_node
+	def _xpath_from_parent(self) -> str:
+		"""XPath of this node, given that the parent's XPath is memoized already (unless the parent is an iframe)."""
+		parent_xpath = self.parent_node._xpath if self.parent_node else None
+
+		# just pass through shadow roots
+		if self.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+			return parent_xpath or ''
+		if self.node_type != NodeType.ELEMENT_NODE:
+			return ''
 
-		return '/'.join(segments)
+		position = self._get_element_position(self)
+		xpath_index = f'[{position}]' if position > 0 else ''
+		segment = f'{self.node_name.lower()}{xpath_index}'
+
+		if self.parent_node and self.parent_node.node_name.lower() == 'iframe':
+			return segment
+		return f'{parent_xpath}/{segment}' if parent_xpath else segment
 
 	def _get_element_position(self, element: 'EnhancedDOMTreeNode') -> int:
 		"""Get the position of an element among its siblings with the same tag name.
 		Returns 0 if it's the only element of its type, otherwise returns 1-based index."""
-		if not element.parent_node or not element.parent_node.children_nodes:
-			return 0
-
-		same_tag_siblings = [
-			child
-			for child in element.parent_node.children_nodes
-			if child.node_type == NodeType.ELEMENT_NODE and child.node_name.lower() == element.node_name.lower()
-		]
-
-		if len(same_tag_siblings) <= 1:
-			return 0  # No index needed if it's the only one
-
-		try:
-			# XPath is 1-indexed
-			position = same_tag_siblings.index(element) + 1
-			return position
-		except ValueError:
-			return 0
+		if element._sibling_position is None:
+			if element.parent_node:
+				element.parent_node._index_child_positions()
+			if element._sibling_position is None:
+				# not one of its parent's children (e.g. the root or a content document)
+				element._sibling_position = 0
+		return element._sibling_position
+
+	def _index_child_positions(self) -> None:
+		"""Store the same-tag sibling position of all element children in one pass over `children_nodes`."""
+		children = [child for child in self.children if child.node_type == NodeType.ELEMENT_NODE]
+
+		same_tag_counts: dict[str, int] = {}
+		for child in children:
+			tag_name = child.node_name.lower()
+			same_tag_counts[tag_name] = same_tag_counts.get(tag_name, 0) + 1
+
+		seen: dict[str, int] = {}
+		for child in children:
+			tag_name = child.node_name.lower()
+			if same_tag_counts[tag_name] <= 1:
+				child._sibling_position = 0  # No index needed if it's the only one
+			else:
+				# XPath is 1-indexed
+				seen[tag_name] = seen.get(tag_name, 0) + 1
+				child._sibling_position = seen[tag_name]
+
+	def invalidate_xpath(self) -> None:
+		"""Forget the memoized XPath and sibling positions of this node's children, call after the tree was modified."""
+		self._xpath = None
+		for child in self.children:
+			child._sibling_position = None
 
 	def __json__(self) -> dict:
 		"""Serializes the node and its descendants to a dictionary, omitting parent references."""
@@ -626,32 +671,51 @@ class EnhancedDOMTreeNode:
 		"""
 		Hash the element based on its parent branch path and attributes.
 
+		Memoized on the node, call `invalidate_element_hash` after changing its attributes.
+
 		TODO: migrate this to use only backendNodeId + current SessionId
 		"""
+		if self._element_hash is None:
+			# same value as hashing '{parent branch path}|{attributes}' from scratch, the path part is shared with the parent
+			hasher = self._get_branch_hasher().copy()
+			attributes_string = ''.join(f'{key}={value}' for key, value in self.attributes.items())
+			hasher.update(f'|{attributes_string}'.encode())
 
-		# Get parent branch path
-		parent_branch_path = self._get_parent_branch_path()
-		parent_branch_path_string = '/'.join(parent_branch_path)
-
-		# Get attributes hash
-		attributes_string = ''.join(f'{key}={value}' for key, value in self.attributes.items())
-
-		# Combine both for final hash
-		combined_string = f'{parent_branch_path_string}|{attributes_string}'
-		element_hash = hashlib.sha256(combined_string.encode()).hexdigest()
-
-		# Convert to int for __hash__ return type - use first 16 chars and convert from hex to int
-		return int(element_hash[:16], 16)
+			# Convert to int for __hash__ return type - use first 16 chars and convert from hex to int
+			self._element_hash = int(hasher.hexdigest()[:16], 16)
+		return self._element_hash
 
 	def parent_branch_hash(self) -> int:
 		"""
 		Hash the element based on its parent branch path and attributes.
 		"""
-		parent_branch_path = self._get_parent_branch_path()
-		parent_branch_path_string = '/'.join(parent_branch_path)
-		element_hash = hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
+		if self._parent_branch_hash is None:
+			self._parent_branch_hash = int(self._get_branch_hasher().hexdigest()[:16], 16)
+		return self._parent_branch_hash
+
+	def invalidate_element_hash(self) -> None:
+		"""Forget the memoized `__hash__`, the parent branch part stays valid as long as the node isn't moved."""
+		self._element_hash = None
 
-		return int(element_hash[:16], 16)
+	def _get_branch_hasher(self) -> Any:
+		"""SHA-256 state over the parent branch path ('html/body/div'), built by extending the nearest memoized ancestor.
+
+		Hashing every node of a tree costs O(nodes) this way instead of O(nodes * depth).
+		"""
+		unhashed: list[EnhancedDOMTreeNode] = []
+		current: EnhancedDOMTreeNode | None = self
+		while current is not None and current._branch_hasher is None:
+			unhashed.append(current)
+			current = current.parent_node
+
+		hasher = current._branch_hasher if current is not None else _EMPTY_BRANCH_HASHER
+		for node in reversed(unhashed):
+			if node.node_type == NodeType.ELEMENT_NODE:
+				separator = '' if hasher is _EMPTY_BRANCH_HASHER else '/'
+				hasher = hasher.copy()
+				hasher.update(f'{separator}{node.tag_name}'.encode())
+			node._branch_hasher = hasher
+		return hasher
 
 	def _get_parent_branch_path(self) -> list[str]:
 		"""Get the parent branch path as a list of tag names from root to current element."""
@@ -677,6 +741,37 @@ class SerializedDOMState:
 
 	selector_map: DOMSelectorMap
 
+	_backend_node_ids: frozenset[int] | None = field(default=None, repr=False, compare=False)
+	"""Index of the selector map's backend node ids, see `backend_node_ids`"""
+	_parent_branch_hashes: frozenset[int] | None = field(default=None, repr=False, compare=False)
+	_element_hash_index: dict[int, int] | None = field(default=None, repr=False, compare=False)
+
+	@property
+	def backend_node_ids(self) -> frozenset[int]:
+		"""Backend node ids of all elements in the selector map.
+
+		Built once (the serializer fills it in while assigning indices) and reused by the next step's serializer to mark
+		new elements.
+		"""
+		if self._backend_node_ids is None:
+			self._backend_node_ids = frozenset(node.backend_node_id for node in self.selector_map.values())
+		return self._backend_node_ids
+
+	@property
+	def parent_branch_hashes(self) -> frozenset[int]:
+		"""`parent_branch_hash` of all elements in the selector map, used to detect new elements between actions."""
+		if self._parent_branch_hashes is None:
+			self._parent_branch_hashes = frozenset(node.parent_branch_hash() for node in self.selector_map.values())
+		return self._parent_branch_hashes
+
+	def get_index_by_element_hash(self, element_hash: int) -> int | None:
+		"""Highlight index of the element with the given `element_hash` (first one in index order), if any."""
+		if self._element_hash_index is None:
+			self._element_hash_index = {}
+			for index, node in self.selector_map.items():
+				self._element_hash_index.setdefault(node.element_hash, index)
+		return self._element_hash_index.get(element_hash)
+
 	def llm_representation(
 		self,
 		include_attributes: list[str] | None = None,
@@ -691,6 +786,24 @@ class SerializedDOMState:
 
 		return DOMTreeSerializer.serialize_tree(self._root, include_attributes)
 
+	def llm_representation_within_budget(
+		self,
+		max_length: int,
+		include_attributes: list[str] | None = None,
+	) -> tuple[str, bool, int]:
+		"""Same as `llm_representation` cut to `max_length` characters, without serializing what gets cut.
+
+		Returns (text, whether it was truncated, number of interactive elements that were left out).
+		"""
+		from browser_use.dom.serializer.serializer import DOMTreeSerializer
+
+		if not self._root:
+			return 'Empty DOM tree (you might have to wait for the page to load)', False, 0
+
+		include_attributes = include_attributes or DEFAULT_INCLUDE_ATTRIBUTES
+
+		return DOMTreeSerializer.serialize_tree_with_budget(self._root, include_attributes, max_length)
+
 
 @dataclass
 class DOMInteractedElement:
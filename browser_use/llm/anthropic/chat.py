@@ -1,6 +1,6 @@
 import json
 from collections.abc import Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, TypeVar, overload
 
 import httpx
@@ -21,9 +21,10 @@ from pydantic import BaseModel
 
 from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import ClientCloser, ClientPool, create_http_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
-from browser_use.llm.schema import SchemaOptimizer
+from browser_use.llm.schema import SchemaOptimizer, remove_schema_title
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
@@ -50,6 +51,9 @@ class ChatAnthropic(BaseChatModel):
 	max_retries: int = 10
 	default_headers: Mapping[str, str] | None = None
 	default_query: Mapping[str, object] | None = None
+	http_limits: httpx.Limits | None = None  # Connection pool limits of the pooled client
+	http2: bool = False  # Use HTTP/2, needs `pip install httpx[http2]`
+	_client_pool: ClientPool[AsyncAnthropic] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	# Static
 	@property
@@ -98,13 +102,21 @@ class ChatAnthropic(BaseChatModel):
 
 	def get_client(self) -> AsyncAnthropic:
 		"""
-		Returns an AsyncAnthropic client.
+		Returns the AsyncAnthropic client of the running event loop, created on first use and reused after that.
 
 		Returns:
 			AsyncAnthropic: An instance of the AsyncAnthropic client.
 		"""
+		return self._client_pool.get(self._create_client)
+
+	def _create_client(self) -> tuple[AsyncAnthropic, ClientCloser]:
 		client_params = self._get_client_params()
-		return AsyncAnthropic(**client_params)
+		client = AsyncAnthropic(**client_params, http_client=create_http_client(self.http_limits, self.http2))
+		return client, client.close
+
+	async def aclose(self) -> None:
+		"""Close the pooled client of the running event loop, the next call creates a new one."""
+		await self._client_pool.aclose()
 
 	@property
 	def name(self) -> str:
@@ -172,11 +184,8 @@ class ChatAnthropic(BaseChatModel):
 				# Use tool calling for structured output
 				# Create a tool that represents the output format
 				tool_name = output_format.__name__
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
 				# Remove title from schema if present (Anthropic doesn't like it in parameters)
-				if 'title' in schema:
-					del schema['title']
+				schema = SchemaOptimizer.get_optimized_json_schema(output_format, 'untitled', remove_schema_title)
 
 				tool = ToolParam(
 					name=tool_name,
@@ -1,8 +1,9 @@
 import json
 from collections.abc import Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, TypeVar, overload
 
+import httpx
 from anthropic import (
 	NOT_GIVEN,
 	APIConnectionError,
@@ -17,6 +18,7 @@ from pydantic import BaseModel
 
 from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
 from browser_use.llm.aws.chat_bedrock import ChatAWSBedrock
+from browser_use.llm.client_pool import ClientCloser, ClientPool, create_http_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
@@ -58,6 +60,9 @@ class ChatAnthropicBedrock(ChatAWSBedrock):
 	max_retries: int = 10
 	default_headers: Mapping[str, str] | None = None
 	default_query: Mapping[str, object] | None = None
+	http_limits: httpx.Limits | None = None  # Connection pool limits of the pooled client
+	http2: bool = False  # Use HTTP/2, needs `pip install httpx[http2]`
+	_client_pool: ClientPool[AsyncAnthropicBedrock] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	@property
 	def provider(self) -> str:
@@ -119,13 +124,21 @@ class ChatAnthropicBedrock(ChatAWSBedrock):
 
 	def get_client(self) -> AsyncAnthropicBedrock:
 		"""
-		Returns an AsyncAnthropicBedrock client.
+		Returns the AsyncAnthropicBedrock client of the running event loop, created on first use and reused after that.
 
 		Returns:
 			AsyncAnthropicBedrock: An instance of the AsyncAnthropicBedrock client.
 		"""
+		return self._client_pool.get(self._create_client)
+
+	def _create_client(self) -> tuple[AsyncAnthropicBedrock, ClientCloser]:
 		client_params = self._get_client_params()
-		return AsyncAnthropicBedrock(**client_params)
+		client = AsyncAnthropicBedrock(**client_params, http_client=create_http_client(self.http_limits, self.http2))
+		return client, client.close
+
+	async def aclose(self) -> None:
+		"""Close the pooled client of the running event loop, the next call creates a new one."""
+		await self._client_pool.aclose()
 
 	@property
 	def name(self) -> str:
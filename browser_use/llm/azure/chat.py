@@ -1,11 +1,11 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
-import httpx
 from openai import AsyncAzureOpenAI as AsyncAzureOpenAIClient
 from openai.types.shared import ChatModel
 
+from browser_use.llm.client_pool import ClientCloser, ClientPool, create_http_client
 from browser_use.llm.openai.like import ChatOpenAILike
 
 
@@ -35,6 +35,7 @@ class ChatAzureOpenAI(ChatOpenAILike):
 	default_query: dict[str, Any] | None = None
 
 	client: AsyncAzureOpenAIClient | None = None
+	_client_pool: ClientPool[AsyncAzureOpenAIClient] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	@property
 	def provider(self) -> str:
@@ -68,7 +69,7 @@ class ChatAzureOpenAI(ChatOpenAILike):
 
 	def get_client(self) -> AsyncAzureOpenAIClient:
 		"""
-		Returns an asynchronous OpenAI client.
+		Returns the asynchronous OpenAI client of the running event loop, created on first use and reused after that.
 
 		Returns:
 			AsyncAzureOpenAIClient: An instance of the asynchronous OpenAI client.
@@ -76,16 +77,13 @@ class ChatAzureOpenAI(ChatOpenAILike):
 		if self.client:
 			return self.client
 
-		_client_params: dict[str, Any] = self._get_client_params()
-
-		if self.http_client:
-			_client_params['http_client'] = self.http_client
-		else:
-			# Create a new async HTTP client with custom limits
-			_client_params['http_client'] = httpx.AsyncClient(
-				limits=httpx.Limits(max_connections=20, max_keepalive_connections=6)
-			)
+		return self._client_pool.get(self._create_client)
 
-		self.client = AsyncAzureOpenAIClient(**_client_params)
+	def _create_client(self) -> tuple[AsyncAzureOpenAIClient, ClientCloser]:
+		_client_params: dict[str, Any] = self._get_client_params()
+		if 'http_client' in _client_params:
+			return AsyncAzureOpenAIClient(**_client_params), None
 
-		return self.client
+		_client_params['http_client'] = create_http_client(self.http_limits, self.http2)
+		client = AsyncAzureOpenAIClient(**_client_params)
+		return client, client.close
@@ -0,0 +1,78 @@
+"""
+Long-lived SDK clients for the chat models, so consecutive LLM calls reuse their HTTP connections.
+"""
+
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+import httpx
+
+ClientT = TypeVar('ClientT')
+
+# Closes the resources a pooled client owns, None for clients built on an HTTP client passed in by the user
+ClientCloser = Callable[[], Awaitable[Any]] | None
+
+DEFAULT_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
+
+def create_http_client(limits: httpx.Limits | None = None, http2: bool = False) -> httpx.AsyncClient:
+	"""
+	Create the HTTP client for a pooled SDK client.
+
+	Args:
+		limits: Connection pool limits and keep-alive expiry, `DEFAULT_HTTP_LIMITS` if None
+		http2: Negotiate HTTP/2, which needs the optional `h2` package (`pip install httpx[http2]`)
+
+	Returns:
+		An httpx.AsyncClient that follows redirects like the SDKs' default clients. The SDKs pass their
+		own timeouts with every request.
+	"""
+	return httpx.AsyncClient(limits=limits or DEFAULT_HTTP_LIMITS, http2=http2, follow_redirects=True)
+
+
+class ClientPool(Generic[ClientT]):
+	"""
+	The SDK clients of a chat model, one per event loop, since HTTP connections can only be used from the loop
+	that opened them. Clients are created on first use.
+
+	Open connections refer to their loop, so the clients are keyed by the loop's id instead of weakly by the loop
+	itself, and the ones of closed loops are dropped on the next `get`. A closed loop can't run the client's close
+	anymore, so its sockets are only released by the garbage collector, `aclose()` before the loop ends closes them
+	right away.
+	"""
+
+	def __init__(self) -> None:
+		self._clients: dict[int, tuple[weakref.ref[asyncio.AbstractEventLoop], ClientT, ClientCloser]] = {}
+
+	def get(self, create: Callable[[], tuple[ClientT, ClientCloser]]) -> ClientT:
+		"""Get the client of the running event loop, calling `create` for a new one if there is none yet."""
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			# Outside of an event loop there are no connections to reuse
+			return create()[0]
+
+		entry = self._clients.get(id(loop))
+		if entry is None or entry[0]() is not loop:
+			self._drop_closed_loops()
+			client, close = create()
+			entry = self._clients[id(loop)] = (weakref.ref(loop), client, close)
+		return entry[1]
+
+	async def aclose(self) -> None:
+		"""Close the client of the running event loop, the next `get` creates a new one."""
+		loop = asyncio.get_running_loop()
+		entry = self._clients.get(id(loop))
+		if entry is not None and entry[0]() is loop:
+			del self._clients[id(loop)]
+			if entry[2] is not None:
+				await entry[2]()
+
+	def _drop_closed_loops(self) -> None:
+		# a new loop can reuse the id of a collected one, whose entry is dropped here as well
+		for loop_id, (loop_ref, _, _) in list(self._clients.items()):
+			loop = loop_ref()
+			if loop is None or loop.is_closed():
+				del self._clients[loop_id]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, TypeVar, overload
 
 import httpx
@@ -16,10 +16,11 @@ from openai import (
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import ClientCloser, ClientPool, create_http_client
 from browser_use.llm.deepseek.serializer import DeepSeekMessageSerializer
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
-from browser_use.llm.schema import SchemaOptimizer
+from browser_use.llm.schema import SchemaOptimizer, remove_schema_title
 from browser_use.llm.views import ChatInvokeCompletion
 
 T = TypeVar('T', bound=BaseModel)
@@ -42,18 +43,28 @@ class ChatDeepSeek(BaseChatModel):
 	base_url: str | httpx.URL | None = 'https://api.deepseek.com/v1'
 	timeout: float | httpx.Timeout | None = None
 	client_params: dict[str, Any] | None = None
+	http_limits: httpx.Limits | None = None  # 连接池限制（未传入 http_client 时）
+	http2: bool = False  # 使用 HTTP/2，需要 `pip install httpx[http2]`
+	_client_pool: ClientPool[AsyncOpenAI] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	@property
 	def provider(self) -> str:
 		return 'deepseek'
 
 	def _client(self) -> AsyncOpenAI:
-		return AsyncOpenAI(
-			api_key=self.api_key,
-			base_url=self.base_url,
-			timeout=self.timeout,
-			**(self.client_params or {}),
-		)
+		return self._client_pool.get(self._create_client)
+
+	def _create_client(self) -> tuple[AsyncOpenAI, ClientCloser]:
+		client_params = dict(self.client_params or {})
+		owns_http_client = 'http_client' not in client_params
+		if owns_http_client:
+			client_params['http_client'] = create_http_client(self.http_limits, self.http2)
+		client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, timeout=self.timeout, **client_params)
+		return client, client.close if owns_http_client else None
+
+	async def aclose(self) -> None:
+		"""Close the pooled client of the running event loop, the next call creates a new one."""
+		await self._client_pool.aclose()
 
 	@property
 	def name(self) -> str:
@@ -138,8 +149,7 @@ class ChatDeepSeek(BaseChatModel):
 				tool_choice = None
 				if output_format is not None and hasattr(output_format, 'model_json_schema'):
 					tool_name = output_format.__name__
-					schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-					schema.pop('title', None)
+					schema = SchemaOptimizer.get_optimized_json_schema(output_format, 'untitled', remove_schema_title)
 					call_tools = [
 						{
 							'type': 'function',
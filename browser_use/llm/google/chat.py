@@ -1,5 +1,6 @@
+import copy
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Literal, TypeVar, overload
 
 from google import genai
@@ -9,6 +10,7 @@ from google.genai.types import MediaModality
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import ClientCloser, ClientPool
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.google.serializer import GoogleMessageSerializer
 from browser_use.llm.messages import BaseMessage
@@ -86,6 +88,7 @@ class ChatGoogle(BaseChatModel):
 	project: str | None = None
 	location: str | None = None
 	http_options: types.HttpOptions | types.HttpOptionsDict | None = None
+	_client_pool: ClientPool[genai.Client] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	# Static
 	@property
@@ -111,13 +114,23 @@ class ChatGoogle(BaseChatModel):
 
 	def get_client(self) -> genai.Client:
 		"""
-		Returns a genai.Client instance.
+		Returns the genai.Client instance of the running event loop, created on first use and reused after that.
+
+		Connection pool settings go into `http_options.async_client_args`.
 
 		Returns:
 			genai.Client: An instance of the Google genai client.
 		"""
+		return self._client_pool.get(self._create_client)
+
+	def _create_client(self) -> tuple[genai.Client, ClientCloser]:
+		# genai.Client has no public way to close its connections, they're released with the client
 		client_params = self._get_client_params()
-		return genai.Client(**client_params)
+		return genai.Client(**client_params), None
+
+	async def aclose(self) -> None:
+		"""Close the pooled client of the running event loop, the next call creates a new one."""
+		await self._client_pool.aclose()
 
 	@property
 	def name(self) -> str:
@@ -215,11 +228,10 @@ class ChatGoogle(BaseChatModel):
 			else:
 				# Return structured response
 				config['response_mime_type'] = 'application/json'
-				# Convert Pydantic model to Gemini-compatible schema
-				optimized_schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-				gemini_schema = self._fix_gemini_schema(optimized_schema)
-				config['response_schema'] = gemini_schema
+				# Convert Pydantic model to Gemini-compatible schema. The SDK rewrites the schema in place while converting it
+				# (nullable fields, property ordering), so it gets a copy of the shared cached one
+				gemini_schema = SchemaOptimizer.get_optimized_json_schema(output_format, 'gemini', self._fix_gemini_schema)
+				config['response_schema'] = copy.deepcopy(gemini_schema)
 
 				response = await self.get_client().aio.models.generate_content(
 					model=self.model,
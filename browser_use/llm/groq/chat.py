@@ -1,5 +1,5 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal, TypeVar, overload
 
 from groq import (
@@ -16,10 +16,11 @@ from groq.types.chat.completion_create_params import (
 	ResponseFormatResponseFormatJsonSchema,
 	ResponseFormatResponseFormatJsonSchemaJsonSchema,
 )
-from httpx import URL
+from httpx import URL, Limits
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel, ChatInvokeCompletion
+from browser_use.llm.client_pool import ClientCloser, ClientPool, create_http_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.groq.parser import try_parse_groq_failed_generation
 from browser_use.llm.groq.serializer import GroqMessageSerializer
@@ -72,9 +73,26 @@ class ChatGroq(BaseChatModel):
 	base_url: str | URL | None = None
 	timeout: float | Timeout | NotGiven | None = None
 	max_retries: int = 10  # Increase default retries for automation reliability
+	http_limits: Limits | None = None  # Connection pool limits of the pooled client
+	http2: bool = False  # Use HTTP/2, needs `pip install httpx[http2]`
+	_client_pool: ClientPool[AsyncGroq] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	def get_client(self) -> AsyncGroq:
-		return AsyncGroq(api_key=self.api_key, base_url=self.base_url, timeout=self.timeout, max_retries=self.max_retries)
+		return self._client_pool.get(self._create_client)
+
+	def _create_client(self) -> tuple[AsyncGroq, ClientCloser]:
+		client = AsyncGroq(
+			api_key=self.api_key,
+			base_url=self.base_url,
+			timeout=self.timeout,
+			max_retries=self.max_retries,
+			http_client=create_http_client(self.http_limits, self.http2),
+		)
+		return client, client.close
+
+	async def aclose(self) -> None:
+		"""Close the pooled client of the running event loop, the next call creates a new one."""
+		await self._client_pool.aclose()
 
 	@property
 	def provider(self) -> str:
@@ -164,7 +182,7 @@ class ChatGroq(BaseChatModel):
 
 	async def _invoke_structured_output(self, groq_messages, output_format: type[T]) -> ChatInvokeCompletion[T]:
 		"""Handle structured output using either tool calling or JSON schema."""
-		schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+		schema = SchemaOptimizer.get_optimized_json_schema(output_format)
 
 		if self.model in ToolCallingModels:
 			response = await self._invoke_with_tool_calling(groq_messages, output_format, schema)
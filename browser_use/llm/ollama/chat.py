@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, TypeVar, overload
 
 import httpx
@@ -6,6 +6,7 @@ from ollama import AsyncClient as OllamaAsyncClient
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import DEFAULT_HTTP_LIMITS, ClientCloser, ClientPool
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.ollama.serializer import OllamaMessageSerializer
@@ -30,6 +31,9 @@ class ChatOllama(BaseChatModel):
 	host: str | None = None
 	timeout: float | httpx.Timeout | None = None
 	client_params: dict[str, Any] | None = None
+	http_limits: httpx.Limits | None = None  # Connection pool limits of the pooled client
+	http2: bool = False  # Use HTTP/2, needs `pip install httpx[http2]`
+	_client_pool: ClientPool[OllamaAsyncClient] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	# Static
 	@property
@@ -46,9 +50,19 @@ class ChatOllama(BaseChatModel):
 
 	def get_client(self) -> OllamaAsyncClient:
 		"""
-		Returns an OllamaAsyncClient client.
+		Returns the OllamaAsyncClient client of the running event loop, created on first use and reused after that.
 		"""
-		return OllamaAsyncClient(host=self.host, timeout=self.timeout, **self.client_params or {})
+		return self._client_pool.get(self._create_client)
+
+	def _create_client(self) -> tuple[OllamaAsyncClient, ClientCloser]:
+		# Ollama passes the extra client params on to its httpx.AsyncClient
+		client_params = {'limits': self.http_limits or DEFAULT_HTTP_LIMITS, 'http2': self.http2, **(self.client_params or {})}
+		client = OllamaAsyncClient(host=self.host, timeout=self.timeout, **client_params)
+		return client, client.close
+
+	async def aclose(self) -> None:
+		"""Close the pooled client of the running event loop, the next call creates a new one."""
+		await self._client_pool.aclose()
 
 	@property
 	def name(self) -> str:
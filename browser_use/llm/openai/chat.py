@@ -1,5 +1,5 @@
 from collections.abc import Iterable, Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Literal, TypeVar, overload
 
 import httpx
@@ -12,6 +12,7 @@ from openai.types.shared_params.response_format_json_schema import JSONSchema, R
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import ClientCloser, ClientPool, create_http_client
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openai.serializer import OpenAIMessageSerializer
@@ -65,8 +66,11 @@ class ChatOpenAI(BaseChatModel):
 	default_headers: Mapping[str, str] | None = None
 	default_query: Mapping[str, object] | None = None
 	http_client: httpx.AsyncClient | None = None
+	http_limits: httpx.Limits | None = None  # Connection pool limits when no http_client is given
+	http2: bool = False  # Use HTTP/2 when no http_client is given, needs `pip install httpx[http2]`
 	_strict_response_validation: bool = False
 	max_completion_tokens: int | None = 4096
+	_client_pool: ClientPool[AsyncOpenAI] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	# Static
 	@property
@@ -100,13 +104,23 @@ class ChatOpenAI(BaseChatModel):
 
 	def get_client(self) -> AsyncOpenAI:
 		"""
-		Returns an AsyncOpenAI client.
+		Returns the AsyncOpenAI client of the running event loop, created on first use and reused after that.
 
 		Returns:
 			AsyncOpenAI: An instance of the AsyncOpenAI client.
 		"""
+		return self._client_pool.get(self._create_client)
+
+	def _create_client(self) -> tuple[AsyncOpenAI, ClientCloser]:
 		client_params = self._get_client_params()
-		return AsyncOpenAI(**client_params)
+		if 'http_client' in client_params:
+			return AsyncOpenAI(**client_params), None
+		client = AsyncOpenAI(**client_params, http_client=create_http_client(self.http_limits, self.http2))
+		return client, client.close
+
+	async def aclose(self) -> None:
+		"""Close the pooled client of the running event loop, the next call creates a new one."""
+		await self._client_pool.aclose()
 
 	@property
 	def name(self) -> str:
@@ -203,7 +217,7 @@ class ChatOpenAI(BaseChatModel):
 				response_format: JSONSchema = {
 					'name': 'agent_output',
 					'strict': True,
-					'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
+					'schema': SchemaOptimizer.get_optimized_json_schema(output_format),
 				}
 
 				# Add JSON schema to system prompt if requested
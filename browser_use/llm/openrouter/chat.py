@@ -1,5 +1,5 @@
 from collections.abc import Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, TypeVar, overload
 
 import httpx
@@ -12,6 +12,7 @@ from openai.types.shared_params.response_format_json_schema import (
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import ClientCloser, ClientPool, create_http_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openrouter.serializer import OpenRouterMessageSerializer
@@ -47,7 +48,10 @@ class ChatOpenRouter(BaseChatModel):
 	default_headers: Mapping[str, str] | None = None
 	default_query: Mapping[str, object] | None = None
 	http_client: httpx.AsyncClient | None = None
+	http_limits: httpx.Limits | None = None  # Connection pool limits when no http_client is given
+	http2: bool = False  # Use HTTP/2 when no http_client is given, needs `pip install httpx[http2]`
 	_strict_response_validation: bool = False
+	_client_pool: ClientPool[AsyncOpenAI] = field(default_factory=ClientPool, init=False, repr=False, compare=False)
 
 	# Static
 	@property
@@ -80,15 +84,23 @@ class ChatOpenRouter(BaseChatModel):
 
 	def get_client(self) -> AsyncOpenAI:
 		"""
-		Returns an AsyncOpenAI client configured for OpenRouter.
+		Returns the AsyncOpenAI client configured for OpenRouter of the running event loop, created on first use.
 
 		Returns:
 		    AsyncOpenAI: An instance of the AsyncOpenAI client with OpenRouter base URL.
 		"""
-		if not hasattr(self, '_client'):
-			client_params = self._get_client_params()
-			self._client = AsyncOpenAI(**client_params)
-		return self._client
+		return self._client_pool.get(self._create_client)
+
+	def _create_client(self) -> tuple[AsyncOpenAI, ClientCloser]:
+		client_params = self._get_client_params()
+		if 'http_client' in client_params:
+			return AsyncOpenAI(**client_params), None
+		client = AsyncOpenAI(**client_params, http_client=create_http_client(self.http_limits, self.http2))
+		return client, client.close
+
+	async def aclose(self) -> None:
+		"""Close the pooled client of the running event loop, the next call creates a new one."""
+		await self._client_pool.aclose()
 
 	@property
 	def name(self) -> str:
@@ -158,7 +170,7 @@ class ChatOpenRouter(BaseChatModel):
 
 			else:
 				# Create a JSON schema for structured output
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+				schema = SchemaOptimizer.get_optimized_json_schema(output_format)
 
 				response_format_schema: JSONSchema = {
 					'name': 'agent_output',
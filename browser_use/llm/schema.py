@@ -2,12 +2,58 @@
 Utilities for creating optimized Pydantic schemas for LLM usage.
 """
 
+import weakref
+from collections.abc import Callable
 from typing import Any
 
 from pydantic import BaseModel
 
+SCHEMA_CACHE_SIZE = 64
+
+
+def remove_schema_title(schema: dict[str, Any]) -> dict[str, Any]:
+	"""Transform for the 'untitled' schema flavour, for tool parameters of providers that reject a top level title"""
+	schema.pop('title', None)
+	return schema
+
 
 class SchemaOptimizer:
+	# Optimized schemas by model class and provider flavour. The model classes are weak references so the cache doesn't
+	# keep the output models of finished agents alive, and at most SCHEMA_CACHE_SIZE classes are kept, dropping the
+	# oldest first.
+	_cache: weakref.WeakKeyDictionary[type[BaseModel], dict[str, dict[str, Any]]] = weakref.WeakKeyDictionary()
+
+	@staticmethod
+	def get_optimized_json_schema(
+		model: type[BaseModel],
+		flavour: str = 'strict',
+		transform: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+	) -> dict[str, Any]:
+		"""
+		Cached `create_optimized_json_schema`, so every request for the same output model sends the same schema.
+
+		Args:
+			model: The Pydantic model to optimize
+			flavour: Name of the provider specific variant of the schema, the cache key together with `model`
+			transform: Turns the optimized schema into the `flavour` variant, only called on a cache miss
+
+		Returns:
+			The shared cached schema, which must not be modified. SDKs that rewrite the schema in place need a copy.
+		"""
+		cache = SchemaOptimizer._cache
+		flavours = cache.get(model)
+		if flavours is None:
+			while len(cache) >= SCHEMA_CACHE_SIZE:
+				del cache[next(iter(cache))]
+			flavours = cache[model] = {}
+
+		if flavour not in flavours:
+			schema = SchemaOptimizer.create_optimized_json_schema(model)
+			if transform is not None:
+				schema = transform(schema)
+			flavours[flavour] = schema
+		return flavours[flavour]
+
 	@staticmethod
 	def create_optimized_json_schema(model: type[BaseModel]) -> dict[str, Any]:
 		"""
@@ -95,7 +95,11 @@ def create_mock_state_message(temp_dir: str):
 	)
 
 	# Override the clickable_elements_to_string method to return our simple element
-	dom_state.llm_representation = lambda include_attributes=None: '[1]<button id="test-button">Click Me</button>'
+	dom_state.llm_representation_within_budget = lambda max_length, include_attributes=None: (
+		'[1]<button id="test-button">Click Me</button>',
+		False,
+		0,
+	)
 
 	# Get the formatted message
 	message = agent_prompt.get_user_message(use_vision=False)
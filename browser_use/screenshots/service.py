@@ -7,6 +7,25 @@ from pathlib import Path
 
 import anyio
 
+from browser_use.llm.messages import SupportedImageMediaType
+
+# base64 prefixes of the png, jpeg and webp file signatures, see BrowserProfile.screenshot_format
+_MEDIA_TYPES_BY_PREFIX: dict[str, SupportedImageMediaType] = {
+	'iVBORw0KGgo': 'image/png',
+	'/9j/': 'image/jpeg',
+	'UklGR': 'image/webp',
+}
+_EXTENSIONS: dict[SupportedImageMediaType, str] = {'image/png': 'png', 'image/jpeg': 'jpg', 'image/webp': 'webp'}
+
+
+def get_screenshot_media_type(screenshot: str | bytes) -> SupportedImageMediaType:
+	"""Media type of a base64 encoded (or raw) screenshot, png if it isn't recognized."""
+	prefix = base64.b64encode(screenshot[:12]).decode() if isinstance(screenshot, bytes) else screenshot[:16]
+	for signature, media_type in _MEDIA_TYPES_BY_PREFIX.items():
+		if prefix.startswith(signature):
+			return media_type
+	return 'image/png'
+
 
 class ScreenshotService:
 	"""Simple screenshot storage service that saves screenshots to disk"""
@@ -19,13 +38,14 @@ class ScreenshotService:
 		self.screenshots_dir = self.agent_directory / 'screenshots'
 		self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
-	async def store_screenshot(self, screenshot_b64: str, step_number: int) -> str:
-		"""Store screenshot to disk and return the full path as string"""
-		screenshot_filename = f'step_{step_number}.png'
+	async def store_screenshot(self, screenshot: str | bytes, step_number: int) -> str:
+		"""Store a base64 encoded or raw screenshot to disk and return the full path as string"""
+		extension = _EXTENSIONS.get(get_screenshot_media_type(screenshot), 'png')
+		screenshot_filename = f'step_{step_number}.{extension}'
 		screenshot_path = self.screenshots_dir / screenshot_filename
 
-		# Decode base64 and save to disk
-		screenshot_data = base64.b64decode(screenshot_b64)
+		# Raw bytes are written as they are, base64 is decoded first
+		screenshot_data = screenshot if isinstance(screenshot, bytes) else base64.b64decode(screenshot)
 
 		async with await anyio.open_file(screenshot_path, 'wb') as f:
 			await f.write(screenshot_data)
@@ -0,0 +1,100 @@
+"""
+Tests for prefetching the next step's browser state in the background (`prefetch_browser_state`).
+
+BrowserSession.get_browser_state_summary is faked, so no browser is needed.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use import Agent
+from browser_use.agent.views import ActionResult
+from browser_use.browser import BrowserProfile, BrowserSession
+from tests.ci.conftest import create_mock_llm
+
+
+@pytest.fixture
+def state_requests(monkeypatch):
+	state_requests = []
+
+	async def get_browser_state_summary(self, **kwargs):
+		state_requests.append(kwargs)
+		await asyncio.sleep(0.1)
+		return None
+
+	monkeypatch.setattr(BrowserSession, 'get_browser_state_summary', get_browser_state_summary)
+	return state_requests
+
+
+def make_agent(**kwargs) -> Agent:
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(headless=True, user_data_dir=None, reuse_unchanged_page_state=True)
+	)
+	agent = Agent(task='Test task', llm=create_mock_llm(), browser_session=browser_session, **kwargs)
+	agent.state.last_result = [ActionResult(extracted_content='clicked')]
+	return agent
+
+
+async def test_next_state_is_captured_in_the_background(state_requests):
+	agent = make_agent(prefetch_browser_state=True)
+
+	agent._start_browser_state_prefetch()
+	agent._start_browser_state_prefetch()  # only one prefetch runs at a time
+	assert agent._browser_state_prefetch is not None
+
+	await agent._wait_for_browser_state_prefetch()
+	assert agent._browser_state_prefetch is None
+	assert len(state_requests) == 1 and state_requests[0]['include_screenshot'] is True
+
+
+async def test_no_prefetch_when_disabled_or_done(state_requests):
+	agent = make_agent()
+	agent._start_browser_state_prefetch()
+	assert agent._browser_state_prefetch is None
+
+	agent = make_agent(prefetch_browser_state=True)
+	agent.state.last_result = [ActionResult(is_done=True, extracted_content='finished')]
+	agent._start_browser_state_prefetch()
+	assert agent._browser_state_prefetch is None
+
+
+async def test_close_cancels_a_running_prefetch(state_requests):
+	agent = make_agent(prefetch_browser_state=True)
+	agent._start_browser_state_prefetch()
+	prefetch = agent._browser_state_prefetch
+
+	await agent._cancel_browser_state_prefetch()
+	assert prefetch is not None and prefetch.cancelled()
+
+
+async def test_failed_steps_cancel_the_prefetch(state_requests, monkeypatch):
+	agent = make_agent(prefetch_browser_state=True)
+	prefetches = []
+	start_browser_state_prefetch = Agent._start_browser_state_prefetch
+
+	def start_and_record(self):
+		start_browser_state_prefetch(self)
+		prefetches.append(self._browser_state_prefetch)
+
+	async def prepare_context(self, step_info=None):
+		return None
+
+	async def do_nothing(self, *args):
+		pass
+
+	async def post_process(self):
+		raise RuntimeError('post processing failed')
+
+	monkeypatch.setattr(Agent, '_start_browser_state_prefetch', start_and_record)
+	monkeypatch.setattr(Agent, '_prepare_context', prepare_context)
+	monkeypatch.setattr(Agent, '_get_next_action', do_nothing)
+	monkeypatch.setattr(Agent, '_execute_actions', do_nothing)
+	monkeypatch.setattr(Agent, '_post_process', post_process)
+	monkeypatch.setattr(Agent, '_finalize', do_nothing)
+
+	await agent.step()
+
+	assert len(prefetches) == 1 and prefetches[0].cancelled()
+	assert agent._browser_state_prefetch is None
+	assert agent.state.last_result and 'post processing failed' in (agent.state.last_result[0].error or '')
@@ -0,0 +1,108 @@
+"""
+Tests for LazyDomainCDPClient, the root client that multiplexes all target sessions and enables domains on first use.
+
+Commands go to a fake WebSocket that answers every message right away, so no browser is needed.
+"""
+
+import asyncio
+import json
+
+from browser_use.browser.lazy_cdp_client import LazyDomainCDPClient
+from browser_use.browser.session import CDPSession
+
+
+class FakeWebSocket:
+	def __init__(self, client: LazyDomainCDPClient):
+		self.client = client
+		self.sent: list[tuple[str, str | None]] = []
+		self.failing: set[str] = set()  # methods answered with an error
+
+	async def send(self, data: str) -> None:
+		message = json.loads(data)
+		self.sent.append((message['method'], message.get('sessionId')))
+		future = self.client.pending_requests.pop(message['id'])
+		if message['method'] in self.failing:
+			asyncio.get_running_loop().call_soon(future.set_exception, RuntimeError({'message': 'Not allowed'}))
+			return
+		result = {'sessionId': 'session-1'} if message['method'] == 'Target.attachToTarget' else {}
+		asyncio.get_running_loop().call_soon(future.set_result, result)
+
+
+def make_client() -> tuple[LazyDomainCDPClient, FakeWebSocket]:
+	client = LazyDomainCDPClient('ws://localhost:9222/devtools/browser/fake')
+	websocket = FakeWebSocket(client)
+	client.ws = websocket  # type: ignore[assignment]
+	return client, websocket
+
+
+async def test_domains_are_enabled_once_before_their_first_command():
+	client, websocket = make_client()
+	client.enable_lazily('session-1', ['Page', 'DOM', 'Runtime'])
+
+	await asyncio.gather(
+		client.send.DOM.getDocument(params={'depth': -1}, session_id='session-1'),
+		client.send.DOM.getDocument(params={'depth': -1}, session_id='session-1'),
+	)
+	await client.send.Runtime.evaluate(params={'expression': '1'}, session_id='session-1')
+	await client.send.Page.enable(session_id='session-1')  # an explicit enable isn't sent twice
+	await client.send.Page.navigate(params={'url': 'about:blank'}, session_id='session-1')
+	await client.send.DOM.getDocument(session_id='other-session')  # eagerly attached sessions are left alone
+
+	assert websocket.sent == [
+		('DOM.enable', 'session-1'),
+		('DOM.getDocument', 'session-1'),
+		('DOM.getDocument', 'session-1'),
+		('Runtime.enable', 'session-1'),
+		('Runtime.evaluate', 'session-1'),
+		('Page.enable', 'session-1'),
+		('Page.navigate', 'session-1'),
+		('DOM.getDocument', 'other-session'),
+	]
+
+
+async def test_attaching_a_multiplexed_session_is_a_single_round_trip():
+	client, websocket = make_client()
+	target_info = {'targetId': 'target-1', 'type': 'page', 'title': 'Example', 'url': 'https://example.com', 'attached': True}
+
+	cdp_session = await CDPSession.for_target(client, 'target-1', target_info=target_info)  # type: ignore[arg-type]
+
+	assert (cdp_session.session_id, cdp_session.title, cdp_session.url) == ('session-1', 'Example', 'https://example.com')
+	assert cdp_session.cdp_client is client and not cdp_session.owns_cdp_client
+	assert websocket.sent == [('Target.attachToTarget', None)]
+
+	await client.send.Accessibility.getFullAXTree(session_id='session-1')
+	assert websocket.sent[1:] == [('Accessibility.enable', 'session-1'), ('Accessibility.getFullAXTree', 'session-1')]
+
+
+async def test_failed_lazy_enables_are_retried_by_the_next_command():
+	client, websocket = make_client()
+	client.enable_lazily('session-1', ['DOM'])
+	websocket.failing.add('DOM.enable')
+
+	await client.send.DOM.getDocument(session_id='session-1')
+	assert client._enabling == {}
+
+	websocket.failing.clear()
+	await client.send.DOM.getDocument(session_id='session-1')
+	await client.send.DOM.getDocument(session_id='session-1')
+
+	assert websocket.sent == [
+		('DOM.enable', 'session-1'),
+		('DOM.getDocument', 'session-1'),
+		('DOM.enable', 'session-1'),
+		('DOM.getDocument', 'session-1'),
+		('DOM.getDocument', 'session-1'),
+	]
+
+
+async def test_detached_sessions_are_forgotten_without_taking_the_event_handler():
+	client, _ = make_client()
+	client.enable_lazily('session-1', ['Page', 'DOM'])
+	client.enable_lazily('session-2', ['Page', 'DOM'])
+	detached = []
+	client.register.Target.detachedFromTarget(lambda event, session_id=None: detached.append(event['sessionId']))
+
+	await client._event_registry.handle_event('Target.detachedFromTarget', {'sessionId': 'session-1', 'targetId': 'target-1'})
+
+	assert list(client._lazy_domains) == ['session-2']
+	assert detached == ['session-1']
@@ -0,0 +1,137 @@
+"""
+Tests for FrameTreeCache, the per-target Page.getFrameTree cache behind BrowserSession.get_all_frames.
+
+Frame events are shaped like real CDP payloads and dispatched through cdp_use's EventRegistry, so no browser is needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from cdp_use.cdp.registry import EventRegistry
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.frame_tree import FrameTreeCache
+from browser_use.browser.session import CDPSession
+
+
+def frame(frame_id: str, url: str, parent_id: str | None = None) -> dict:
+	result = {'id': frame_id, 'loaderId': f'loader-{frame_id}', 'url': url, 'securityOrigin': url, 'mimeType': 'text/html'}
+	if parent_id:
+		result['parentId'] = parent_id
+	return result
+
+
+def initial_frame_tree() -> dict:
+	return {
+		'frame': frame('main', 'https://example.com'),
+		'childFrames': [
+			{'frame': frame('ad', 'https://example.com/ad', 'main')},
+			{'frame': frame('widget', 'https://example.com/widget', 'main')},
+		],
+	}
+
+
+def make_cdp_session(frame_tree: dict, target_id: str = 'target-1', session_id: str = 'session-1'):
+	registry = EventRegistry()
+	calls: list[str] = []
+	release_response = asyncio.Event()
+	release_response.set()
+
+	async def get_frame_tree(params=None, session_id=None):
+		calls.append('getFrameTree')
+		await release_response.wait()
+		return {'frameTree': frame_tree}
+
+	cdp_client = SimpleNamespace(
+		_event_registry=registry, send=SimpleNamespace(Page=SimpleNamespace(getFrameTree=get_frame_tree))
+	)
+	cdp_session = CDPSession.model_construct(cdp_client=cdp_client, target_id=target_id, session_id=session_id)
+	return cdp_session, registry, calls, release_response
+
+
+def frame_ids(node: dict) -> list[str]:
+	return [node['frame']['id'], *(frame_id for child in node.get('childFrames', []) for frame_id in frame_ids(child))]
+
+
+async def test_frame_tree_is_fetched_once_and_follows_frame_events():
+	cdp_session, registry, calls, _ = make_cdp_session(initial_frame_tree())
+	cache = FrameTreeCache()
+
+	assert frame_ids(await cache.get_frame_tree(cdp_session)) == ['main', 'ad', 'widget']
+
+	await registry.handle_event('Page.frameAttached', {'frameId': 'nested', 'parentFrameId': 'widget'}, 'session-1')
+	await registry.handle_event('Page.frameDetached', {'frameId': 'ad', 'reason': 'remove'}, 'session-1')
+	await registry.handle_event(
+		'Page.frameNavigated', {'frame': frame('nested', 'https://other.com/embed', 'widget'), 'type': 'Navigation'}, 'session-1'
+	)
+	await registry.handle_event(
+		'Page.frameAttached', {'frameId': 'other-tab-frame', 'parentFrameId': 'x'}, 'session-of-another-target'
+	)
+
+	frame_tree = await cache.get_frame_tree(cdp_session)
+	assert frame_ids(frame_tree) == ['main', 'widget', 'nested']
+	assert frame_tree['childFrames'][0]['childFrames'][0]['frame']['url'] == 'https://other.com/embed'
+	assert calls == ['getFrameTree']
+
+	# a new root frame can't be applied incrementally, the tree is fetched again
+	await registry.handle_event(
+		'Page.frameNavigated', {'frame': frame('new-main', 'https://example.org'), 'type': 'Navigation'}, 'session-1'
+	)
+	assert 'target-1' not in cache
+	await cache.get_frame_tree(cdp_session)
+	assert calls == ['getFrameTree', 'getFrameTree']
+
+	cache.clear()
+	assert registry.get_registered_methods() == []
+
+
+async def test_tree_fetched_while_frames_change_is_not_cached():
+	cdp_session, registry, calls, release_response = make_cdp_session(initial_frame_tree())
+	cache = FrameTreeCache()
+
+	release_response.clear()
+	fetching = asyncio.create_task(cache.get_frame_tree(cdp_session))
+	await asyncio.sleep(0)
+	await registry.handle_event('Page.frameDetached', {'frameId': 'ad', 'reason': 'remove'}, 'session-1')
+	release_response.set()
+	await fetching
+
+	assert 'target-1' not in cache
+	await cache.get_frame_tree(cdp_session)
+	assert calls == ['getFrameTree', 'getFrameTree']
+	assert 'target-1' in cache
+
+
+async def test_get_all_frames_is_rebuilt_only_when_frames_change():
+	cdp_session, registry, calls, _ = make_cdp_session(initial_frame_tree())
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, cross_origin_iframes=False))
+	session.agent_focus = cdp_session
+	session._cdp_client_root = cdp_session.cdp_client  # type: ignore[assignment]
+
+	async def get_all_pages(**kwargs):
+		return [{'targetId': 'target-1', 'type': 'page', 'url': 'https://example.com', 'title': 'Example'}]
+
+	session._cdp_get_all_pages = get_all_pages  # type: ignore[method-assign]
+
+	all_frames, target_sessions = await session.get_all_frames()
+	assert set(all_frames) == {'main', 'ad', 'widget'}
+	assert all_frames['main']['childFrameIds'] == ['ad', 'widget']
+	assert target_sessions == {'target-1': 'session-1'}
+	assert (await session.get_all_frames())[0] == all_frames
+	assert calls == ['getFrameTree']
+
+	# callers get their own copy, changing it doesn't leak into the cached hierarchy or the frame tree cache
+	all_frames['main']['childFrameIds'].append('added-by-caller')
+	all_frames['main']['url'] = 'https://changed.example.com'
+	del all_frames['widget']
+	all_frames, _ = await session.get_all_frames()
+	assert all_frames['main']['childFrameIds'] == ['ad', 'widget']
+	assert all_frames['main']['url'] == 'https://example.com'
+	assert 'widget' in all_frames
+	assert calls == ['getFrameTree']
+
+	await registry.handle_event('Page.frameDetached', {'frameId': 'ad', 'reason': 'remove'}, 'session-1')
+	all_frames, _ = await session.get_all_frames()
+	assert set(all_frames) == {'main', 'widget'}
+	assert all_frames['main']['childFrameIds'] == ['widget']
+	assert calls == ['getFrameTree']
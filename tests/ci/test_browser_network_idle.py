@@ -0,0 +1,107 @@
+"""
+Tests for NetworkIdleTracker, the event-driven page stability wait of the DOM watchdog.
+
+Network and Page events are shaped like real CDP payloads and dispatched through cdp_use's EventRegistry, so no
+browser is needed.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from cdp_use.cdp.registry import EventRegistry
+
+from browser_use.browser.network_idle import NetworkIdleTracker
+
+
+async def make_tracker(ready_state: str = 'complete', long_request_timeout: float = 2.0):
+	registry = EventRegistry()
+
+	async def noop(params=None, session_id=None):
+		return {}
+
+	async def evaluate(params, session_id=None):
+		return {'result': {'type': 'string', 'value': ready_state}}
+
+	send = SimpleNamespace(
+		Network=SimpleNamespace(enable=noop, disable=noop),
+		Page=SimpleNamespace(setLifecycleEventsEnabled=noop),
+		Runtime=SimpleNamespace(evaluate=evaluate),
+	)
+	cdp_session = SimpleNamespace(
+		cdp_client=SimpleNamespace(_event_registry=registry, send=send), target_id='target-1', session_id='session-1'
+	)
+	tracker = NetworkIdleTracker(cdp_session, long_request_timeout=long_request_timeout)  # type: ignore[arg-type]
+	await tracker.start()
+	return tracker, registry
+
+
+async def request(registry: EventRegistry, request_id: str, url: str, resource_type: str = 'XHR', session_id='session-1'):
+	event = {'requestId': request_id, 'loaderId': 'loader-1', 'type': resource_type, 'request': {'url': url}}
+	await registry.handle_event('Network.requestWillBeSent', event, session_id)
+
+
+async def finish_later(registry: EventRegistry, request_id: str, delay: float):
+	await asyncio.sleep(delay)
+	await registry.handle_event('Network.loadingFinished', {'requestId': request_id}, 'session-1')
+
+
+async def timed_wait(tracker: NetworkIdleTracker, idle_time: float = 0.1, timeout: float = 2.0) -> tuple[bool, float]:
+	start = time.monotonic()
+	is_idle = await tracker.wait_for_idle(idle_time=idle_time, timeout=timeout)
+	return is_idle, time.monotonic() - start
+
+
+async def test_idle_page_only_waits_for_the_quiet_window():
+	tracker, _ = await make_tracker()
+
+	is_idle, elapsed = await timed_wait(tracker, idle_time=0.1, timeout=2.0)
+
+	assert is_idle is True
+	assert 0.09 <= elapsed < 0.5
+
+
+async def test_waits_for_in_flight_requests_to_finish():
+	tracker, registry = await make_tracker()
+	await request(registry, 'r1', 'https://example.com/api/items')
+	await request(registry, 'r2', 'https://example.com/api/other', session_id='other-session')  # another tab
+	finishing = asyncio.create_task(finish_later(registry, 'r1', 0.3))
+
+	is_idle, elapsed = await timed_wait(tracker, idle_time=0.1)
+	await finishing
+
+	assert is_idle is True
+	assert 0.39 <= elapsed < 1.0
+
+
+async def test_analytics_websockets_and_long_polling_are_ignored():
+	tracker, registry = await make_tracker(long_request_timeout=0.3)
+	await request(registry, 'ws', 'wss://example.com/socket', resource_type='WebSocket')
+	await request(registry, 'ga', 'https://www.google-analytics.com/g/collect?v=2')
+	await request(registry, 'beacon', 'https://example.com/log', resource_type='Ping')
+	await request(registry, 'poll', 'https://example.com/long-poll')
+
+	is_idle, elapsed = await timed_wait(tracker, idle_time=0.1)
+
+	assert is_idle is True
+	assert tracker.in_flight_requests == 1  # the long-polling request is still open
+	assert 0.39 <= elapsed < 1.0  # stopped counting after 0.3s, quiet for 0.1s after that
+
+
+async def test_navigation_waits_for_dom_content_loaded_and_times_out():
+	tracker, registry = await make_tracker()
+	await registry.handle_event(
+		'Page.lifecycleEvent', {'frameId': 'target-1', 'loaderId': 'loader-2', 'name': 'init'}, 'session-1'
+	)
+
+	is_idle, elapsed = await timed_wait(tracker, idle_time=0.05, timeout=0.3)
+	assert is_idle is False
+	assert 0.29 <= elapsed < 0.6
+
+	await registry.handle_event(
+		'Page.lifecycleEvent', {'frameId': 'target-1', 'loaderId': 'loader-2', 'name': 'DOMContentLoaded'}, 'session-1'
+	)
+	assert (await timed_wait(tracker, idle_time=0.05))[0] is True
+
+	await tracker.stop()
+	assert registry.get_registered_methods() == []
@@ -0,0 +1,171 @@
+"""
+Tests for reusing the previous browser state when the page fingerprint didn't change (`reuse_unchanged_page_state`).
+
+The page, its DOM build and its fingerprint are faked on DOMWatchdog and BrowserSession, except for the test of the
+fingerprint script itself, which runs in the real browser of the `browser_session` fixture.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.events import BrowserStateRequestEvent, NavigateToUrlEvent
+from browser_use.browser.page_fingerprint import PageFingerprint, get_page_fingerprint
+from browser_use.browser.session import CDPSession
+from browser_use.browser.views import PageInfo, TabInfo
+from browser_use.browser.watchdogs import dom_watchdog
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.dom.views import SerializedDOMState
+
+
+def fingerprint(changes: int = 0, scroll_y: float = 0.0) -> PageFingerprint:
+	return PageFingerprint(
+		target_id='target-1',
+		url='https://example.com',
+		document='doc-1',
+		changes=changes,
+		scroll_x=0.0,
+		scroll_y=scroll_y,
+		viewport_width=1280,
+		viewport_height=720,
+		device_pixel_ratio=1.0,
+	)
+
+
+@pytest.fixture
+def page(monkeypatch):
+	page = SimpleNamespace(fingerprint=fingerprint(), builds=0)
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, reuse_unchanged_page_state=True))
+	session.agent_focus = CDPSession.model_construct(cdp_client=None, target_id='target-1', session_id='session-1')
+	watchdog = DOMWatchdog(event_bus=session.event_bus, browser_session=session)
+
+	async def get_current_page_url(self):
+		return 'https://example.com'
+
+	async def get_current_page_title(self):
+		return 'Example'
+
+	async def get_tabs(self):
+		return [TabInfo(url='https://example.com', title='Example', target_id='target-1')]
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True, new_socket=None):
+		return self.agent_focus
+
+	async def wait_for_stable_network(self):
+		pass
+
+	async def get_page_fingerprint(cdp_session, page_url):
+		return page.fingerprint
+
+	async def build_dom_tree(self, previous_state=None):
+		page.builds += 1
+		self.current_dom_state = SerializedDOMState(_root=None, selector_map={})
+		return self.current_dom_state
+
+	async def get_page_info(self):
+		return PageInfo(
+			viewport_width=1280,
+			viewport_height=720,
+			page_width=1280,
+			page_height=720,
+			scroll_x=0,
+			scroll_y=0,
+			pixels_above=0,
+			pixels_below=0,
+			pixels_left=0,
+			pixels_right=0,
+		)
+
+	monkeypatch.setattr(BrowserSession, 'get_current_page_url', get_current_page_url)
+	monkeypatch.setattr(BrowserSession, 'get_current_page_title', get_current_page_title)
+	monkeypatch.setattr(BrowserSession, 'get_tabs', get_tabs)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+	monkeypatch.setattr(DOMWatchdog, '_wait_for_stable_network', wait_for_stable_network)
+	monkeypatch.setattr(dom_watchdog, 'get_page_fingerprint', get_page_fingerprint)
+	monkeypatch.setattr(DOMWatchdog, '_build_dom_tree', build_dom_tree)
+	monkeypatch.setattr(DOMWatchdog, '_get_page_info', get_page_info)
+
+	page.session, page.watchdog = session, watchdog
+	return page
+
+
+def request_state(page):
+	return page.watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent(include_screenshot=False))
+
+
+async def test_unchanged_page_reuses_the_previous_state(page):
+	first = await request_state(page)
+	second = await request_state(page)
+
+	assert page.builds == 1
+	assert second.dom_state is first.dom_state
+	assert page.watchdog.reused_state_count == 1
+
+
+async def test_reusing_unchanged_page_states_is_opt_in(page):
+	assert BrowserProfile().reuse_unchanged_page_state is False
+
+	page.session.browser_profile.reuse_unchanged_page_state = False
+	await request_state(page)
+	await request_state(page)
+
+	assert page.builds == 2
+	assert page.watchdog.reused_state_count == 0
+
+
+async def test_mutations_scrolling_and_cache_clears_rebuild_the_state(page):
+	await request_state(page)
+
+	page.fingerprint = fingerprint(changes=3)
+	await request_state(page)
+	assert page.builds == 2
+
+	page.fingerprint = fingerprint(changes=3, scroll_y=400.0)
+	await request_state(page)
+	assert page.builds == 3
+
+	page.watchdog.clear_cache()
+	await request_state(page)
+	assert page.builds == 4
+
+	# a cached state of another URL is never handed out, even with a matching fingerprint
+	page.session._cached_browser_state_summary.url = 'https://example.com/previous'
+	await request_state(page)
+	assert page.builds == 5
+
+	# pages that can't be fingerprinted are always rebuilt
+	page.fingerprint = None
+	await request_state(page)
+	await request_state(page)
+	assert page.builds == 7
+	assert page.watchdog.reused_state_count == 0
+
+
+async def test_scrolling_a_container_and_resizing_change_the_fingerprint(browser_session, httpserver: HTTPServer):
+	httpserver.expect_request('/container').respond_with_data(
+		'<div id="list" style="height: 100px; overflow: auto"><div style="height: 2000px">Rows</div></div>',
+		content_type='text/html',
+	)
+	await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=httpserver.url_for('/container')))
+	cdp_session = await browser_session.get_or_create_cdp_session()
+
+	async def evaluate(expression: str) -> None:
+		await cdp_session.cdp_client.send.Runtime.evaluate(
+			params={'expression': expression, 'awaitPromise': True}, session_id=cdp_session.session_id
+		)
+
+	before = await get_page_fingerprint(cdp_session, httpserver.url_for('/container'))
+	assert before is not None
+	assert await get_page_fingerprint(cdp_session, httpserver.url_for('/container')) == before
+
+	# the window doesn't scroll, only the container does
+	await evaluate("document.getElementById('list').scrollTop = 500; new Promise(r => requestAnimationFrame(r))")
+	scrolled = await get_page_fingerprint(cdp_session, httpserver.url_for('/container'))
+	assert scrolled is not None and scrolled.scroll_y == before.scroll_y
+	assert scrolled.changes > before.changes
+
+	await evaluate("window.dispatchEvent(new Event('resize'))")
+	resized = await get_page_fingerprint(cdp_session, httpserver.url_for('/container'))
+	assert resized is not None and resized.changes > scrolled.changes
@@ -0,0 +1,115 @@
+"""
+Tests for the profile screenshot settings (format, quality, max dimension, clip to viewport) and compressed screenshot storage.
+
+Page.getLayoutMetrics is a synthetic payload for a 1280x720 viewport at device pixel ratio 2, so no browser is needed,
+except for the full page capture, which runs in the real browser of the `browser_session` fixture.
+"""
+
+import base64
+import struct
+from pathlib import Path
+from types import SimpleNamespace
+
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.session import CDPSession
+from browser_use.browser.watchdogs.screenshot_watchdog import ScreenshotWatchdog
+from browser_use.screenshots.service import ScreenshotService, get_screenshot_media_type
+
+JPEG_BYTES = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01' + b'\x00' * 32
+
+
+def make_watchdog(**profile_kwargs) -> tuple[ScreenshotWatchdog, CDPSession]:
+	async def get_layout_metrics(params=None, session_id=None):
+		return {
+			'cssVisualViewport': {'pageX': 0.0, 'pageY': 300.0, 'clientWidth': 1280.0, 'clientHeight': 720.0},
+			'visualViewport': {'clientWidth': 2560.0, 'clientHeight': 1440.0},
+			'cssContentSize': {'x': 0.0, 'y': 0.0, 'width': 1280.0, 'height': 5000.0},
+		}
+
+	cdp_client = SimpleNamespace(send=SimpleNamespace(Page=SimpleNamespace(getLayoutMetrics=get_layout_metrics)))
+	cdp_session = CDPSession.model_construct(cdp_client=cdp_client, target_id='target-1', session_id='session-1')
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, **profile_kwargs))
+	return ScreenshotWatchdog(event_bus=session.event_bus, browser_session=session), cdp_session
+
+
+async def test_default_settings_capture_the_viewport_as_png():
+	watchdog, cdp_session = make_watchdog()
+	params = await watchdog._get_screenshot_params(cdp_session, full_page=False, clip=None)
+
+	assert params == {'format': 'png', 'captureBeyondViewport': False}
+
+
+async def test_compressed_downscaled_viewport_screenshot():
+	watchdog, cdp_session = make_watchdog(screenshot_format='jpeg', screenshot_quality=60, screenshot_max_dimension=1280)
+	params = await watchdog._get_screenshot_params(cdp_session, full_page=False, clip=None)
+
+	assert params['format'] == 'jpeg' and params['quality'] == 60 and params['optimizeForSpeed'] is True
+	# the visible 1280x720 CSS pixels come out at 2560x1440 device pixels, scaled down by half to 1280x720
+	assert params['clip'] == {'x': 0.0, 'y': 300.0, 'width': 1280.0, 'height': 720.0, 'scale': 0.5}
+
+
+async def test_full_page_screenshot_is_scaled_by_its_longest_side():
+	watchdog, cdp_session = make_watchdog(
+		screenshot_format='webp', screenshot_max_dimension=2000, screenshot_clip_to_viewport=False
+	)
+	params = await watchdog._get_screenshot_params(cdp_session, full_page=False, clip=None)
+
+	assert params['captureBeyondViewport'] is True
+	assert params['clip'] == {'x': 0, 'y': 0, 'width': 1280.0, 'height': 5000.0, 'scale': 0.2}
+
+
+async def test_full_page_screenshot_is_clipped_to_the_content_size():
+	watchdog, cdp_session = make_watchdog(screenshot_clip_to_viewport=False)
+	params = await watchdog._get_screenshot_params(cdp_session, full_page=False, clip=None)
+
+	# without a clip Chrome only returns the viewport, even with captureBeyondViewport
+	assert params == {
+		'format': 'png',
+		'captureBeyondViewport': True,
+		'clip': {'x': 0, 'y': 0, 'width': 1280.0, 'height': 5000.0, 'scale': 1.0},
+	}
+
+	watchdog, cdp_session = make_watchdog()
+	params = await watchdog._get_screenshot_params(cdp_session, full_page=True, clip=None)
+	assert params['clip'] == {'x': 0, 'y': 0, 'width': 1280.0, 'height': 5000.0, 'scale': 1.0}
+
+
+async def test_full_page_screenshot_covers_the_whole_page(browser_session, httpserver: HTTPServer):
+	httpserver.expect_request('/long').respond_with_data(
+		'<body style="margin: 0"><div style="height: 3000px; background: linear-gradient(red, blue)"></div></body>',
+		content_type='text/html',
+	)
+	await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=httpserver.url_for('/long')))
+	browser_session.browser_profile.screenshot_clip_to_viewport = False
+	cdp_session = await browser_session.get_or_create_cdp_session()
+	metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id)
+
+	assert browser_session._screenshot_watchdog is not None
+	screenshot = base64.b64decode(await browser_session._screenshot_watchdog.capture_screenshot())
+
+	# PNG width and height are the first fields of the IHDR chunk
+	width, height = struct.unpack('>II', screenshot[16:24])
+	device_pixel_ratio = metrics['visualViewport']['clientWidth'] / metrics['cssVisualViewport']['clientWidth']
+	assert (width, height) == (
+		round(metrics['cssContentSize']['width'] * device_pixel_ratio),
+		round(metrics['cssContentSize']['height'] * device_pixel_ratio),
+	)
+	assert height > metrics['cssVisualViewport']['clientHeight'] * device_pixel_ratio
+
+
+async def test_compressed_screenshots_are_stored_with_their_format(tmp_path: Path):
+	service = ScreenshotService(tmp_path)
+	jpeg_b64 = base64.b64encode(JPEG_BYTES).decode()
+
+	assert get_screenshot_media_type(jpeg_b64) == 'image/jpeg'
+	assert get_screenshot_media_type(JPEG_BYTES) == 'image/jpeg'
+
+	path = await service.store_screenshot(jpeg_b64, step_number=1)
+	assert Path(path).name == 'step_1.jpg' and await service.get_screenshot(path) == jpeg_b64
+
+	# raw bytes are written without a base64 round trip
+	path = await service.store_screenshot(JPEG_BYTES, step_number=2)
+	assert Path(path).name == 'step_2.jpg' and await service.get_screenshot(path) == jpeg_b64
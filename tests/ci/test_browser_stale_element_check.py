@@ -0,0 +1,125 @@
+"""
+Tests for the cheap stale element check that lets `Agent.multi_act` skip rebuilding the browser state between actions.
+
+The page, its DOM build, its fingerprint and DOM.describeNode are faked, so no browser is needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.events import BrowserStateRequestEvent
+from browser_use.browser.page_fingerprint import PageFingerprint
+from browser_use.browser.session import CDPSession
+from browser_use.browser.views import TabInfo
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.dom.views import SerializedDOMState
+
+
+def fingerprint(changes: int = 0) -> PageFingerprint:
+	return PageFingerprint(
+		target_id='target-1',
+		url='https://example.com',
+		document='doc-1',
+		changes=changes,
+		scroll_x=0.0,
+		scroll_y=0.0,
+		viewport_width=1280,
+		viewport_height=720,
+		device_pixel_ratio=1.0,
+	)
+
+
+@pytest.fixture
+def page(monkeypatch):
+	page = SimpleNamespace(fingerprint=fingerprint(), backend_node_ids={42})
+
+	async def describe_node(params=None, session_id=None):
+		if params['backendNodeId'] not in page.backend_node_ids:
+			raise RuntimeError('No node with given id found')
+		return {'node': {'backendNodeId': params['backendNodeId']}}
+
+	cdp_client = SimpleNamespace(send=SimpleNamespace(DOM=SimpleNamespace(describeNode=describe_node)))
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, reuse_unchanged_page_state=True))
+	session.agent_focus = CDPSession.model_construct(cdp_client=cdp_client, target_id='target-1', session_id='session-1')
+	watchdog = DOMWatchdog(event_bus=session.event_bus, browser_session=session)
+
+	async def get_current_page_url(self):
+		return 'https://example.com'
+
+	async def get_current_page_title(self):
+		return 'Example'
+
+	async def get_tabs(self):
+		return [TabInfo(url='https://example.com', title='Example', target_id='target-1')]
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True, new_socket=None):
+		return self.agent_focus
+
+	async def do_nothing(self, *args):
+		return None
+
+	async def get_page_fingerprint(self, page_url):
+		return page.fingerprint
+
+	async def build_dom_tree(self, previous_state=None):
+		self.current_dom_state = SerializedDOMState(_root=None, selector_map={})
+		return self.current_dom_state
+
+	monkeypatch.setattr(BrowserSession, 'get_current_page_url', get_current_page_url)
+	monkeypatch.setattr(BrowserSession, 'get_current_page_title', get_current_page_title)
+	monkeypatch.setattr(BrowserSession, 'get_tabs', get_tabs)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+	monkeypatch.setattr(DOMWatchdog, '_wait_for_stable_network', do_nothing)
+	monkeypatch.setattr(DOMWatchdog, '_get_page_info', do_nothing)
+	monkeypatch.setattr(DOMWatchdog, '_get_page_fingerprint', get_page_fingerprint)
+	monkeypatch.setattr(DOMWatchdog, '_build_dom_tree', build_dom_tree)
+
+	page.watchdog = watchdog
+	return page
+
+
+def element(backend_node_id: int) -> SimpleNamespace:
+	return SimpleNamespace(target_id='target-1', backend_node_id=backend_node_id)
+
+
+async def test_unchanged_page_keeps_cached_elements_valid(page):
+	await page.watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent(include_screenshot=False))
+
+	assert page.watchdog.last_state_time > 0
+	assert await page.watchdog.is_element_still_valid(element(42))
+	# elements that were removed from the page no longer resolve
+	assert not await page.watchdog.is_element_still_valid(element(7))
+
+
+async def test_page_changes_require_a_full_rebuild(page):
+	# nothing to compare against before the first browser state
+	assert not await page.watchdog.is_element_still_valid(element(42))
+
+	await page.watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent(include_screenshot=False))
+	page.fingerprint = fingerprint(changes=1)
+	assert not await page.watchdog.is_element_still_valid(element(42))
+
+	page.fingerprint = None
+	assert not await page.watchdog.is_element_still_valid(element(42))
+
+
+async def test_changes_after_the_network_settles_require_a_full_rebuild(page, monkeypatch):
+	await page.watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent(include_screenshot=False))
+
+	async def render_results():
+		# a click fetched results, they are rendered once the response arrives
+		await asyncio.sleep(0.05)
+		page.fingerprint = fingerprint(changes=1)
+
+	fetch = asyncio.create_task(render_results())
+
+	async def wait_for_stable_network(self):
+		await fetch
+
+	monkeypatch.setattr(DOMWatchdog, '_wait_for_stable_network', wait_for_stable_network)
+
+	assert not await page.watchdog.is_element_still_valid(element(42))
+	assert fetch.done()
@@ -0,0 +1,156 @@
+"""
+Tests for capturing the screenshot of a browser state request concurrently with the DOM.
+
+The DOM build and the screenshot are fakes that take 0.2s each, so no browser is needed.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.events import BrowserStateRequestEvent, ScreenshotEvent
+from browser_use.browser.session import CDPSession
+from browser_use.browser.views import TabInfo
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.browser.watchdogs.screenshot_watchdog import ScreenshotWatchdog
+from browser_use.dom.views import SerializedDOMState
+
+
+@pytest.fixture
+def captures() -> list[CDPSession]:
+	"""Sessions the fake ScreenshotWatchdog captured."""
+	return []
+
+
+@pytest.fixture
+def make_watchdog(monkeypatch, captures):
+	async def get_current_page_url(self):
+		return 'https://example.com'
+
+	async def get_current_page_title(self):
+		return 'Example'
+
+	async def get_tabs(self):
+		return [TabInfo(url='https://example.com', title='Example', target_id='target-1')]
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True, new_socket=None):
+		return self.agent_focus
+
+	async def remove_highlights(self):
+		pass
+
+	async def do_nothing(self, *args):
+		return None
+
+	async def build_dom_tree(self, previous_state=None):
+		await asyncio.sleep(0.2)
+		self.current_dom_state = SerializedDOMState(_root=None, selector_map={1: None})  # type: ignore[dict-item]
+		return self.current_dom_state
+
+	async def capture_screenshot(self, full_page=False, clip=None, cdp_session=None):
+		captures.append(cdp_session or self.browser_session.agent_focus)
+		await asyncio.sleep(0.2)
+		return 'c2NyZWVuc2hvdA=='
+
+	monkeypatch.setattr(BrowserSession, 'get_current_page_url', get_current_page_url)
+	monkeypatch.setattr(BrowserSession, 'get_current_page_title', get_current_page_title)
+	monkeypatch.setattr(BrowserSession, 'get_tabs', get_tabs)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+	monkeypatch.setattr(BrowserSession, 'remove_highlights', remove_highlights)
+	monkeypatch.setattr(DOMWatchdog, '_wait_for_stable_network', do_nothing)
+	monkeypatch.setattr(DOMWatchdog, '_get_page_fingerprint', do_nothing)
+	monkeypatch.setattr(DOMWatchdog, '_get_page_info', do_nothing)
+	monkeypatch.setattr(DOMWatchdog, '_build_dom_tree', build_dom_tree)
+
+	async def draw_highlights(self, screenshot_b64, dom_state, page_info):
+		return f'{screenshot_b64} with {len(dom_state.selector_map)} highlights'
+
+	monkeypatch.setattr(ScreenshotWatchdog, 'capture_screenshot', capture_screenshot)
+	monkeypatch.setattr(DOMWatchdog, '_draw_highlights', draw_highlights)
+
+	def make(highlight_elements: bool, highlight_rendering: str = 'page') -> DOMWatchdog:
+		profile = BrowserProfile(headless=True, highlight_elements=highlight_elements, highlight_rendering=highlight_rendering)  # type: ignore[arg-type]
+		session = BrowserSession(browser_profile=profile)
+		session.agent_focus = CDPSession.model_construct(cdp_client=None, target_id='target-1', session_id='session-1')
+		session._screenshot_watchdog = ScreenshotWatchdog(event_bus=session.event_bus, browser_session=session)
+		session.event_bus.on(ScreenshotEvent, session._screenshot_watchdog.on_ScreenshotEvent)
+		return DOMWatchdog(event_bus=session.event_bus, browser_session=session)
+
+	return make
+
+
+async def test_screenshot_is_captured_concurrently_with_the_dom(make_watchdog):
+	watchdog = make_watchdog(highlight_elements=False)
+
+	start = time.monotonic()
+	state = await watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent())
+	elapsed = time.monotonic() - start
+
+	assert state.screenshot == 'c2NyZWVuc2hvdA=='
+	assert elapsed < 0.35, f'the state request took {elapsed:.2f}s'
+
+
+async def test_screenshot_with_highlights_waits_for_the_dom(make_watchdog):
+	watchdog = make_watchdog(highlight_elements=True)
+
+	start = time.monotonic()
+	try:
+		state = await watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent())
+	finally:
+		await watchdog.event_bus.stop(clear=True, timeout=5)
+	elapsed = time.monotonic() - start
+
+	# the screenshot goes through the ScreenshotEvent after the DOM build, which also removes the highlights
+	assert state.screenshot == 'c2NyZWVuc2hvdA=='
+	assert elapsed >= 0.4
+
+
+async def test_highlights_drawn_onto_the_screenshot_dont_wait_for_the_dom(make_watchdog):
+	watchdog = make_watchdog(highlight_elements=True, highlight_rendering='screenshot')
+
+	start = time.monotonic()
+	state = await watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent())
+	elapsed = time.monotonic() - start
+
+	assert state.screenshot == 'c2NyZWVuc2hvdA== with 1 highlights'
+	assert elapsed < 0.35, f'the state request took {elapsed:.2f}s'
+
+
+async def test_concurrent_screenshot_captures_the_page_while_the_dom_build_moves_the_focus(make_watchdog, captures, monkeypatch):
+	watchdog = make_watchdog(highlight_elements=False)
+	page_session = watchdog.browser_session.agent_focus
+	iframe_session = CDPSession.model_construct(cdp_client=None, target_id='iframe-1', session_id='session-2')
+
+	async def build_dom_tree(self, previous_state=None):
+		self.browser_session.agent_focus = iframe_session
+		await asyncio.sleep(0.2)
+		self.browser_session.agent_focus = page_session
+		self.current_dom_state = SerializedDOMState(_root=None, selector_map={})
+		return self.current_dom_state
+
+	monkeypatch.setattr(DOMWatchdog, '_build_dom_tree', build_dom_tree)
+	await watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent())
+
+	assert [session.target_id for session in captures] == ['target-1']
+
+
+async def test_concurrent_screenshot_is_cancelled_when_the_state_request_fails(make_watchdog, monkeypatch):
+	watchdog = make_watchdog(highlight_elements=False)
+	screenshot_tasks = []
+
+	async def capture_screenshot(self, cdp_session=None):
+		screenshot_tasks.append(asyncio.current_task())
+		await asyncio.sleep(10)
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True, new_socket=None):
+		raise RuntimeError('Target closed')
+
+	monkeypatch.setattr(DOMWatchdog, '_capture_screenshot', capture_screenshot)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+	state = await watchdog.on_BrowserStateRequestEvent(BrowserStateRequestEvent())
+	await asyncio.sleep(0)
+
+	assert state.browser_errors == ['Target closed']
+	assert len(screenshot_tasks) == 1 and screenshot_tasks[0].cancelled()
@@ -0,0 +1,89 @@
+"""
+Tests for TargetRegistry, the live list of browser targets read by BrowserSession instead of Target.getTargets.
+
+Target events are shaped like real CDP payloads and dispatched through cdp_use's EventRegistry, so no browser is needed.
+"""
+
+from types import SimpleNamespace
+
+from cdp_use.cdp.registry import EventRegistry
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.target_registry import TargetRegistry
+
+
+def target_info(target_id: str, url: str = 'about:blank', title: str = '', type: str = 'page') -> dict:
+	return {'targetId': target_id, 'type': type, 'title': title, 'url': url, 'attached': True, 'canAccessOpener': False}
+
+
+def make_cdp_client(existing_targets: list[dict]):
+	registry = EventRegistry()
+	calls: list[str] = []
+
+	async def set_discover_targets(params=None, session_id=None):
+		calls.append('setDiscoverTargets')
+		# chrome reports every existing target right away
+		for target in existing_targets:
+			await registry.handle_event('Target.targetCreated', {'targetInfo': target}, None)
+		return {}
+
+	async def get_targets(params=None, session_id=None):
+		calls.append('getTargets')
+		return {'targetInfos': existing_targets}
+
+	send = SimpleNamespace(Target=SimpleNamespace(setDiscoverTargets=set_discover_targets, getTargets=get_targets))
+	return SimpleNamespace(_event_registry=registry, send=send), registry, calls
+
+
+async def test_registry_follows_target_events():
+	cdp_client, registry, _ = make_cdp_client([target_info('tab-1', 'https://example.com', 'Example')])
+	targets = TargetRegistry()
+	await targets.start(cdp_client)  # type: ignore[arg-type]
+	assert [t['targetId'] for t in targets.all()] == ['tab-1']
+
+	await registry.handle_event('Target.targetCreated', {'targetInfo': target_info('tab-2')}, None)
+	await registry.handle_event('Target.targetCreated', {'targetInfo': target_info('worker-1', type='service_worker')}, None)
+	await registry.handle_event(
+		'Target.targetInfoChanged', {'targetInfo': target_info('tab-2', 'https://example.org', 'Example Org')}, None
+	)
+	await registry.handle_event('Target.targetDestroyed', {'targetId': 'worker-1'}, None)
+
+	assert [t['targetId'] for t in targets.all()] == ['tab-1', 'tab-2']  # still in the order they were opened
+	tab = targets.get('tab-2')
+	assert tab is not None and (tab['url'], tab['title']) == ('https://example.org', 'Example Org')
+	assert 'worker-1' not in targets
+
+	targets.stop()
+	assert len(targets) == 0
+	assert registry.get_registered_methods() == []
+
+
+async def test_session_reads_tabs_without_cdp_round_trips():
+	existing_targets = [
+		target_info('AAAA-1111', 'https://example.com', 'Example'),
+		target_info('BBBB-2222', 'chrome://newtab/'),
+		target_info('CCCC-3333', 'https://example.com/report.pdf'),
+		target_info('DDDD-4444', 'https://ads.example.com', type='iframe'),
+	]
+	cdp_client, registry, calls = make_cdp_client(existing_targets)
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True))
+	session._cdp_client_root = cdp_client  # type: ignore[assignment]
+	await session._target_registry.start(cdp_client)  # type: ignore[arg-type]
+	calls.clear()
+
+	tabs = await session.get_tabs()
+	assert [(tab.url, tab.title) for tab in tabs] == [
+		('https://example.com', 'Example'),
+		('chrome://newtab/', 'ignore this tab and do not use it'),
+		('https://example.com/report.pdf', 'report.pdf'),
+	]
+	assert await session.get_target_id_from_tab_id('2222') == 'BBBB-2222'
+	assert await session.get_target_id_from_url('https://example.com/report.pdf') == 'CCCC-3333'
+
+	await registry.handle_event('Target.targetCreated', {'targetInfo': target_info('EEEE-5555', 'about:blank')}, None)
+	assert await session.get_most_recently_opened_target_id() == 'EEEE-5555'
+	assert calls == []
+
+	session._target_registry.stop()
+	assert await session.get_target_id_from_tab_id('2222') == 'BBBB-2222'  # falls back to asking the browser
+	assert calls == ['getTargets']
@@ -0,0 +1,167 @@
+"""
+Tests for the accessibility tree strategies of DomService (`ax_tree_mode`: full, partial, none).
+
+CDP responses are synthetic payloads, so no browser is needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.session import CDPSession
+from browser_use.dom.service import DomService
+
+
+def element(backend_node_id: int, tag: str, attributes: list[str] | None = None, children: list[dict] | None = None) -> dict:
+	return {
+		'nodeId': backend_node_id,
+		'backendNodeId': backend_node_id,
+		'nodeType': 1,
+		'nodeName': tag.upper(),
+		'localName': tag,
+		'nodeValue': '',
+		'attributes': attributes or [],
+		'children': children or [],
+	}
+
+
+# button, link, a div with a click handler and a custom widget with a role are candidates, the plain divs aren't
+DOCUMENT = {
+	'nodeId': 1,
+	'backendNodeId': 1,
+	'nodeType': 9,
+	'nodeName': '#document',
+	'localName': '',
+	'nodeValue': '',
+	'children': [
+		element(
+			2,
+			'html',
+			children=[
+				element(
+					3,
+					'body',
+					children=[
+						element(4, 'div', ['class', 'card'], [element(5, 'button'), element(6, 'a', ['href', '/next'])]),
+						element(7, 'div', ['onclick', 'go()']),
+						element(8, 'div', ['class', 'footer']),
+					],
+				)
+			],
+		)
+	],
+}
+DOCUMENT['children'][0]['children'][0]['children'][0]['shadowRoots'] = [
+	{
+		'nodeId': 9,
+		'backendNodeId': 9,
+		'nodeType': 11,
+		'nodeName': '#document-fragment',
+		'children': [element(10, 'span', ['role', 'switch'])],
+	}
+]
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+	calls: list[str] = []
+	partial_ids: list[int] = []
+	requests_in_flight = {'now': 0, 'max': 0}
+
+	async def get_partial_ax_tree(params=None, session_id=None):
+		calls.append('getPartialAXTree')
+		partial_ids.append(params['backendNodeId'])
+		requests_in_flight['now'] += 1
+		requests_in_flight['max'] = max(requests_in_flight['max'], requests_in_flight['now'])
+		await asyncio.sleep(0)
+		requests_in_flight['now'] -= 1
+		return {
+			'nodes': [{'nodeId': str(params['backendNodeId']), 'ignored': False, 'backendDOMNodeId': params['backendNodeId']}]
+		}
+
+	async def get_document(params=None, session_id=None):
+		return {'root': DOCUMENT}
+
+	async def evaluate(params=None, session_id=None):
+		return {'result': {'value': {}}}
+
+	cdp_client = SimpleNamespace(
+		send=SimpleNamespace(
+			DOM=SimpleNamespace(getDocument=get_document),
+			Runtime=SimpleNamespace(evaluate=evaluate),
+			Accessibility=SimpleNamespace(getPartialAXTree=get_partial_ax_tree),
+		)
+	)
+	cdp_session = CDPSession.model_construct(cdp_client=cdp_client, target_id='page', session_id='session-1')
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True, new_socket=None):
+		return cdp_session
+
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+
+	def make(ax_tree_mode: str, **kwargs) -> DomService:
+		session = BrowserSession(browser_profile=BrowserProfile(headless=True))
+		service = DomService(session, ax_tree_mode=ax_tree_mode, **kwargs)  # type: ignore[arg-type]
+
+		async def capture_snapshot(cdp_session):
+			return {'documents': [], 'strings': []}
+
+		async def get_viewport_ratio(target_id):
+			return 1.0
+
+		async def get_full_ax_tree(target_id):
+			calls.append('getFullAXTree')
+			return {'nodes': [{'nodeId': 'root', 'ignored': False, 'backendDOMNodeId': 1}]}
+
+		monkeypatch.setattr(service, '_capture_snapshot', capture_snapshot)
+		monkeypatch.setattr(service, '_get_viewport_ratio', get_viewport_ratio)
+		monkeypatch.setattr(service, '_get_ax_tree_for_all_frames', get_full_ax_tree)
+		return service
+
+	make.requests_in_flight = requests_in_flight  # type: ignore[attr-defined]
+	return make, calls, partial_ids
+
+
+async def test_full_mode_fetches_the_whole_ax_tree(make_service):
+	make, calls, _ = make_service
+	trees = await make('full')._get_all_trees('page')
+
+	assert calls == ['getFullAXTree']
+	assert trees.ax_tree['nodes'][0]['nodeId'] == 'root'
+	assert set(trees.cdp_timing) == {'cdp_calls_total', 'ax_tree_full'}
+
+
+async def test_partial_mode_fetches_candidate_interactive_nodes_only(make_service):
+	make, calls, partial_ids = make_service
+	trees = await make('partial')._get_all_trees('page')
+
+	assert sorted(partial_ids) == [5, 6, 7, 10]
+	assert 'getFullAXTree' not in calls
+	assert sorted(ax_node['backendDOMNodeId'] for ax_node in trees.ax_tree['nodes']) == [5, 6, 7, 10]
+	assert set(trees.cdp_timing) == {'cdp_calls_total', 'ax_tree_partial'}
+
+
+async def test_partial_mode_bounds_concurrent_requests(make_service):
+	make, _, partial_ids = make_service
+	await make('partial', max_concurrent_ax_requests=2)._get_all_trees('page')
+
+	assert sorted(partial_ids) == [5, 6, 7, 10]
+	assert make.requests_in_flight['max'] == 2
+
+
+async def test_partial_mode_falls_back_to_the_full_tree_for_many_candidates(make_service):
+	make, calls, _ = make_service
+	await make('partial', partial_ax_tree_fallback_threshold=3)._get_all_trees('page')
+
+	assert calls == ['getFullAXTree']
+
+
+async def test_none_mode_skips_the_ax_tree(make_service):
+	make, calls, _ = make_service
+	trees = await make('none')._get_all_trees('page')
+
+	assert calls == []
+	assert trees.ax_tree == {'nodes': []}
+	assert trees.cdp_timing['ax_tree_none'] == 0.0
@@ -0,0 +1,158 @@
+"""
+Tests for the concurrent capture of cross origin iframes (OOPIFs) in DomService.get_dom_tree.
+
+The page and iframe targets are synthetic CDP payloads returned with a delay per target, so no browser is needed.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.service import DomService
+from browser_use.dom.views import TargetAllTrees
+
+
+def document(first_id: int, body_children: list[dict], frame_id: str) -> dict:
+	body = {'nodeId': first_id + 2, 'backendNodeId': first_id + 2, 'nodeType': 1, 'nodeName': 'BODY', 'localName': 'body'}
+	body.update({'nodeValue': '', 'attributes': [], 'children': body_children})
+	html = {'nodeId': first_id + 1, 'backendNodeId': first_id + 1, 'nodeType': 1, 'nodeName': 'HTML', 'localName': 'html'}
+	html.update({'nodeValue': '', 'attributes': [], 'children': [body], 'frameId': frame_id})
+	return {
+		'nodeId': first_id,
+		'backendNodeId': first_id,
+		'nodeType': 9,
+		'nodeName': '#document',
+		'nodeValue': '',
+		'children': [html],
+	}
+
+
+def iframe(node_id: int, frame_id: str) -> dict:
+	return {
+		'nodeId': node_id,
+		'backendNodeId': node_id,
+		'nodeType': 1,
+		'nodeName': 'IFRAME',
+		'localName': 'iframe',
+		'nodeValue': '',
+		'attributes': ['src', f'https://{frame_id}.example.com'],
+		'frameId': frame_id,
+	}
+
+
+def trees_for(root: dict) -> TargetAllTrees:
+	backend_node_ids: list[int] = []
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		backend_node_ids.append(node['backendNodeId'])
+		stack.extend(node.get('children', []))
+	backend_node_ids.sort()
+	snapshot = {
+		'documents': [
+			{
+				'nodes': {'backendNodeId': backend_node_ids},
+				'layout': {
+					'nodeIndex': list(range(len(backend_node_ids))),
+					'bounds': [[0.0, 0.0, 300.0, 200.0] for _ in backend_node_ids],
+					'styles': [[] for _ in backend_node_ids],
+					'paintOrders': list(range(len(backend_node_ids))),
+					'clientRects': [[] for _ in backend_node_ids],
+					'scrollRects': [[] for _ in backend_node_ids],
+					'stackingContexts': {'index': [0]},
+					'text': [],
+				},
+			}
+		],
+		'strings': [],
+	}
+	return TargetAllTrees(
+		snapshot=snapshot,  # type: ignore[arg-type]
+		dom_tree={'root': root},  # type: ignore[arg-type]
+		ax_tree={'nodes': []},
+		device_pixel_ratio=1.0,
+		cdp_timing={},
+	)
+
+
+# page > [widget, map, slow-ad], widget > [nested]; every OOPIF target is named after its frame
+PAGES = {
+	'page': document(1, [iframe(10, 'widget'), iframe(11, 'map'), iframe(12, 'slow-ad')], 'page'),
+	'widget': document(100, [iframe(110, 'nested')], 'widget'),
+	'map': document(200, [], 'map'),
+	'slow-ad': document(300, [], 'slow-ad'),
+	'nested': document(400, [], 'nested'),
+}
+PARENT_TARGETS = {'widget': 'page', 'map': 'page', 'slow-ad': 'page', 'nested': 'widget'}
+CAPTURE_TIMES = {'page': 0.2, 'widget': 0.2, 'map': 0.2, 'slow-ad': 30.0, 'nested': 0.2}
+
+
+@pytest.fixture
+def dom_service(monkeypatch):
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, cross_origin_iframes=True))
+	service = DomService(session, cross_origin_iframes=True, cross_origin_iframe_timeout=1.0)
+
+	async def get_all_frames(self):
+		all_frames = {'page': {'id': 'page', 'frameTargetId': 'page'}}
+		for frame_id, parent_target_id in PARENT_TARGETS.items():
+			all_frames[frame_id] = {'id': frame_id, 'frameTargetId': frame_id, 'parentTargetId': parent_target_id}
+		return all_frames, {target_id: f'session-{target_id}' for target_id in PAGES}
+
+	async def get_all_targets(self):
+		return [{'targetId': target_id, 'type': 'page' if target_id == 'page' else 'iframe'} for target_id in PAGES]
+
+	monkeypatch.setattr(BrowserSession, 'get_all_frames', get_all_frames)
+	monkeypatch.setattr(BrowserSession, '_cdp_get_all_targets', get_all_targets)
+	return service
+
+
+async def test_iframes_are_captured_concurrently_within_their_budget(dom_service, monkeypatch):
+	started: list[str] = []
+
+	async def get_all_trees(target_id):
+		started.append(target_id)
+		await asyncio.sleep(CAPTURE_TIMES[target_id])
+		return trees_for(PAGES[target_id])
+
+	monkeypatch.setattr(dom_service, '_get_all_trees', get_all_trees)
+
+	start = time.monotonic()
+	root = await dom_service.get_dom_tree('page')
+	elapsed = time.monotonic() - start
+
+	# everything listed up front and fetched together, the slow ad is dropped after its 1s budget
+	assert sorted(started) == sorted(PAGES)
+	assert elapsed < 1.5, f'capturing the page took {elapsed:.2f}s'
+
+	body = root.children_nodes[0].children_nodes[0]  # type: ignore[index]
+	widget, map_frame, slow_ad = body.children_nodes  # type: ignore[misc]
+	assert widget.content_document is not None and widget.content_document.target_id == 'widget'
+	assert widget.content_document.parent_node is widget
+	assert map_frame.content_document is not None and map_frame.content_document.target_id == 'map'
+	assert slow_ad.content_document is None
+
+	nested = widget.content_document.children_nodes[0].children_nodes[0].children_nodes[0]  # type: ignore[index]
+	assert nested.content_document is not None and nested.content_document.target_id == 'nested'
+
+
+async def test_iframes_missing_from_the_frame_hierarchy_are_fetched_afterwards(dom_service, monkeypatch):
+	started: list[str] = []
+
+	async def get_all_trees(target_id):
+		started.append(target_id)
+		return trees_for(PAGES[target_id])
+
+	async def list_nothing(target_id):
+		return []
+
+	monkeypatch.setattr(dom_service, '_get_all_trees', get_all_trees)
+	monkeypatch.setattr(dom_service, '_list_cross_origin_iframe_targets', list_nothing)
+
+	root = await dom_service.get_dom_tree('page')
+
+	# one level at a time, each level in one batch
+	assert started == ['page', 'widget', 'map', 'slow-ad', 'nested']
+	body = root.children_nodes[0].children_nodes[0]  # type: ignore[index]
+	assert all(iframe_node.content_document is not None for iframe_node in body.children_nodes)  # type: ignore[union-attr]
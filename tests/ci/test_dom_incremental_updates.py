@@ -0,0 +1,287 @@
+"""
+Tests for incremental DOM updates: DOMMutationTracker recording CDP DOM events and DomService patching its cached tree.
+
+Events and trees are shaped like real CDP payloads, so no browser is needed.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from cdp_use.cdp.registry import EventRegistry
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.enhanced_snapshot import build_snapshot_layout_store
+from browser_use.dom.mutations import DOMMutation, DOMMutationTracker, get_document
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import TargetAllTrees
+
+
+def element(node_id: int, name: str, children: list[dict] | None = None, **extra) -> dict:
+	node = {
+		'nodeId': node_id,
+		'backendNodeId': node_id,
+		'nodeType': 1,
+		'nodeName': name,
+		'localName': name.lower(),
+		'nodeValue': '',
+		'attributes': [],
+		**extra,
+	}
+	if children is not None:
+		node['children'] = children
+		node['childNodeCount'] = len(children)
+	return node
+
+
+def text(node_id: int, value: str) -> dict:
+	return {'nodeId': node_id, 'backendNodeId': node_id, 'nodeType': 3, 'nodeName': '#text', 'nodeValue': value}
+
+
+def snapshot_for(bounds: dict[int, list[float]]) -> dict:
+	backend_node_ids = sorted(bounds)
+	return {
+		'documents': [
+			{
+				'nodes': {'backendNodeId': backend_node_ids},
+				'layout': {
+					'nodeIndex': list(range(len(backend_node_ids))),
+					'bounds': [bounds[backend_node_id] for backend_node_id in backend_node_ids],
+					'styles': [[] for _ in backend_node_ids],
+					'paintOrders': list(range(len(backend_node_ids))),
+					'clientRects': [[0.0, 0.0, 1280.0, 720.0] for _ in backend_node_ids],
+					'scrollRects': [[0.0, 0.0, 1280.0, 5000.0] for _ in backend_node_ids],
+					'stackingContexts': {'index': [0]},
+					'text': [],
+				},
+			}
+		],
+		'strings': [],
+	}
+
+
+# document(1) > html(2) > body(3) > [ul(4) > [li(5) > "first"(6), li(7) > "second"(8)], button(9)]
+PAGE_BOUNDS = {2: [0.0, 0.0, 1280.0, 720.0], 3: [0.0, 0.0, 1280.0, 720.0], 4: [0.0, 0.0, 200.0, 40.0]}
+PAGE_BOUNDS.update({5: [0.0, 0.0, 200.0, 20.0], 7: [0.0, 20.0, 200.0, 20.0], 9: [0.0, 50.0, 80.0, 20.0]})
+
+
+def page_trees() -> TargetAllTrees:
+	ul = element(4, 'UL', [element(5, 'LI', [text(6, 'first')]), element(7, 'LI', [text(8, 'second')])])
+	body = element(3, 'BODY', [ul, element(9, 'BUTTON', [], attributes=['type', 'button'])])
+	html = element(2, 'HTML', [body], frameId='main-frame')
+	root = {**element(1, '#document', [html]), 'nodeType': 9}
+	return TargetAllTrees(
+		snapshot=snapshot_for(PAGE_BOUNDS),  # type: ignore[arg-type]
+		dom_tree={'root': root},  # type: ignore[arg-type]
+		ax_tree={'nodes': []},
+		device_pixel_ratio=1.0,
+		cdp_timing={},
+	)
+
+
+@pytest.fixture
+def dom_service():
+	# patching the cached tree never talks to the browser, so an unstarted session is enough
+	service = DomService(BrowserSession(browser_profile=BrowserProfile(headless=True)), incremental_dom_updates=True)
+	service._cached_dom_tree, service._cached_node_lookup, _ = service._build_enhanced_dom_tree(page_trees(), 'target-1')
+	return service
+
+
+def make_tracker(max_mutations: int = 1000) -> tuple[DOMMutationTracker, EventRegistry]:
+	registry = EventRegistry()
+
+	async def request_child_nodes(params, session_id=None):
+		# Chrome answers DOM.requestChildNodes with a setChildNodes event before the response
+		await registry.handle_event(
+			'DOM.setChildNodes', {'parentId': params['nodeId'], 'nodes': [text(101, 'loaded later')]}, session_id
+		)
+		return {}
+
+	async def get_document_response(params=None, session_id=None):
+		return page_trees().dom_tree
+
+	cdp_client = SimpleNamespace(
+		_event_registry=registry,
+		send=SimpleNamespace(DOM=SimpleNamespace(requestChildNodes=request_child_nodes, getDocument=get_document_response)),
+	)
+	cdp_session = SimpleNamespace(cdp_client=cdp_client, target_id='target-1', session_id='session-1')
+	tracker = DOMMutationTracker(cdp_session, max_mutations=max_mutations)  # type: ignore[arg-type]
+	tracker.start()
+	return tracker, registry
+
+
+async def test_tracker_records_mutations_of_its_session_and_fetches_inserted_subtrees():
+	tracker, registry = make_tracker()
+
+	await registry.handle_event('DOM.attributeModified', {'nodeId': 9, 'name': 'disabled', 'value': ''}, 'session-1')
+	await registry.handle_event('DOM.attributeModified', {'nodeId': 9, 'name': 'ignored', 'value': ''}, 'other-session')
+	inserted = {'parentNodeId': 4, 'previousNodeId': 7, 'node': element(100, 'LI', childNodeCount=1)}
+	await registry.handle_event('DOM.childNodeInserted', inserted, 'session-1')
+
+	mutations, overflowed = await tracker.drain()
+
+	assert overflowed is False
+	assert [mutation.method for mutation in mutations] == ['attributeModified', 'childNodeInserted', 'setChildNodes']
+	assert mutations[2].params['parentId'] == 100
+	assert await tracker.drain() == ([], False)
+
+	tracker.stop()
+	assert registry.get_registered_methods() == []
+
+
+async def test_tracker_overflows_on_document_updates_and_too_many_mutations():
+	tracker, registry = make_tracker(max_mutations=3)
+
+	await registry.handle_event('DOM.documentUpdated', {}, 'session-1')
+	await registry.handle_event('DOM.attributeRemoved', {'nodeId': 9, 'name': 'type'}, 'session-1')
+	assert await tracker.drain() == ([], True)
+
+	for i in range(4):
+		await registry.handle_event('DOM.characterDataModified', {'nodeId': 6, 'characterData': f'v{i}'}, 'session-1')
+	assert await tracker.drain() == ([], True)
+
+
+async def test_document_fetched_by_an_action_between_updates_forces_a_full_rebuild(dom_service, monkeypatch):
+	tracker, registry = make_tracker()
+	dom_service._mutation_tracker = tracker
+	rebuilds = []
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True):
+		return tracker.cdp_session
+
+	async def refresh_cached_dom_tree(self, target_id, dirty_nodes):
+		pass
+
+	async def rebuild_cached_dom_tree(self, target_id):
+		rebuilds.append(target_id)
+		tracker.reset()
+		return self._cached_dom_tree
+
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+	monkeypatch.setattr(DomService, '_refresh_cached_dom_tree', refresh_cached_dom_tree)
+	monkeypatch.setattr(DomService, '_rebuild_cached_dom_tree', rebuild_cached_dom_tree)
+
+	await registry.handle_event('DOM.attributeModified', {'nodeId': 9, 'name': 'disabled', 'value': ''}, 'session-1')
+	_, timing = await dom_service._get_dom_tree_incremental('target-1')
+	assert 'dom_tree_incremental_update' in timing
+
+	# the extract action reads the page HTML on the same session, which resets the node ids Chrome reports mutations for
+	await get_document(tracker.cdp_session.cdp_client, 'other-session')
+	await get_document(tracker.cdp_session.cdp_client, 'session-1')
+	await registry.handle_event('DOM.attributeRemoved', {'nodeId': 9, 'name': 'disabled'}, 'session-1')
+	_, timing = await dom_service._get_dom_tree_incremental('target-1')
+
+	assert 'dom_tree_full_rebuild' in timing
+	assert rebuilds == ['target-1']
+	assert dom_service._cached_node_lookup[9].attributes == {'type': 'button', 'disabled': ''}
+
+	tracker.stop()
+	assert tracker not in DOMMutationTracker._active
+
+
+async def test_incremental_update_leaves_the_previous_dom_state_unchanged(dom_service, monkeypatch):
+	tracker, registry = make_tracker()
+	dom_service._mutation_tracker = tracker
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True):
+		return tracker.cdp_session
+
+	async def refresh_cached_dom_tree(self, target_id, dirty_nodes):
+		bounds = {**PAGE_BOUNDS, 9: [0.0, 900.0, 80.0, 20.0], 10: [0.0, 80.0, 100.0, 20.0]}
+		self._apply_snapshot_layout(self._cached_dom_tree, target_id, build_snapshot_layout_store(snapshot_for(bounds)))  # type: ignore[arg-type]
+
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+	monkeypatch.setattr(DomService, '_refresh_cached_dom_tree', refresh_cached_dom_tree)
+
+	previous_tree = dom_service._cached_dom_tree
+	previous_state, _ = DOMTreeSerializer(previous_tree).serialize_accessible_elements()
+	[previous_button] = previous_state.selector_map.values()
+	previous_hashes = previous_state.parent_branch_hashes
+	previous_button_hash = hash(previous_button)
+
+	await registry.handle_event('DOM.attributeModified', {'nodeId': 9, 'name': 'disabled', 'value': ''}, 'session-1')
+	inserted = {'parentNodeId': 3, 'previousNodeId': 9, 'node': element(10, 'BUTTON')}
+	await registry.handle_event('DOM.childNodeInserted', inserted, 'session-1')
+	tree, timing = await dom_service._get_dom_tree_incremental('target-1')
+	state, _ = DOMTreeSerializer(tree, previous_state).serialize_accessible_elements()
+
+	assert 'dom_tree_incremental_update' in timing
+	assert tree is not previous_tree
+	# the nodes of the previous state kept their index, attributes, layout, children and hash
+	assert previous_state.selector_map == {1: previous_button}
+	assert previous_button.element_index == 1
+	assert previous_button.attributes == {'type': 'button'}
+	assert previous_button.is_visible is True
+	assert hash(previous_button) == previous_button_hash
+	assert [child.node_id for child in previous_button.parent_node.children] == [4, 9]  # type: ignore[union-attr]
+	assert previous_state.parent_branch_hashes == previous_hashes
+	# the new state is built from the patched copy and compared against the previous one
+	assert [node.node_id for node in state.selector_map.values()] == [10]
+	assert state.selector_map[1] is dom_service._cached_node_lookup[10]
+	assert dom_service._cached_node_lookup[9].attributes == {'type': 'button', 'disabled': ''}
+	assert '*[1]' in state.llm_representation()
+
+	tracker.stop()
+
+
+async def test_mutations_patch_cached_tree_in_place(dom_service):
+	tree = dom_service._cached_dom_tree
+	ul = dom_service._cached_node_lookup[4]
+	button = dom_service._cached_node_lookup[9]
+	second_item = dom_service._cached_node_lookup[7]
+	assert second_item.xpath == 'html/body/ul/li[2]'
+
+	dirty_nodes = await dom_service._apply_dom_mutations(
+		[
+			DOMMutation('attributeModified', {'nodeId': 9, 'name': 'aria-label', 'value': 'Submit'}),
+			DOMMutation('attributeRemoved', {'nodeId': 9, 'name': 'type'}),
+			DOMMutation('characterDataModified', {'nodeId': 8, 'characterData': 'second (edited)'}),
+			DOMMutation('childNodeRemoved', {'parentNodeId': 4, 'nodeId': 5}),
+			DOMMutation('childNodeInserted', {'parentNodeId': 4, 'previousNodeId': 7, 'node': element(10, 'LI')}),
+			DOMMutation('setChildNodes', {'parentId': 10, 'nodes': [text(11, 'third')]}),
+			DOMMutation('childNodeInserted', {'parentNodeId': 4, 'previousNodeId': 0, 'node': text(12, 'header')}),
+		],
+		'target-1',
+	)
+
+	assert dirty_nodes is not None
+	assert dom_service._cached_dom_tree is tree
+	assert button.attributes == {'aria-label': 'Submit'}
+	assert dom_service._cached_node_lookup[8].node_value == 'second (edited)'
+	assert [child.node_id for child in ul.children] == [12, 7, 10]
+	assert all(child.parent_node is ul for child in ul.children)
+	assert dom_service._cached_node_lookup[10].children[0].node_value == 'third'
+	assert 5 not in dom_service._cached_node_lookup and 6 not in dom_service._cached_node_lookup
+	assert {node.node_id for node in dirty_nodes} == {9, 8, 7, 10, 11, 12}
+	# memoized XPaths follow the new sibling positions
+	assert second_item.xpath == 'html/body/ul/li[1]'
+	assert dom_service._cached_node_lookup[10].xpath == 'html/body/ul/li[2]'
+
+
+async def test_unknown_nodes_require_a_full_rebuild(dom_service):
+	assert (
+		await dom_service._apply_dom_mutations([DOMMutation('childNodeRemoved', {'parentNodeId': 4, 'nodeId': 999})], 't') is None
+	)
+	inserted_after_unknown = {'parentNodeId': 4, 'previousNodeId': 999, 'node': element(10, 'LI')}
+	assert await dom_service._apply_dom_mutations([DOMMutation('childNodeInserted', inserted_after_unknown)], 't') is None
+
+
+async def test_patched_tree_is_laid_out_again_from_a_new_snapshot(dom_service):
+	await dom_service._apply_dom_mutations(
+		[DOMMutation('childNodeInserted', {'parentNodeId': 3, 'previousNodeId': 9, 'node': element(10, 'A')})],
+		'target-1',
+	)
+	# the serializer assigns indexes to the cached nodes, they must not survive into the next step
+	dom_service._cached_node_lookup[9].element_index = 1
+
+	bounds = {**PAGE_BOUNDS, 9: [0.0, 900.0, 80.0, 20.0], 10: [0.0, 80.0, 100.0, 20.0]}
+	dom_service._apply_snapshot_layout(
+		dom_service._cached_dom_tree, 'target-1', build_snapshot_layout_store(snapshot_for(bounds))
+	)  # type: ignore[arg-type]
+
+	link = dom_service._cached_node_lookup[10]
+	button = dom_service._cached_node_lookup[9]
+	assert link.is_visible is True
+	assert link.absolute_position is not None and link.absolute_position.y == 80.0
+	assert button.is_visible is False  # moved below the 720px viewport
+	assert button.element_index is None
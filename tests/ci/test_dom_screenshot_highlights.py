@@ -0,0 +1,58 @@
+"""
+Tests for drawing element highlights onto screenshots with Pillow (`highlight_rendering='screenshot'`).
+"""
+
+import base64
+import io
+from types import SimpleNamespace
+
+from PIL import Image
+
+from browser_use.dom.debug.highlights import HIGHLIGHT_COLOR, draw_highlights_on_screenshot
+from browser_use.dom.views import DOMRect
+
+
+def screenshot(width: int, height: int, format: str) -> str:
+	output = io.BytesIO()
+	Image.new('RGB', (width, height), 'white').save(output, format=format)
+	return base64.b64encode(output.getvalue()).decode()
+
+
+def element(x: float, y: float, width: float, height: float) -> SimpleNamespace:
+	return SimpleNamespace(
+		absolute_position=DOMRect(x=x, y=y, width=width, height=height),
+		node_name='BUTTON',
+		snapshot_node=None,
+		attributes={},
+		frame_id=None,
+		node_id=1,
+		backend_node_id=1,
+		xpath='html/body/button',
+		node_value='',
+	)
+
+
+def decode(screenshot_b64: str) -> Image.Image:
+	return Image.open(io.BytesIO(base64.b64decode(screenshot_b64)))
+
+
+def test_highlights_are_scaled_to_device_pixels_and_keep_the_format():
+	orange = Image.new('RGB', (1, 1), HIGHLIGHT_COLOR).getpixel((0, 0))
+
+	# a 1280 CSS pixels wide viewport captured at device pixel ratio 2
+	result = decode(draw_highlights_on_screenshot(screenshot(2560, 1440, 'PNG'), {7: element(100, 50, 200, 40)}, 1280))  # type: ignore[dict-item]
+
+	assert result.format == 'PNG' and result.size == (2560, 1440)
+	assert result.getpixel((201, 140)) == orange  # left edge of the box
+	assert result.getpixel((400, 140)) == (255, 255, 255)  # inside the box
+	assert result.getpixel((204, 96)) == orange  # index label above the top left corner
+
+
+def test_full_page_screenshots_are_offset_by_the_scroll_position():
+	selector_map = {1: element(0, 0, 100, 100)}
+
+	result = decode(draw_highlights_on_screenshot(screenshot(640, 2000, 'JPEG'), selector_map, 640, offset_y=1000, quality=90))  # type: ignore[arg-type]
+
+	assert result.format == 'JPEG'
+	assert result.getpixel((50, 1000))[2] < 100  # top edge of the box, orange has little blue
+	assert result.getpixel((50, 50)) == (255, 255, 255)
@@ -0,0 +1,290 @@
+"""
+Tests for DOMTreeSerializer on synthetic enhanced DOM trees.
+
+The trees are built by DomService._build_enhanced_dom_tree from DOM.getDocument/captureSnapshot shaped payloads, so no
+browser is needed.
+"""
+
+import hashlib
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, TargetAllTrees
+
+
+class PageBuilder:
+	"""Builds a page payload: every element gets a 100x20 box stacked below the previous one, all inside the viewport."""
+
+	def __init__(self):
+		self.next_id = 0
+		self.bounds: dict[int, list[float]] = {}
+		self.computed_styles: dict[int, dict[str, str]] = {}
+
+	def element(
+		self,
+		name: str,
+		children: list[dict] | None = None,
+		bounds: list[float] | None = None,
+		computed_styles: dict[str, str] | None = None,
+		**attributes,
+	) -> dict:
+		"""Elements are painted in creation order, so children are painted below their parent."""
+		self.next_id += 1
+		node = {
+			'nodeId': self.next_id,
+			'backendNodeId': self.next_id,
+			'nodeType': 1,
+			'nodeName': name.upper(),
+			'localName': name,
+			'nodeValue': '',
+			'attributes': [item for key, value in attributes.items() for item in (key, value)],
+		}
+		if children:
+			node['children'] = children
+		self.bounds[self.next_id] = bounds or [0.0, 20.0 * self.next_id, 100.0, 20.0]
+		if computed_styles:
+			self.computed_styles[self.next_id] = computed_styles
+		return node
+
+	def text(self, value: str) -> dict:
+		self.next_id += 1
+		return {'nodeId': self.next_id, 'backendNodeId': self.next_id, 'nodeType': 3, 'nodeName': '#text', 'nodeValue': value}
+
+	def links(self, count: int, first_id: int = 0) -> list[dict]:
+		return [self.element('a', [self.text(f'link {first_id + i}')], href=f'/page/{first_id + i}') for i in range(count)]
+
+	def trees(self, body_children: list[dict]) -> TargetAllTrees:
+		body = self.element('body', body_children, bounds=[0.0, 0.0, 1280.0, 100000.0])
+		html = self.element('html', [body], bounds=[0.0, 0.0, 1280.0, 100000.0], frameId='main-frame')
+		self.next_id += 1
+		root = {'nodeId': self.next_id, 'backendNodeId': self.next_id, 'nodeType': 9, 'nodeName': '#document', 'nodeValue': ''}
+		root['children'] = [html]
+
+		backend_node_ids = sorted(self.bounds)
+		html_id = html['backendNodeId']
+		strings: list[str] = []
+
+		def style_row(node_id: int) -> list[int]:
+			computed_styles = self.computed_styles.get(node_id, {})
+			row = []
+			for name in REQUIRED_COMPUTED_STYLES:
+				strings.append(computed_styles.get(name, ''))
+				row.append(len(strings) - 1)
+			return row
+
+		snapshot = {
+			'documents': [
+				{
+					'nodes': {'backendNodeId': backend_node_ids},
+					'layout': {
+						'nodeIndex': list(range(len(backend_node_ids))),
+						'bounds': [self.bounds[node_id] for node_id in backend_node_ids],
+						'styles': [style_row(node_id) if node_id in self.computed_styles else [] for node_id in backend_node_ids],
+						'paintOrders': list(range(len(backend_node_ids))),
+						'clientRects': [[0.0, 0.0, 1280.0, 100000.0] if i == html_id else [] for i in backend_node_ids],
+						'scrollRects': [[0.0, 0.0, 1280.0, 100000.0] if i == html_id else [] for i in backend_node_ids],
+						'stackingContexts': {'index': [0]},
+						'text': [],
+					},
+				}
+			],
+			'strings': strings,
+		}
+		return TargetAllTrees(
+			snapshot=snapshot,  # type: ignore[arg-type]
+			dom_tree={'root': root},  # type: ignore[arg-type]
+			ax_tree={'nodes': []},
+			device_pixel_ratio=1.0,
+			cdp_timing={},
+		)
+
+
+@pytest.fixture(scope='module')
+def dom_service():
+	# building the enhanced tree never talks to the browser, so an unstarted session is enough
+	return DomService(BrowserSession(browser_profile=BrowserProfile(headless=True)))
+
+
+def build_tree(dom_service: DomService, builder: PageBuilder, body_children: list[dict]) -> EnhancedDOMTreeNode:
+	root, _, _ = dom_service._build_enhanced_dom_tree(builder.trees(body_children), 'target-1')
+	return root
+
+
+def test_new_elements_are_marked_against_previous_selector_map(dom_service):
+	builder = PageBuilder()
+	links = builder.links(5)
+	first_state, timing = DOMTreeSerializer(build_tree(dom_service, builder, links)).serialize_accessible_elements()
+
+	assert len(first_state.selector_map) == 5
+	assert first_state.backend_node_ids == {node.backend_node_id for node in first_state.selector_map.values()}
+	assert {'previous_state_index', 'selector_map_index', 'assign_interactive_indices'} <= timing.keys()
+	assert '*[' not in first_state.llm_representation()  # nothing is new without a previous state
+
+	# same page plus two more links
+	links.extend(builder.links(2, first_id=5))
+	second_state, _ = DOMTreeSerializer(build_tree(dom_service, builder, links), first_state).serialize_accessible_elements()
+
+	representation = second_state.llm_representation()
+	assert representation.count('*[') == 2
+	assert '*[6]<a' in representation and '*[7]<a' in representation
+
+
+def test_new_element_marking_scales_linearly(dom_service):
+	"""Regression benchmark: marking must not rebuild the previous index for every interactive element."""
+
+	def marking_time(num_links: int) -> float:
+		builder = PageBuilder()
+		previous_state, _ = DOMTreeSerializer(
+			build_tree(dom_service, builder, builder.links(num_links))
+		).serialize_accessible_elements()
+		timings = []
+		for _ in range(3):
+			tree = build_tree(dom_service, builder, builder.links(num_links, first_id=num_links))
+			_, timing = DOMTreeSerializer(tree, previous_state).serialize_accessible_elements()
+			timings.append(timing['assign_interactive_indices'])
+		return min(timings)
+
+	small = marking_time(500)
+	large = marking_time(4_000)
+
+	# 8x more links on both sides: quadratic marking would be ~64x slower
+	assert large < max(small, 1e-4) * 25, f'new element marking scaled super-linearly: {small:.4f}s -> {large:.4f}s'
+	assert large < 1.0, f'marking 4k links took {large:.2f}s'
+
+
+def modal_page(builder: PageBuilder, background_color: str, pointer_events: str = 'auto') -> list[dict]:
+	"""A 'Buy' button below a full viewport modal that has its own 'Close' button."""
+	buy = builder.element('button', [builder.text('Buy')], bounds=[100.0, 300.0, 80.0, 20.0])
+	close = builder.element('button', [builder.text('Close')], bounds=[600.0, 300.0, 80.0, 20.0])
+	styles = {
+		'display': 'block',
+		'visibility': 'visible',
+		'opacity': '1',
+		'background-color': background_color,
+		'pointer-events': pointer_events,
+	}
+	modal = builder.element('div', [close], bounds=[0.0, 0.0, 1280.0, 720.0], computed_styles=styles)
+	return [buy, modal]
+
+
+@pytest.mark.parametrize(
+	'background_color, pointer_events, enable_paint_order_filtering, buy_is_indexed',
+	[
+		('rgb(255, 255, 255)', 'auto', True, False),
+		('rgba(255, 255, 255, 0.95)', 'auto', True, False),
+		('rgba(0, 0, 0, 0)', 'auto', True, True),
+		('rgba(0, 0, 0, 0.5)', 'auto', True, True),
+		# an overlay that lets clicks through to the page, e.g. a watermark or a loading shimmer
+		('rgb(255, 255, 255)', 'none', True, True),
+		('rgb(255, 255, 255)', 'auto', False, True),
+	],
+)
+def test_elements_covered_by_opaque_elements_are_not_indexed(
+	dom_service, background_color, pointer_events, enable_paint_order_filtering, buy_is_indexed
+):
+	builder = PageBuilder()
+	tree = build_tree(dom_service, builder, modal_page(builder, background_color, pointer_events))
+	state, timing = DOMTreeSerializer(
+		tree, enable_paint_order_filtering=enable_paint_order_filtering
+	).serialize_accessible_elements()
+
+	representation = state.llm_representation()
+	indexed_text = {node.get_all_children_text() for node in state.selector_map.values()}
+	assert 'Close' in indexed_text  # painted on top of its own modal
+	assert ('Buy' in indexed_text) is buy_is_indexed
+	assert representation.count('<button') == len(state.selector_map)
+	assert ('paint_order_filtering' in timing) is enable_paint_order_filtering
+
+
+def sticky_header_page(builder: PageBuilder) -> list[dict]:
+	"""A dark sticky header with a 'Menu' link, one link scrolled under it and one below it."""
+	under_header = builder.element('a', [builder.text('Scrolled under')], bounds=[20.0, 10.0, 100.0, 20.0], href='/under')
+	below_header = builder.element('a', [builder.text('Below')], bounds=[20.0, 100.0, 100.0, 20.0], href='/below')
+	menu = builder.element('a', [builder.text('Menu')], bounds=[20.0, 20.0, 60.0, 20.0], href='/menu')
+	styles = {'position': 'sticky', 'opacity': '1', 'background-color': 'rgb(33, 33, 33)'}
+	header = builder.element('header', [menu], bounds=[0.0, 0.0, 1280.0, 60.0], computed_styles=styles)
+	return [under_header, below_header, header]
+
+
+@pytest.mark.parametrize(
+	'enable_paint_order_filtering, indexed_links',
+	[(True, {'Below', 'Menu'}), (None, {'Scrolled under', 'Below', 'Menu'})],
+)
+def test_sticky_header_hides_the_elements_scrolled_under_it(dom_service, enable_paint_order_filtering, indexed_links):
+	builder = PageBuilder()
+	tree = build_tree(dom_service, builder, sticky_header_page(builder))
+	# opt-in, without the argument nothing is hidden
+	kwargs = {} if enable_paint_order_filtering is None else {'enable_paint_order_filtering': enable_paint_order_filtering}
+
+	state, _ = DOMTreeSerializer(tree, **kwargs).serialize_accessible_elements()
+	assert {node.get_all_children_text() for node in state.selector_map.values()} == indexed_links
+
+
+@pytest.mark.parametrize('containment_threshold', [0.5, 0.3, 1.5])
+def test_paint_order_filtering_rejects_thresholds_that_miss_covering_elements(dom_service, containment_threshold):
+	builder = PageBuilder()
+	tree = build_tree(dom_service, builder, sticky_header_page(builder))
+
+	with pytest.raises(ValueError, match='containment_threshold'):
+		DOMTreeSerializer(tree, containment_threshold=containment_threshold, enable_paint_order_filtering=True)
+	# only paint order filtering relies on covering elements reaching the center
+	DOMTreeSerializer(tree, containment_threshold=containment_threshold).serialize_accessible_elements()
+
+
+def test_budgeted_serialization_stops_early_and_counts_omitted_elements(dom_service, monkeypatch):
+	builder = PageBuilder()
+	state, _ = DOMTreeSerializer(build_tree(dom_service, builder, builder.links(2_000))).serialize_accessible_elements()
+	full_text = state.llm_representation()
+
+	text, truncated, omitted = state.llm_representation_within_budget(len(full_text))
+	assert (text, truncated, omitted) == (full_text, False, 0)
+
+	built_lines = 0
+	build_attributes_string = DOMTreeSerializer._build_attributes_string
+
+	def counting_build_attributes_string(*args):
+		nonlocal built_lines
+		built_lines += 1
+		return build_attributes_string(*args)
+
+	monkeypatch.setattr(DOMTreeSerializer, '_build_attributes_string', staticmethod(counting_build_attributes_string))
+	text, truncated, omitted = state.llm_representation_within_budget(1_000)
+
+	assert text == full_text[:1_000]
+	assert truncated is True
+	complete_lines = text.count('\n')  # the last line is cut off, its element counts as omitted
+	assert omitted == len(state.selector_map) - complete_lines
+	assert built_lines == complete_lines + 1
+
+
+def test_element_hashes_are_memoized_and_match_full_path_hashing(dom_service):
+	def sha256_int(value: str) -> int:
+		return int(hashlib.sha256(value.encode()).hexdigest()[:16], 16)
+
+	builder = PageBuilder()
+	nested = builder.element('div', [builder.element('span', builder.links(2, first_id=3))])
+	tree = build_tree(dom_service, builder, [*builder.links(3), nested])
+	state, _ = DOMTreeSerializer(tree).serialize_accessible_elements()
+
+	for node in state.selector_map.values():
+		branch_path = '/'.join(node._get_parent_branch_path())
+		attributes = ''.join(f'{key}={value}' for key, value in node.attributes.items())
+		# the same values as before memoization, element hashes are stored in saved histories
+		assert node.parent_branch_hash() == sha256_int(branch_path)
+		assert node.__hash__() == sha256_int(f'{branch_path}|{attributes}')
+
+	link = state.selector_map[5]
+	assert '/'.join(link._get_parent_branch_path()) == 'html/body/div/span/a'
+	link.attributes['href'] = '/moved'
+	assert link.element_hash == state.selector_map[5].element_hash  # memoized until invalidated
+	link.invalidate_element_hash()
+	assert link.__hash__() == sha256_int('html/body/div/span/a|href=/moved')
+
+	assert state.parent_branch_hashes == {sha256_int('html/body/a'), sha256_int('html/body/div/span/a')}
+	assert state.get_index_by_element_hash(link.element_hash) == 5
+	assert state.get_index_by_element_hash(state.selector_map[2].element_hash) == 2
+	assert state.get_index_by_element_hash(0) is None
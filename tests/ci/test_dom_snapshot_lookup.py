@@ -0,0 +1,163 @@
+"""
+Tests for build_snapshot_lookup() and the columnar SnapshotLayoutStore in browser_use/dom/enhanced_snapshot.py.
+
+The payloads are shaped like real DOMSnapshot.captureSnapshot responses (one string table, columnar layout tree,
+rare boolean data for isClickable) so the parser can be exercised and benchmarked without launching a browser.
+"""
+
+import math
+import time
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES, build_snapshot_layout_store, build_snapshot_lookup
+from browser_use.dom.views import DOMRect
+
+
+def make_capture_snapshot_payload(num_nodes: int, num_documents: int = 1) -> dict:
+	"""Build a captureSnapshot-shaped payload with `num_nodes` nodes per document.
+
+	Every third node has no layout object (like text-less containers that are display:none),
+	every other node is clickable and every fourth laid-out node has a pointer cursor.
+	"""
+	strings: list[str] = []
+	string_ids: dict[str, int] = {}
+
+	def intern(value: str) -> int:
+		if value not in string_ids:
+			string_ids[value] = len(strings)
+			strings.append(value)
+		return string_ids[value]
+
+	default_style = {name: 'auto' for name in REQUIRED_COMPUTED_STYLES}
+	default_style.update({'display': 'block', 'visibility': 'visible', 'opacity': '1', 'cursor': 'auto'})
+	pointer_style = {**default_style, 'cursor': 'pointer'}
+	default_row = [intern(default_style[name]) for name in REQUIRED_COMPUTED_STYLES]
+	pointer_row = [intern(pointer_style[name]) for name in REQUIRED_COMPUTED_STYLES]
+
+	documents = []
+	backend_node_id = 1
+	for _ in range(num_documents):
+		backend_node_ids = []
+		node_index = []
+		bounds = []
+		styles = []
+		paint_orders = []
+		client_rects = []
+		scroll_rects = []
+		for i in range(num_nodes):
+			backend_node_ids.append(backend_node_id)
+			backend_node_id += 1
+			if i % 3 == 2:
+				continue
+			layout_idx = len(node_index)
+			node_index.append(i)
+			bounds.append([float(i), float(2 * i), 100.0, 20.0])
+			styles.append(pointer_row if layout_idx % 4 == 0 else default_row)
+			paint_orders.append(layout_idx)
+			client_rects.append([0.0, 0.0, 100.0, 20.0] if layout_idx % 5 == 0 else [])
+			scroll_rects.append([0.0, 10.0, 100.0, 200.0] if layout_idx % 5 == 0 else [])
+
+		documents.append(
+			{
+				'nodes': {
+					'backendNodeId': backend_node_ids,
+					'isClickable': {'index': list(range(0, num_nodes, 2))},
+				},
+				'layout': {
+					'nodeIndex': node_index,
+					'styles': styles,
+					'bounds': bounds,
+					'text': [-1] * len(node_index),
+					'stackingContexts': {'index': [0]},
+					'paintOrders': paint_orders,
+					'clientRects': client_rects,
+					'scrollRects': scroll_rects,
+				},
+			}
+		)
+
+	return {'documents': documents, 'strings': strings}
+
+
+def test_lookup_maps_layout_data_to_backend_node_ids():
+	snapshot = make_capture_snapshot_payload(9)
+	lookup = build_snapshot_lookup(snapshot, device_pixel_ratio=2.0)  # type: ignore[arg-type]
+
+	assert len(lookup) == 9
+
+	# snapshot index 3 -> layout index 2 (index 2 has no layout)
+	node = lookup[4]
+	assert node.is_clickable is False
+	assert node.bounds == DOMRect(x=1.5, y=3.0, width=50.0, height=10.0)  # divided by device pixel ratio
+	assert node.paint_order == 2
+	assert node.computed_styles is not None
+	assert node.computed_styles['display'] == 'block'
+	assert node.cursor_style == 'auto'
+	assert node.clientRects is None
+	assert node.scrollRects is None
+
+	# snapshot index 0 -> layout index 0: pointer cursor and client/scroll rects, not scaled
+	node = lookup[1]
+	assert node.is_clickable is True
+	assert node.cursor_style == 'pointer'
+	assert node.clientRects == DOMRect(x=0.0, y=0.0, width=100.0, height=20.0)
+	assert node.scrollRects == DOMRect(x=0.0, y=10.0, width=100.0, height=200.0)
+
+	# snapshot index 2 has no layout node
+	node = lookup[3]
+	assert node.bounds is None
+	assert node.computed_styles is None
+	assert node.paint_order is None
+
+
+def test_lookup_handles_multiple_documents_and_empty_snapshot():
+	assert build_snapshot_lookup({'documents': [], 'strings': []}) == {}  # type: ignore[arg-type]
+
+	lookup = build_snapshot_lookup(make_capture_snapshot_payload(6, num_documents=3))  # type: ignore[arg-type]
+	assert len(lookup) == 18
+	# the first node of every document has layout index 0
+	assert lookup[1].paint_order == lookup[7].paint_order == lookup[13].paint_order == 0
+
+
+def test_lookup_interns_identical_computed_styles():
+	lookup = build_snapshot_lookup(make_capture_snapshot_payload(30))  # type: ignore[arg-type]
+	style_objects = {id(node.computed_styles) for node in lookup.values() if node.computed_styles is not None}
+	assert len(style_objects) == 2  # default row + pointer row
+
+
+def test_layout_store_keeps_columns_and_materializes_nodes_lazily():
+	snapshot = make_capture_snapshot_payload(30, num_documents=2)
+	store = build_snapshot_layout_store(snapshot, device_pixel_ratio=2.0)  # type: ignore[arg-type]
+
+	assert len(store) == 60
+	assert len(store.styles) == 2  # default row + pointer row, shared across documents
+	assert len(store.bounds) == len(store.client_rects) == len(store.scroll_rects) == 4 * len(store)
+
+	# snapshot index 2 has no layout: NaN geometry and no style code
+	row = store.row(3)
+	assert row is not None
+	assert math.isnan(store.bounds[4 * row]) and store.style_codes[row] == -1 and store.bounds_at(row) is None
+
+	# materialized nodes match the dict lookup and are only created once
+	assert store[4] == build_snapshot_lookup(snapshot, device_pixel_ratio=2.0)[4]  # type: ignore[arg-type]
+	assert store.get(4) is store.get(4)
+	assert store.get(12345) is None and 12345 not in store
+
+
+def test_lookup_scales_linearly():
+	"""Regression benchmark: 8x more nodes must cost roughly 8x more, not 64x like the old nested layout scan."""
+
+	def best_time(num_nodes: int) -> float:
+		snapshot = make_capture_snapshot_payload(num_nodes)
+		timings = []
+		for _ in range(3):
+			start = time.perf_counter()
+			build_snapshot_lookup(snapshot)  # type: ignore[arg-type]
+			timings.append(time.perf_counter() - start)
+		return min(timings)
+
+	small = best_time(5_000)
+	large = best_time(40_000)
+
+	# generous bound to stay stable on noisy CI machines, quadratic behaviour would be ~64x
+	assert large / small < 20, f'build_snapshot_lookup scaled super-linearly: {small:.4f}s -> {large:.4f}s'
+	assert large < 5.0, f'build_snapshot_lookup took {large:.2f}s for 40k nodes'
@@ -0,0 +1,241 @@
+"""
+Tests and micro-benchmark for the synchronous enhanced DOM tree builder (DomService._build_enhanced_dom_tree).
+
+The trees are shaped like DOM.getDocument(depth=-1, pierce=True) responses, so no browser is needed.
+"""
+
+import sys
+import time
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, NodeType, TargetAllTrees
+
+
+class DocumentBuilder:
+	"""Builds DOM.getDocument-shaped node dicts together with a matching captureSnapshot payload."""
+
+	def __init__(self):
+		self.next_id = 0
+		self.bounds: dict[int, list[float]] = {}
+
+	def node(self, name: str, node_type: int = 1, children: list[dict] | None = None, **extra) -> dict:
+		self.next_id += 1
+		node = {
+			'nodeId': self.next_id,
+			'backendNodeId': self.next_id,
+			'nodeType': node_type,
+			'nodeName': name,
+			'localName': name.lower(),
+			'nodeValue': '',
+			'attributes': ['class', f'c{self.next_id}'] if node_type == 1 else [],
+			**extra,
+		}
+		if children:
+			for child in children:
+				child['parentId'] = node['nodeId']
+			node['children'] = children
+		if node_type == 1:
+			self.bounds[node['backendNodeId']] = [0.0, float(self.next_id), 100.0, 20.0]
+		return node
+
+	def document(self, body_children: list[dict]) -> dict:
+		body = self.node('BODY', children=body_children)
+		html = self.node('HTML', children=[body], frameId='main-frame')
+		return self.node('#document', NodeType.DOCUMENT_NODE.value, children=[html])
+
+	def table(self, rows: int) -> dict:
+		return self.document(
+			[
+				self.node(
+					'TABLE',
+					children=[
+						self.node('TR', children=[self.node('TD', children=[self.node('#text', 3, nodeValue=f'row {i}')])])
+						for i in range(rows)
+					],
+				)
+			]
+		)
+
+	def chain(self, depth: int) -> dict:
+		node = self.node('#text', 3, nodeValue='leaf')
+		for _ in range(depth):
+			node = self.node('DIV', children=[node])
+		return self.document([node])
+
+	def trees(self, root: dict) -> TargetAllTrees:
+		backend_node_ids = sorted(self.bounds)
+		snapshot = {
+			'documents': [
+				{
+					'nodes': {'backendNodeId': backend_node_ids},
+					'layout': {
+						'nodeIndex': list(range(len(backend_node_ids))),
+						'bounds': [self.bounds[backend_node_id] for backend_node_id in backend_node_ids],
+						'styles': [[] for _ in backend_node_ids],
+						'paintOrders': list(range(len(backend_node_ids))),
+						'clientRects': [[0.0, 0.0, 1280.0, 720.0] for _ in backend_node_ids],
+						'scrollRects': [[0.0, 0.0, 1280.0, 100000.0] for _ in backend_node_ids],
+						'stackingContexts': {'index': [0]},
+						'text': [],
+					},
+				}
+			],
+			'strings': [],
+		}
+		return TargetAllTrees(
+			snapshot=snapshot,  # type: ignore[arg-type]
+			dom_tree={'root': root},  # type: ignore[arg-type]
+			ax_tree={'nodes': []},
+			device_pixel_ratio=1.0,
+			cdp_timing={},
+		)
+
+
+@pytest.fixture(scope='module')
+def dom_service():
+	# the builder never talks to the browser, so an unstarted session is enough
+	return DomService(BrowserSession(browser_profile=BrowserProfile(headless=True)))
+
+
+def test_builder_links_parents_children_and_shadow_roots(dom_service):
+	builder = DocumentBuilder()
+	shadow_root = builder.node(
+		'#document-fragment',
+		NodeType.DOCUMENT_FRAGMENT_NODE.value,
+		children=[builder.node('BUTTON')],
+		shadowRootType='open',
+	)
+	host = builder.node('DIV', children=[builder.node('SPAN'), builder.node('A')], shadowRoots=[shadow_root])
+	root = builder.document([host])
+
+	tree, _, pending_iframes = dom_service._build_enhanced_dom_tree(builder.trees(root), 'target-1')
+
+	assert pending_iframes == []
+	html = tree.children[0]
+	body = html.children[0]
+	div = body.children[0]
+	assert [child.tag_name for child in div.children] == ['span', 'a']
+	assert all(child.parent_node is div for child in div.children)
+	assert div.shadow_roots is not None and div.shadow_roots[0].parent_node is div
+	assert div.shadow_roots[0].children[0].tag_name == 'button'
+	assert div.attributes == {'class': f'c{host["nodeId"]}'}
+	assert div.absolute_position == DOMRect(x=0.0, y=float(host['nodeId']), width=100.0, height=20.0)
+	assert div.is_visible is True
+
+
+def test_builder_handles_trees_deeper_than_recursion_limit(dom_service):
+	builder = DocumentBuilder()
+	depth = sys.getrecursionlimit() * 2
+	tree, _, _ = dom_service._build_enhanced_dom_tree(builder.trees(builder.chain(depth)), 'target-1')
+
+	node = tree
+	levels = 0
+	while node.children:
+		node = node.children[0]
+		levels += 1
+	assert node.node_value == 'leaf'
+	assert levels == depth + 3  # html, body and the text leaf
+
+
+def test_builder_per_node_cost(dom_service):
+	"""Micro-benchmark: report per-node construction cost on a wide table and make sure it doesn't grow with page size."""
+
+	def per_node_cost(rows: int) -> float:
+		builder = DocumentBuilder()
+		root = builder.table(rows)
+		num_nodes = builder.next_id
+		timings = []
+		for _ in range(3):
+			trees = builder.trees(root)
+			start = time.perf_counter()
+			dom_service._build_enhanced_dom_tree(trees, 'target-1')
+			timings.append(time.perf_counter() - start)
+		return min(timings) / num_nodes
+
+	small = per_node_cost(1_000)
+	large = per_node_cost(10_000)
+	print(f'DOM tree construction: {small * 1e6:.1f}µs/node (4k nodes), {large * 1e6:.1f}µs/node (40k nodes)')
+
+	# generous bound to stay stable on noisy CI machines
+	assert large < small * 4, f'per-node cost grew with page size: {small * 1e6:.1f}µs -> {large * 1e6:.1f}µs'
+
+
+def reference_xpath(node: EnhancedDOMTreeNode) -> str:
+	"""XPath computed from scratch by walking to the root and scanning all siblings at every level."""
+	segments = []
+	current = node
+	while current and current.node_type in (NodeType.ELEMENT_NODE, NodeType.DOCUMENT_FRAGMENT_NODE):
+		if current.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+			current = current.parent_node
+			continue
+		if current.parent_node and current.parent_node.node_name.lower() == 'iframe':
+			break
+		siblings = current.parent_node.children if current.parent_node else []
+		same_tag = [
+			child for child in siblings if child.node_type == NodeType.ELEMENT_NODE and child.tag_name == current.tag_name
+		]
+		position = next((i + 1 for i, child in enumerate(same_tag) if child is current), 0) if len(same_tag) > 1 else 0
+		segments.insert(0, f'{current.tag_name}[{position}]' if position else current.tag_name)
+		current = current.parent_node
+	return '/'.join(segments)
+
+
+def all_nodes(root: EnhancedDOMTreeNode) -> list[EnhancedDOMTreeNode]:
+	nodes, stack = [], [root]
+	while stack:
+		node = stack.pop()
+		nodes.append(node)
+		stack.extend([*node.children_and_shadow_roots, *([node.content_document] if node.content_document else [])])
+	return nodes
+
+
+def test_xpaths_are_memoized_and_match_full_walk(dom_service):
+	builder = DocumentBuilder()
+	shadow_root = builder.node(
+		'#document-fragment',
+		NodeType.DOCUMENT_FRAGMENT_NODE.value,
+		children=[builder.node('BUTTON'), builder.node('BUTTON')],
+		shadowRootType='open',
+	)
+	iframe_document = builder.document([builder.node('P'), builder.node('P'), builder.node('SPAN')])
+	host = builder.node(
+		'DIV', children=[builder.node('SPAN'), builder.node('A'), builder.node('SPAN')], shadowRoots=[shadow_root]
+	)
+	iframe = builder.node('IFRAME', contentDocument=iframe_document)
+	root = builder.document([builder.node('DIV'), host, builder.node('#text', 3, nodeValue='text'), iframe])
+
+	tree, _, _ = dom_service._build_enhanced_dom_tree(builder.trees(root), 'target-1')
+	nodes = all_nodes(tree)
+	# in reverse too, so memoized ancestors and memoized descendants are both exercised
+	for node in [*nodes[::2], *reversed(nodes)]:
+		assert node.xpath == reference_xpath(node), f'{node.node_name} {node.node_id}'
+
+	xpaths = {node.xpath for node in nodes}
+	assert {'html/body/div[2]/span[1]', 'html/body/div[2]/button[2]', 'html/body/iframe', 'html/body/p[2]'} <= xpaths
+
+
+def test_xpath_cost_on_wide_table(dom_service):
+	"""Benchmark: XPaths of every cell of a synthetic table with up to 10k rows, per cell cost must not grow with width."""
+
+	def per_cell_cost(rows: int) -> float:
+		builder = DocumentBuilder()
+		root = builder.table(rows)
+		timings = []
+		for _ in range(3):
+			tree, _, _ = dom_service._build_enhanced_dom_tree(builder.trees(root), 'target-1')
+			cells = [node for node in all_nodes(tree) if node.node_name == 'TD']
+			start = time.perf_counter()
+			xpaths = [cell.xpath for cell in cells]
+			timings.append(time.perf_counter() - start)
+		assert xpaths[0] == f'html/body/table/tr[{rows}]/td'  # cells are collected last row first
+		return min(timings) / rows
+
+	small = per_cell_cost(1_000)
+	large = per_cell_cost(10_000)
+	print(f'XPath generation: {small * 1e6:.1f}µs/cell (1k rows), {large * 1e6:.1f}µs/cell (10k rows)')
+
+	# a linear scan of the siblings for every cell would make this ~10x slower per cell
+	assert large < small * 4, f'per-cell XPath cost grew with table size: {small * 1e6:.1f}µs -> {large * 1e6:.1f}µs'
@@ -0,0 +1,141 @@
+"""
+Tests for the visibility stage of the enhanced DOM tree (DomService._apply_visibility and
+DomService.is_element_visible_according_to_all_parents).
+
+Main page scrolled by 1000px, containing a same-origin iframe whose own document is scrolled by 100px:
+
+	document(1) > html(2) > body(3) > [div(4), div(5), iframe(6) > document(7) > html(8) > body(9) > [a(10), a(11), a(12)], span(13)]
+"""
+
+import random
+from copy import deepcopy
+
+import pytest
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, TargetAllTrees
+
+# backend node id -> (bounds, client rect, scroll rect, style)
+LAYOUT: dict[int, tuple[list[float], list[float], list[float], str]] = {
+	2: ([0, 0, 1280, 3000], [0, 0, 1280, 720], [0, 1000, 1280, 3000], 'default'),
+	3: ([0, 0, 1280, 3000], [], [], 'default'),
+	4: ([0, 1100, 200, 50], [], [], 'default'),  # in the scrolled main viewport
+	5: ([0, 100, 200, 50], [], [], 'default'),  # scrolled out above the viewport
+	6: ([100, 1200, 400, 300], [], [], 'default'),  # iframe, its content starts at y=200 in the viewport
+	8: ([0, 0, 400, 2000], [0, 0, 400, 300], [0, 100, 400, 2000], 'default'),
+	9: ([0, 0, 400, 2000], [], [], 'default'),
+	10: ([10, 150, 50, 20], [], [], 'default'),  # inside the iframe viewport
+	11: ([10, 20, 50, 20], [], [], 'default'),  # scrolled out of the iframe viewport
+	12: ([10, 160, 50, 20], [], [], 'transparent'),
+	13: ([0, 1300, 200, 50], [], [], 'hidden'),
+}
+
+
+def element(node_id: int, name: str, children: list[dict] | None = None, **extra) -> dict:
+	node = {'nodeId': node_id, 'backendNodeId': node_id, 'nodeType': 1, 'nodeName': name, 'nodeValue': '', **extra}
+	if children:
+		node['children'] = children
+	return node
+
+
+def page_trees(layout: dict[int, tuple[list[float], list[float], list[float], str]] = LAYOUT) -> TargetAllTrees:
+	iframe_body = element(9, 'BODY', [element(10, 'A'), element(11, 'A'), element(12, 'A')])
+	iframe_document = {**element(7, '#document', [element(8, 'HTML', [iframe_body], frameId='child-frame')]), 'nodeType': 9}
+	body = element(3, 'BODY', [element(4, 'DIV'), element(5, 'DIV'), element(6, 'IFRAME', contentDocument=iframe_document)])
+	body['children'].append(element(13, 'SPAN'))
+	root = {**element(1, '#document', [element(2, 'HTML', [body], frameId='main-frame')]), 'nodeType': 9}
+
+	strings = ['block', 'visible', '1', 'none', '0']
+	styles = {'default': [0, 1, 2], 'transparent': [0, 1, 4], 'hidden': [3, 1, 2]}
+	assert REQUIRED_COMPUTED_STYLES[:3] == ['display', 'visibility', 'opacity']
+
+	backend_node_ids = sorted(layout)
+	snapshot = {
+		'documents': [
+			{
+				'nodes': {'backendNodeId': backend_node_ids},
+				'layout': {
+					'nodeIndex': list(range(len(backend_node_ids))),
+					'bounds': [layout[node_id][0] for node_id in backend_node_ids],
+					'clientRects': [layout[node_id][1] for node_id in backend_node_ids],
+					'scrollRects': [layout[node_id][2] for node_id in backend_node_ids],
+					'styles': [styles[layout[node_id][3]] for node_id in backend_node_ids],
+					'paintOrders': list(range(len(backend_node_ids))),
+					'stackingContexts': {'index': [0]},
+					'text': [],
+				},
+			}
+		],
+		'strings': strings,
+	}
+	return TargetAllTrees(
+		snapshot=snapshot,  # type: ignore[arg-type]
+		dom_tree={'root': root},  # type: ignore[arg-type]
+		ax_tree={'nodes': []},
+		device_pixel_ratio=1.0,
+		cdp_timing={},
+	)
+
+
+def collect_frames(root: EnhancedDOMTreeNode) -> list[tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode]]]:
+	"""(node, html frames) pairs the same way the layout pass collects them."""
+	result = []
+	stack: list[tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode]]] = [(root, [])]
+	while stack:
+		node, html_frames = stack.pop()
+		if node.node_name == 'HTML' and node.frame_id is not None:
+			html_frames = [*html_frames, node]
+		if node.node_name == 'IFRAME' and node.snapshot_node and node.snapshot_node.bounds:
+			html_frames = [*html_frames, node]
+		result.append((node, html_frames))
+		for child in [*node.children, *([node.content_document] if node.content_document else [])]:
+			stack.append((child, html_frames))
+	return result
+
+
+@pytest.fixture(scope='module')
+def dom_service():
+	# the visibility stage never talks to the browser, so an unstarted session is enough
+	return DomService(BrowserSession(browser_profile=BrowserProfile(headless=True)))
+
+
+def test_visibility_accounts_for_scroll_iframes_and_styles(dom_service):
+	_, node_lookup, _ = dom_service._build_enhanced_dom_tree(page_trees(), 'target-1')
+
+	visible = {node_id for node_id, node in node_lookup.items() if node.is_visible}
+	assert {4, 10}.issubset(visible)
+	assert not visible & {5, 11, 12, 13}
+
+
+def test_visibility_does_not_mutate_snapshot_bounds(dom_service):
+	_, node_lookup, _ = dom_service._build_enhanced_dom_tree(page_trees(), 'target-1')
+
+	for node_id, (bounds, _, _, _) in LAYOUT.items():
+		snapshot_node = node_lookup[node_id].snapshot_node
+		assert snapshot_node is not None
+		assert snapshot_node.bounds == DOMRect(*map(float, bounds)), f'bounds of node {node_id} were modified'
+
+	# checking the same node again (e.g. from the DOM watchdog) gives the same answer and still doesn't move it
+	link = node_lookup[10]
+	html_frames = dict((id(node), frames) for node, frames in collect_frames(node_lookup[1]))[id(link)]
+	for _ in range(3):
+		assert DomService.is_element_visible_according_to_all_parents(link, html_frames) is True
+	assert link.snapshot_node is not None and link.snapshot_node.bounds == DOMRect(10.0, 150.0, 50.0, 20.0)
+
+
+def test_batch_visibility_matches_per_node_check(dom_service):
+	rng = random.Random(7)
+	for _ in range(20):
+		layout = deepcopy(LAYOUT)
+		for node_id, (bounds, client_rect, scroll_rect, _) in layout.items():
+			bounds[0] = rng.uniform(-500, 1500)
+			bounds[1] = rng.uniform(-500, 3000)
+			if scroll_rect:
+				scroll_rect[1] = rng.uniform(0, 2000)
+		root, _, _ = dom_service._build_enhanced_dom_tree(page_trees(layout), 'target-1')
+
+		for node, html_frames in collect_frames(root):
+			expected = DomService.is_element_visible_according_to_all_parents(node, html_frames)
+			assert node.is_visible is expected, f'{node.node_name} {node.node_id}'
@@ -0,0 +1,109 @@
+"""
+Tests for reusing one SDK client, and with it one HTTP connection pool, per event loop in the chat models.
+
+The chat completions come from a local stand-in for the OpenAI API.
+"""
+
+import asyncio
+import gc
+import json
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from pytest_httpserver import HTTPServer
+
+from browser_use.llm.anthropic.chat import ChatAnthropic
+from browser_use.llm.messages import UserMessage
+from browser_use.llm.openai.chat import ChatOpenAI
+
+COMPLETION = {
+	'id': 'chatcmpl-1',
+	'object': 'chat.completion',
+	'created': 0,
+	'model': 'gpt-4.1-mini',
+	'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': 'Hello'}, 'finish_reason': 'stop'}],
+	'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+}
+
+
+async def test_llm_calls_reuse_the_client_until_closed(httpserver: HTTPServer):
+	httpserver.expect_request('/v1/chat/completions', method='POST').respond_with_json(COMPLETION)
+	llm = ChatOpenAI(model='gpt-4.1-mini', api_key='test', base_url=httpserver.url_for('/v1'))
+
+	first = await llm.ainvoke([UserMessage(content='Hi')])
+	client = llm.get_client()
+	second = await llm.ainvoke([UserMessage(content='Hi again')])
+
+	assert first.completion == second.completion == 'Hello'
+	assert llm.get_client() is client
+
+	await llm.aclose()
+	assert client._client.is_closed
+	assert llm.get_client() is not client
+	await llm.aclose()
+
+
+async def test_user_http_clients_are_left_open():
+	http_client = httpx.AsyncClient()
+	llm = ChatOpenAI(model='gpt-4.1-mini', api_key='test', http_client=http_client)
+
+	assert llm.get_client()._client is http_client
+	await llm.aclose()
+	assert not http_client.is_closed
+	await http_client.aclose()
+
+
+def test_each_event_loop_gets_its_own_client():
+	llm = ChatAnthropic(model='claude-sonnet-4-0', api_key='test')
+
+	async def get_client():
+		client = llm.get_client()
+		assert llm.get_client() is client
+		await llm.aclose()
+		return client
+
+	assert asyncio.run(get_client()) is not asyncio.run(get_client())
+
+
+class KeepAliveCompletionHandler(BaseHTTPRequestHandler):
+	# unlike pytest-httpserver it keeps the connection open, which is what ties a client to its event loop
+	protocol_version = 'HTTP/1.1'
+
+	def do_POST(self):
+		self.rfile.read(int(self.headers['Content-Length']))
+		body = json.dumps(COMPLETION).encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+
+@pytest.fixture
+def keep_alive_server():
+	server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveCompletionHandler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	yield f'http://127.0.0.1:{server.server_port}/v1'
+	server.shutdown()
+	server.server_close()
+
+
+def test_clients_of_closed_event_loops_are_dropped(keep_alive_server: str):
+	llm = ChatOpenAI(model='gpt-4.1-mini', api_key='test', base_url=keep_alive_server)
+
+	async def call_llm():
+		await llm.ainvoke([UserMessage(content='Hi')])
+		return weakref.ref(llm.get_client())
+
+	first_client = asyncio.run(call_llm())
+	second_client = asyncio.run(call_llm())
+	gc.collect()
+
+	assert first_client() is None
+	assert [client for _, client, _ in llm._client_pool._clients.values()] == [second_client()]
@@ -3,11 +3,18 @@ Tests for the SchemaOptimizer to ensure it correctly processes and
 optimizes the schemas for agent actions without losing information.
 """
 
-from pydantic import BaseModel
+import gc
+import json
+from types import SimpleNamespace
+
+from google.genai import _transformers
+from pydantic import BaseModel, create_model
 
 from browser_use.agent.views import AgentOutput
 from browser_use.controller.service import Controller
-from browser_use.llm.schema import SchemaOptimizer
+from browser_use.llm.google.chat import ChatGoogle
+from browser_use.llm.messages import UserMessage
+from browser_use.llm.schema import SCHEMA_CACHE_SIZE, SchemaOptimizer, remove_schema_title
 
 
 class ProductInfo(BaseModel):
@@ -64,3 +71,59 @@ def test_optimizer_preserves_all_fields_in_structured_done_action():
 		f'Missing from optimized: {original_fields - optimized_fields}\n'
 		f'Unexpected in optimized: {optimized_fields - original_fields}'
 	)
+
+
+def test_optimized_schemas_are_cached_per_model_and_flavour():
+	"""Repeated requests for the same model get the same schema object."""
+	schema = SchemaOptimizer.get_optimized_json_schema(ProductInfo)
+
+	assert schema == SchemaOptimizer.create_optimized_json_schema(ProductInfo)
+	assert SchemaOptimizer.get_optimized_json_schema(ProductInfo) is schema
+
+	# other flavours are transformed copies that leave the default flavour alone
+	def add_title(schema):
+		schema['title'] = 'ProductInfo'
+		return schema
+
+	titled = SchemaOptimizer.get_optimized_json_schema(ProductInfo, 'titled', add_title)
+	assert titled['title'] == 'ProductInfo' and 'title' not in schema
+	assert 'title' not in SchemaOptimizer.get_optimized_json_schema(ProductInfo, 'untitled', remove_schema_title)
+
+
+async def test_google_sdk_does_not_modify_the_cached_schema(monkeypatch):
+	"""The genai SDK converts response schemas in place, which must not leak into the schema shared by later requests."""
+	llm = ChatGoogle(model='gemini-2.0-flash', api_key='test')
+	cached = SchemaOptimizer.get_optimized_json_schema(ProductInfo, 'gemini', llm._fix_gemini_schema)
+	before = json.dumps(cached, sort_keys=True)
+	sent_schemas = []
+
+	async def generate_content(model, contents, config):
+		# what the SDK does with `response_schema` before sending the request
+		sent_schemas.append(_transformers.t_schema(None, config['response_schema']))
+		return SimpleNamespace(parsed=None, text='{"price": "$1", "title": "Pen", "rating": null}', usage_metadata=None)
+
+	client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+	monkeypatch.setattr(ChatGoogle, 'get_client', lambda self: client)
+
+	for _ in range(2):
+		result = await llm.ainvoke([UserMessage(content='Describe the pen')], output_format=ProductInfo)
+		assert result.completion == ProductInfo(price='$1', title='Pen')
+
+	assert SchemaOptimizer.get_optimized_json_schema(ProductInfo, 'gemini', llm._fix_gemini_schema) is cached
+	assert json.dumps(cached, sort_keys=True) == before
+	assert sent_schemas[0] == sent_schemas[1]
+
+
+def test_schema_cache_is_bounded_and_drops_collected_models():
+	"""The cache holds the models weakly and forgets the oldest ones beyond its size limit."""
+	SchemaOptimizer.get_optimized_json_schema(ProductInfo)
+	models = [create_model(f'Output{i}', value=(int, ...)) for i in range(SCHEMA_CACHE_SIZE)]
+	for model in models:
+		SchemaOptimizer.get_optimized_json_schema(model)
+
+	assert len(SchemaOptimizer._cache) == SCHEMA_CACHE_SIZE
+	assert ProductInfo not in SchemaOptimizer._cache
+
+	del model, models
+	gc.collect()
+	assert len(SchemaOptimizer._cache) == 0
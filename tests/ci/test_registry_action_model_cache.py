@@ -0,0 +1,61 @@
+"""
+Tests for reusing the action and agent output models generated for the same set of page actions.
+"""
+
+from browser_use import Agent
+from browser_use.agent.views import ActionResult
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.controller.registry.service import Registry
+from browser_use.controller.service import Controller
+from tests.ci.conftest import create_mock_llm
+
+
+def make_registry() -> Registry:
+	registry = Registry()
+
+	@registry.action('Type some text')
+	async def type_text(text: str):
+		return ActionResult(extracted_content=text)
+
+	@registry.action('Open the inbox', domains=['mail.example.com'])
+	async def open_inbox():
+		return ActionResult(extracted_content='inbox')
+
+	return registry
+
+
+def test_same_actions_reuse_the_action_model():
+	registry = make_registry()
+
+	inbox_model = registry.create_action_model(page_url='https://mail.example.com/inbox')
+	assert registry.create_action_model(page_url='https://mail.example.com/sent') is inbox_model
+	assert 'open_inbox' in inbox_model.model_json_schema()['$defs']['OpenInboxActionModel']['properties']
+
+	# other sites have other actions available
+	other_model = registry.create_action_model(page_url='https://example.com')
+	assert other_model is not inbox_model
+	assert registry.create_action_model(page_url='https://example.org') is other_model
+	assert registry.create_action_model(page_url='https://mail.example.com') is inbox_model
+
+
+def test_reregistered_actions_build_a_new_model():
+	registry = make_registry()
+	first_model = registry.create_action_model()
+
+	@registry.action('Type some text slowly')
+	async def type_text(text: str, delay: int):
+		return ActionResult(extracted_content=text)
+
+	second_model = registry.create_action_model()
+	assert second_model is not first_model
+	assert 'delay' in str(second_model.model_json_schema())
+
+
+def test_agent_reuses_output_models_across_steps():
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None))
+	agent = Agent(task='Test task', llm=create_mock_llm(), controller=Controller(), browser_session=browser_session)
+
+	output_model = agent.AgentOutput
+	agent.ActionModel = agent.controller.registry.create_action_model()
+	assert agent._get_agent_output_model(agent.ActionModel) is output_model
+	assert agent._get_agent_output_model(agent.DoneActionModel) is agent.DoneAgentOutput
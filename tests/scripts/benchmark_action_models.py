@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark the per-step overhead of updating the agent's action models with many custom actions registered.
+
+Registers custom actions (some limited to a domain) on top of the default controller actions and times
+`Agent._update_action_models_for_page` plus the JSON schema generation the LLM clients do for the output model, with
+the action models, output models and schemas cached and with the caches cleared before every step.
+
+Usage:
+	python tests/scripts/benchmark_action_models.py [number of custom actions]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('ANONYMIZED_TELEMETRY', 'false')
+os.environ.setdefault('SKIP_LLM_API_KEY_VERIFICATION', 'true')
+
+from pydantic import BaseModel
+
+from browser_use import Agent
+from browser_use.agent.views import ActionResult
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.controller.service import Controller
+from browser_use.llm.schema import SchemaOptimizer
+from tests.ci.conftest import create_mock_llm
+
+STEPS = 50
+URLS = ['https://example.com/search', 'https://example.com/results', 'https://shop.example.com/cart']
+
+
+def make_controller(n_actions: int) -> Controller:
+	controller = Controller()
+	for i in range(n_actions):
+
+		class Params(BaseModel):
+			query: str
+			limit: int = 10
+
+		async def custom_action(params: Params) -> ActionResult:
+			return ActionResult(extracted_content=params.query)
+
+		custom_action.__name__ = f'custom_action_{i}'
+		domains = ['shop.example.com'] if i % 5 == 0 else None
+		controller.registry.action(f'Custom action number {i}', param_model=Params, domains=domains)(custom_action)
+	return controller
+
+
+async def benchmark(n_actions: int, cached: bool) -> tuple[float, float]:
+	"""Returns (median model update time in ms, median schema generation time in ms) per step."""
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None))
+	agent = Agent(task='Benchmark', llm=create_mock_llm(), controller=make_controller(n_actions), browser_session=browser_session)
+	update_times, schema_times = [], []
+	for step in range(STEPS):
+		if not cached:
+			agent.controller.registry._action_model_cache.clear()
+			agent._agent_output_models.clear()
+			SchemaOptimizer._cache.clear()
+		start = time.perf_counter()
+		await agent._update_action_models_for_page(URLS[step % len(URLS)])
+		update_times.append(time.perf_counter() - start)
+		start = time.perf_counter()
+		SchemaOptimizer.get_optimized_json_schema(agent.AgentOutput)
+		schema_times.append(time.perf_counter() - start)
+	return statistics.median(update_times) * 1000, statistics.median(schema_times) * 1000
+
+
+async def main(n_actions: int) -> None:
+	print(f'{n_actions} custom actions, {STEPS} steps over {len(URLS)} URLs')
+	print(f'{"models":<10} {"update (ms)":>12} {"schema (ms)":>12}')
+	for name, cached in (('uncached', False), ('cached', True)):
+		update_time, schema_time = await benchmark(n_actions, cached)
+		print(f'{name:<10} {update_time:>12.2f} {schema_time:>12.2f}')
+
+
+if __name__ == '__main__':
+	asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 40))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark CDP session attach latency and WebSocket count, one socket per target vs. multiplexed sessions.
+
+Opens 1, 10 and 50 about:blank tabs in a local headless Chromium and attaches a CDP session to each of them, once with
+the default one WebSocket per target and once with `multiplex_cdp_sessions=True`.
+
+Usage:
+	python tests/scripts/benchmark_cdp_sessions.py [path/to/chromium]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from browser_use.browser import BrowserProfile, BrowserSession
+
+TARGET_COUNTS = (1, 10, 50)
+
+
+async def benchmark(multiplex_cdp_sessions: bool, target_count: int, executable_path: str | None) -> tuple[float, float, int]:
+	"""Returns (total attach time, median attach time, number of WebSockets) for `target_count` new tabs."""
+	profile = BrowserProfile(
+		headless=True,
+		user_data_dir=None,
+		executable_path=executable_path,
+		multiplex_cdp_sessions=multiplex_cdp_sessions,
+	)
+	session = BrowserSession(browser_profile=profile)
+	await session.start()
+	try:
+		assert session._cdp_client_root is not None
+		target_ids = []
+		for _ in range(target_count):
+			result = await session._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
+			target_ids.append(result['targetId'])
+
+		attach_times = []
+		start = time.perf_counter()
+		for target_id in target_ids:
+			attach_start = time.perf_counter()
+			cdp_session = await session.get_or_create_cdp_session(target_id, focus=False)
+			# the first real command, so lazily enabled domains are paid for as well
+			await cdp_session.cdp_client.send.Runtime.evaluate(params={'expression': '1'}, session_id=cdp_session.session_id)
+			attach_times.append(time.perf_counter() - attach_start)
+		total = time.perf_counter() - start
+
+		sockets = len({id(cdp_session.cdp_client) for cdp_session in session._cdp_session_pool.values()})
+		return total, statistics.median(attach_times), sockets
+	finally:
+		await session.kill()
+
+
+async def main(executable_path: str | None) -> None:
+	print(f'{"mode":<12} {"targets":>7} {"total (s)":>10} {"median (ms)":>12} {"sockets":>8}')
+	for target_count in TARGET_COUNTS:
+		for multiplex_cdp_sessions in (False, True):
+			total, median, sockets = await benchmark(multiplex_cdp_sessions, target_count, executable_path)
+			mode = 'multiplexed' if multiplex_cdp_sessions else 'per-target'
+			print(f'{mode:<12} {target_count:>7} {total:>10.3f} {median * 1000:>12.1f} {sockets:>8}')
+
+
+if __name__ == '__main__':
+	asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark the per-call latency of ChatOpenAI with a pooled client against a new client for every call.
+
+Serves canned chat completions from a local stand-in for the OpenAI API (plain HTTP/1.1 with keep-alive, so the
+saving is the client setup and TCP handshake, remote APIs also save the TLS handshake) and prints the median latency
+of `CALLS` calls in each mode.
+
+Usage:
+	python tests/scripts/benchmark_llm_clients.py [number of calls]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from browser_use.llm.messages import UserMessage
+from browser_use.llm.openai.chat import ChatOpenAI
+
+COMPLETION = json.dumps(
+	{
+		'id': 'chatcmpl-1',
+		'object': 'chat.completion',
+		'created': 0,
+		'model': 'gpt-4.1-mini',
+		'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': 'Hello'}, 'finish_reason': 'stop'}],
+		'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+	}
+).encode()
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+	disable_nagle_algorithm = True
+
+	def do_POST(self):
+		self.rfile.read(int(self.headers['Content-Length']))
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(COMPLETION)))
+		self.end_headers()
+		self.wfile.write(COMPLETION)
+
+	def log_message(self, format, *args):
+		pass
+
+
+async def benchmark(base_url: str, calls: int, pooled: bool) -> float:
+	"""Returns the median latency in ms of `calls` LLM calls."""
+	llm = ChatOpenAI(model='gpt-4.1-mini', api_key='benchmark', base_url=base_url)
+	times = []
+	for _ in range(calls):
+		start = time.perf_counter()
+		await llm.ainvoke([UserMessage(content='Hi')])
+		if not pooled:
+			# what every call did before the clients were pooled
+			await llm.aclose()
+		times.append(time.perf_counter() - start)
+	await llm.aclose()
+	return statistics.median(times) * 1000
+
+
+async def main(calls: int) -> None:
+	server = ThreadingHTTPServer(('127.0.0.1', 0), CompletionHandler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	base_url = f'http://127.0.0.1:{server.server_address[1]}/v1'
+	try:
+		print(f'{"client":<18} {"latency (ms)":>13}')
+		for name, pooled in (('new per call', False), ('pooled', True)):
+			print(f'{name:<18} {await benchmark(base_url, calls, pooled):>13.2f}')
+	finally:
+		server.shutdown()
+
+
+if __name__ == '__main__':
+	asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100))
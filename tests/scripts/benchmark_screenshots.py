@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Benchmark screenshot size and capture latency for the profile screenshot settings.
+
+Captures the same page with the default full resolution PNG and with compressed, downscaled JPEG and WebP settings in a
+local headless Chromium, and prints the median size and capture time of each.
+
+Usage:
+	python tests/scripts/benchmark_screenshots.py [url] [path/to/chromium]
+"""
+
+import asyncio
+import base64
+import statistics
+import sys
+import time
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.events import NavigateToUrlEvent, ScreenshotEvent
+
+SETTINGS = {
+	'png (default)': {},
+	'jpeg q80': {'screenshot_format': 'jpeg', 'screenshot_quality': 80},
+	'jpeg q60 1024px': {'screenshot_format': 'jpeg', 'screenshot_quality': 60, 'screenshot_max_dimension': 1024},
+	'webp q60 1024px': {'screenshot_format': 'webp', 'screenshot_quality': 60, 'screenshot_max_dimension': 1024},
+}
+RUNS = 10
+
+
+async def benchmark(url: str, settings: dict, executable_path: str | None) -> tuple[float, float]:
+	"""Returns (median size in KB, median capture time in ms) of `RUNS` screenshots of `url`."""
+	profile = BrowserProfile(headless=True, user_data_dir=None, executable_path=executable_path, **settings)
+	session = BrowserSession(browser_profile=profile)
+	await session.start()
+	try:
+		await session.event_bus.dispatch(NavigateToUrlEvent(url=url))
+		sizes, times = [], []
+		for _ in range(RUNS):
+			start = time.perf_counter()
+			event = session.event_bus.dispatch(ScreenshotEvent(full_page=False))
+			screenshot_b64 = await event.event_result(raise_if_any=True, raise_if_none=True)
+			times.append(time.perf_counter() - start)
+			sizes.append(len(base64.b64decode(screenshot_b64)))
+		return statistics.median(sizes) / 1024, statistics.median(times) * 1000
+	finally:
+		await session.kill()
+
+
+async def main(url: str, executable_path: str | None) -> None:
+	print(f'{"settings":<18} {"size (KB)":>10} {"capture (ms)":>13}')
+	for name, settings in SETTINGS.items():
+		size, capture_time = await benchmark(url, settings, executable_path)
+		print(f'{name:<18} {size:>10.0f} {capture_time:>13.1f}')
+
+
+if __name__ == '__main__':
+	asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else 'https://example.com', sys.argv[2] if len(sys.argv) > 2 else None))